@@ -0,0 +1,324 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import math
+from array import array
+
+from KicadModTree.Point import *
+from KicadModTree.util.geometric_util import IDENTITY_TRANSFORMATION, applyTransformation, arcBoundingBox, \
+    mergeBoundingBoxes, rotatedRectExtents
+from KicadModTree.util.kicad_util import NANOMETRES_PER_MILLIMETRE, toNanometres
+
+
+class PrimitiveTable(object):
+    r"""Columns of one kind of primitive, like all lines of a footprint
+
+    Numeric columns are typed arrays, all other columns (like pad numbers) are lists. Row i of the table consists of
+    the i-th value of every column.
+
+    :param columns: list of (name, typecode) pairs, the typecode is one of the ``array`` module or None for a list
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> lines = kicad_mod.compile().lines
+    >>> for start_x, start_y, end_x, end_y, layer, width in lines.rows():
+    ...     pass
+    """
+
+    def __init__(self, columns):
+        self.columns = [name for name, _ in columns]
+        self._data = [array(typecode) if typecode else [] for _, typecode in columns]
+        for name, data in zip(self.columns, self._data):
+            setattr(self, name, data)
+
+    def __len__(self):
+        return len(self._data[0])
+
+    def append(self, *values):
+        '''
+        add a row, with one value per column
+        '''
+        for data, value in zip(self._data, values):
+            data.append(value)
+
+    def rows(self, convert=None, columns=()):
+        '''
+        iterate over all rows as tuples
+
+        :param convert: function which is applied to every value of the given columns (default: None)
+        :param columns: names of the converted columns
+        '''
+        if convert is None:
+            return zip(*self._data)
+        return zip(*[list(map(convert, data)) if name in columns else data
+                     for name, data in zip(self.columns, self._data)])
+
+    def _key(self):
+        return tuple(tuple(data) for data in self._data)
+
+
+def _transformPoint(transformation, point):
+    # like Node.getRealPosition, points below the root node are taken as they are
+    if transformation is IDENTITY_TRANSFORMATION:
+        return point.x, point.y
+    return applyTransformation(transformation, point.x, point.y)
+
+
+def _templateKey(template):
+    return (template.type, template.shape, template.size, template.offset, template.drill,
+            template.solder_paste_margin_ratio, template.solder_mask_margin, tuple(template.layers))
+
+
+class CompiledFootprint(object):
+    r"""Flat representation of a footprint, with all transformations resolved
+
+    Every kind of primitive is stored as ``PrimitiveTable``, in the order in which the primitives are found in the
+    tree. Layers are stored as index into ``layers``, the settings of pads as index into ``pad_templates``. A compiled
+    footprint does not reference the node tree, and is not changed afterwards.
+
+    With *nanometres* all lengths (coordinates, widths, text sizes) are stored as integer nanometres, the internal
+    unit of KiCad. They are rounded exactly once (to the same digits formatFloat would write), after all
+    transformations are applied, so the written values only differ in negative zeros, which become 0. Angles and the
+    settings of pads and 3D models are not converted.
+
+    :param footprint: footprint which is compiled
+    :type footprint: ``KicadModTree.Footprint``
+    :param nanometres: store lengths as integer nanometres instead of millimetres (default: False)
+    :type nanometres: ``bool``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> compiled = kicad_mod.compile()
+    >>> KicadFileHandler(compiled).writeFile('example_footprint.kicad_mod')
+    """
+
+    def __init__(self, footprint, nanometres=False):
+        self.nanometres = nanometres
+        self.name = footprint.name
+        self.description = footprint.description
+        self.tags = footprint.tags
+        self.attribute = footprint.attribute
+
+        self.layers = []
+        self._layer_ids = {}
+
+        # typecode and conversion of all lengths
+        length = 'l' if nanometres else 'd'
+        self._length = toNanometres if nanometres else float
+
+        # widths are None for the default width of the layer, so they are stored in lists
+        self.arcs = PrimitiveTable([('center_x', length), ('center_y', length), ('start_x', length),
+                                    ('start_y', length), ('angle', 'd'), ('layer', 'l'), ('width', None)])
+        self.circles = PrimitiveTable([('center_x', length), ('center_y', length), ('end_x', length),
+                                       ('end_y', length), ('layer', 'l'), ('width', None)])
+        self.lines = PrimitiveTable([('start_x', length), ('start_y', length), ('end_x', length), ('end_y', length),
+                                     ('layer', 'l'), ('width', None)])
+        self.pads = PrimitiveTable([('number', None), ('x', length), ('y', length), ('rotation', 'd'),
+                                    ('template', 'l')])
+        self.polygons = PrimitiveTable([('first_point', 'l'), ('point_count', 'l'), ('layer', 'l'), ('width', None)])
+        self.polygon_points = PrimitiveTable([('x', length), ('y', length)])
+        self.texts = PrimitiveTable([('type', None), ('text', None), ('x', length), ('y', length), ('rotation', 'd'),
+                                     ('layer', 'l'), ('hide', 'b'), ('size_x', length), ('size_y', length),
+                                     ('thickness', length)])
+        self.models = PrimitiveTable([('filename', None), ('at', None), ('scale', None), ('rotate', None)])
+
+        self.pad_templates = []
+        self._template_ids = {}
+
+        self._bounding_boxes = None
+        self._compare_key = None
+
+        self._compileTree(footprint)
+
+    def _compileTree(self, footprint):
+        compile_methods = {'Arc': self._compileArc, 'Circle': self._compileCircle, 'Line': self._compileLine,
+                           'Pad': self._compilePad, 'Polygon': self._compilePolygon, 'Text': self._compileText,
+                           'Model': self._compileModel}
+
+        def compileVirtualChilds(node):
+            # nodes which can add their virtual childs directly are not asked to create them
+            return node._virtual_childs is None and node._compileVirtualChilds(self)
+
+        for node, transformation in footprint.walk(handle_virtual_childs=compileVirtualChilds):
+            compile_method = compile_methods.get(node.__class__.__name__)
+            if compile_method is not None:
+                compile_method(node, transformation)
+
+    def addPads(self, numbers, positions, rotation, template):
+        '''
+        add pads which share a template, used by nodes which add their pads without creating them
+
+        :param numbers: pad numbers
+        :param positions: (x, y) positions of the pads, relative to the root node
+        :param rotation: rotation of all pads, relative to the root node
+        :param template: ``PadTemplate`` of all pads
+        '''
+        template_id = self._getTemplateId(template)
+        length = self._length
+        for number, (x, y) in zip(numbers, positions):
+            self.pads.append(number, length(x), length(y), rotation, template_id)
+
+    def _getTemplateId(self, template):
+        template_id = self._template_ids.get(template)
+        if template_id is None:
+            template_id = self._template_ids[template] = len(self.pad_templates)
+            self.pad_templates.append(template)
+            for layer in template.layers:
+                self._getLayerId(layer)
+        return template_id
+
+    def _getLayerId(self, layer):
+        '''
+        index of the layer in ``layers``, the layer is added when it is not known yet
+        '''
+        layer_id = self._layer_ids.get(layer)
+        if layer_id is None:
+            layer_id = self._layer_ids[layer] = len(self.layers)
+            self.layers.append(layer)
+        return layer_id
+
+    def _width(self, width):
+        return None if width is None else self._length(width)
+
+    def _compileArc(self, node, transformation):
+        length = self._length
+        center_x, center_y = _transformPoint(transformation, node.center_pos)
+        start_x, start_y = _transformPoint(transformation, node.start_pos)
+        self.arcs.append(length(center_x), length(center_y), length(start_x), length(start_y), node.angle,
+                         self._getLayerId(node.layer), self._width(node.width))
+
+    def _compileCircle(self, node, transformation):
+        length = self._length
+        center_x, center_y = _transformPoint(transformation, node.center_pos)
+        end_x, end_y = _transformPoint(transformation, node.end_pos)
+        self.circles.append(length(center_x), length(center_y), length(end_x), length(end_y),
+                            self._getLayerId(node.layer), self._width(node.width))
+
+    def _compileLine(self, node, transformation):
+        length = self._length
+        start_x, start_y = _transformPoint(transformation, node.start_pos)
+        end_x, end_y = _transformPoint(transformation, node.end_pos)
+        self.lines.append(length(start_x), length(start_y), length(end_x), length(end_y),
+                          self._getLayerId(node.layer), self._width(node.width))
+
+    def _compilePad(self, node, transformation):
+        x, y = _transformPoint(transformation, node.at)
+        self.pads.append(node.number, self._length(x), self._length(y), node.rotation + transformation[6],
+                         self._getTemplateId(node.template))
+
+    def _compilePolygon(self, node, transformation):
+        length = self._length
+        self.polygons.append(len(self.polygon_points), len(node.nodes), self._getLayerId(node.layer),
+                             self._width(node.width))
+        for x, y in node.getRealPositions(node.nodes):
+            self.polygon_points.append(length(x), length(y))
+
+    def _compileText(self, node, transformation):
+        length = self._length
+        x, y = _transformPoint(transformation, node.at)
+        self.texts.append(node.type, node.text, length(x), length(y), node.rotation + transformation[6],
+                          self._getLayerId(node.layer), bool(node.hide), length(node.size.x), length(node.size.y),
+                          length(node.thickness))
+
+    def _compileModel(self, node, transformation):
+        self.models.append(node.filename, node.at, node.scale, node.rotate)
+
+    def calculateBoundingBox(self, layers=None):
+        '''
+        get the bounding box of the primitives (on the given layers), like Node.calculateBoundingBox
+
+        :return: ``{'min': Point2D, 'max': Point2D}``, or None when there is no geometry
+        '''
+        boxes = self._getLayerBoundingBoxes()
+        if layers is None:
+            layers = boxes.keys()
+        bounding_box = mergeBoundingBoxes([boxes.get(layer) for layer in layers])
+
+        if not bounding_box:
+            return None
+        return {'min': Point2D(bounding_box[0], bounding_box[1]), 'max': Point2D(bounding_box[2], bounding_box[3])}
+
+    def _getLayerBoundingBoxes(self):
+        if self._bounding_boxes is not None:
+            return self._bounding_boxes
+
+        boxes = [[] for _ in self.layers]
+
+        for start_x, start_y, end_x, end_y, layer, _ in self.lines.rows():
+            boxes[layer].append((min(start_x, end_x), min(start_y, end_y), max(start_x, end_x), max(start_y, end_y)))
+
+        for center_x, center_y, start_x, start_y, angle, layer, _ in self.arcs.rows():
+            boxes[layer].append(arcBoundingBox(center_x, center_y, start_x, start_y, angle))
+
+        for center_x, center_y, end_x, end_y, layer, _ in self.circles.rows():
+            radius = math.hypot(end_x - center_x, end_y - center_y)
+            boxes[layer].append((center_x - radius, center_y - radius, center_x + radius, center_y + radius))
+
+        points_x, points_y = self.polygon_points.x, self.polygon_points.y
+        for first_point, point_count, layer, _ in self.polygons.rows():
+            if point_count:
+                xs = points_x[first_point:first_point + point_count]
+                ys = points_y[first_point:first_point + point_count]
+                boxes[layer].append((min(xs), min(ys), max(xs), max(ys)))
+
+        for _, text, x, y, rotation, layer, _, size_x, size_y, _ in self.texts.rows():
+            half_width, half_height = rotatedRectExtents(len(str(text))*size_x, size_y, rotation)
+            boxes[layer].append((x - half_width, y - half_height, x + half_width, y + half_height))
+
+        # many pads share the same template and rotation. The extents of templates are always given in millimetres.
+        scale = NANOMETRES_PER_MILLIMETRE if self.nanometres else 1
+        extents = {}
+        for _, x, y, rotation, template_id in self.pads.rows():
+            key = (template_id, rotation)
+            if key not in extents:
+                template = self.pad_templates[template_id]
+                extents[key] = ([value * scale for value in template.calculateExtents(rotation)],
+                                [self._layer_ids[name] for name in template.layers])
+            (offset_x, offset_y, half_width, half_height), layers = extents[key]
+
+            box = (x + offset_x - half_width, y + offset_y - half_height, x + offset_x + half_width,
+                   y + offset_y + half_height)
+            for layer in layers:
+                boxes[layer].append(box)
+
+        self._bounding_boxes = dict((self.layers[layer], mergeBoundingBoxes(layer_boxes))
+                                    for layer, layer_boxes in enumerate(boxes) if layer_boxes)
+        if self.nanometres:
+            self._bounding_boxes = dict((layer, tuple(value / float(scale) for value in box))
+                                        for layer, box in self._bounding_boxes.items())
+        return self._bounding_boxes
+
+    def _getCompareKey(self):
+        if self._compare_key is None:
+            tables = [self.arcs, self.circles, self.lines, self.polygons, self.polygon_points, self.texts]
+            self._compare_key = (self.nanometres, self.name, self.description, self.tags, self.attribute,
+                                tuple(self.layers), tuple(_templateKey(t) for t in self.pad_templates),
+                                tuple(table._key() for table in tables), self.pads._key(),
+                                tuple(tuple(model) for model in self.models.rows()))
+        return self._compare_key
+
+    def __eq__(self, other):
+        if not isinstance(other, CompiledFootprint):
+            return NotImplemented
+        return self._getCompareKey() == other._getCompareKey()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash(self._getCompareKey())
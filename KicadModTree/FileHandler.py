@@ -14,7 +14,10 @@
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 import sys
+import os
 import io
+import shutil
+import tempfile
 
 
 class FileHandler(object):
@@ -32,16 +35,24 @@ class FileHandler(object):
     >>> file_handler.writeFile('example_footprint.kicad_mod')
     """
 
+    # when set to a list, the path of every file passed to writeFile is appended to it (used by BuildCache)
+    written_files = None
+
     def __init__(self, kicad_mod):
         self.kicad_mod = kicad_mod
 
     def writeFile(self, filename, **kwargs):
         r"""Write the output of FileHandler.serialize to a file
 
+        An existing file is only overwritten when its content changes, so unchanged footprints keep their
+        modification time (and timestamp stored inside of the file).
+
         :param filename:
             path of the output file
         :type filename: ``str``
 
+        :return: ``True`` if the file was written, ``False`` if it was already up to date
+
         :Example:
 
         >>> from KicadModTree import *
@@ -50,16 +61,57 @@ class FileHandler(object):
         >>> file_handler.writeFile('example_footprint.kicad_mod')
         """
 
-        with io.open(filename, "w", newline='\n') as f:
-            output = self.serialize(**kwargs)
+        if FileHandler.written_files is not None:
+            FileHandler.written_files.append(filename)
+
+        if not os.path.isfile(filename):
+            with io.open(filename, "w", newline='\n') as f:
+                # convert to unicode if running python2
+                if sys.version_info[0] == 2:
+                    f = _UnicodeWriter(f)
+
+                self.serializeToStream(f, **kwargs)
+            return True
+
+        # the footprint is streamed only once: it is compared with the existing file while it is written, and a
+        # temporary file is only created at the first difference
+        kwargs, replace_header = self._prepareComparison(kwargs)
+        writer = _ChangedFileWriter(filename, replace_header)
+        try:
+            self.serializeToStream(writer, **kwargs)
+            return writer.finish()
+        finally:
+            writer.close()
+
+    def _prepareComparison(self, kwargs):
+        '''
+        get the arguments for serializeToStream when an existing file is compared with the new content
+
+        :return: the arguments, and a function which converts the first line of the existing file into the line which
+                 is expected for an unchanged footprint (or None to compare the file as it is)
+        '''
+        return kwargs, None
 
-            # convert to unicode if running python2
-            if sys.version_info[0] == 2 and type(output) != unicode:
-                output = unicode(output, "utf-8")
+    def serializeToStream(self, stream, **kwargs):
+        r"""Write the output of FileHandler.serialize into a file like object
 
-            f.write(output)
+        Implementations can override this method to write the footprint piece by piece, instead of creating the whole
+        string in memory first.
+
+        :param stream:
+            object with a write method
+        :type stream: ``io.TextIOBase`` (python 3), ``file`` (python 2)
+
+        :Example:
+
+        >>> import sys
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = KicadFileHandler(kicad_mod)  # KicadFileHandler is a implementation of FileHandler
+        >>> file_handler.serializeToStream(sys.stdout)
+        """
 
-            f.close()
+        stream.write(self.serialize(**kwargs))
 
     def serialize(self, **kwargs):
         r"""Get a valid string representation of the footprint in the specified format
@@ -73,3 +125,182 @@ class FileHandler(object):
         """
 
         raise NotImplementedError("serialize has to be implemented by child class")
+
+    @classmethod
+    def readFile(cls, filename):
+        r"""Read a file and create the footprint represented by it
+
+        :param filename:
+            path of the input file
+        :type filename: ``str``
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = KicadFileHandler.readFile('example_footprint.kicad_mod')
+        """
+
+        with io.open(filename, "r", encoding="utf-8") as f:
+            return cls.deserialize(f.read())
+
+    @classmethod
+    def deserialize(cls, string):
+        r"""Create the footprint represented by a string in the specified format
+
+        :param string:
+            content of a footprint file
+        :type string: ``str``
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = KicadFileHandler.deserialize('(module example_footprint (layer F.Cu) (tedit 0))')
+        """
+
+        raise NotImplementedError("deserialize has to be implemented by child class")
+
+
+class _UnicodeWriter(object):
+    '''
+    python2 only: convert everything which is written into a file opened with io.open to unicode
+    '''
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, output):
+        if type(output) != unicode:
+            output = unicode(output, "utf-8")
+        self._stream.write(output)
+
+
+class _ChangedFileWriter(object):
+    '''
+    compare everything which is written with an existing file, and only start writing at the first difference
+
+    The new content is written into a temporary file next to the existing one, which replaces it in finish(). The
+    part before the first difference is copied from the existing file, so nothing has to be kept in memory.
+    '''
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, filename, replace_header=None):
+        self._filename = filename
+        self._replace_header = replace_header
+        self._existing = self._openExisting()
+        self._buffer = []
+        self._buffer_size = 0
+        self._matched = 0
+        self._output = None
+        self._temporary_filename = None
+
+    def _openExisting(self):
+        stream = io.open(self._filename, "r", newline='\n', encoding="utf-8", errors="replace")
+        if self._replace_header is None:
+            return stream
+        return _PrefixedReader(self._replace_header(stream.readline()), stream)
+
+    def write(self, output):
+        # convert to unicode if running python2
+        if sys.version_info[0] == 2 and type(output) != unicode:
+            output = unicode(output, "utf-8")
+
+        if self._output is not None:
+            self._output.write(output)
+            return
+
+        self._buffer.append(output)
+        self._buffer_size += len(output)
+        if self._buffer_size >= self.CHUNK_SIZE:
+            self._compareBuffer()
+
+    def _compareBuffer(self):
+        chunk = "".join(self._buffer)
+        self._buffer = []
+        self._buffer_size = 0
+
+        if self._existing.read(len(chunk)) == chunk:
+            self._matched += len(chunk)
+        else:
+            self._startOutput()
+            self._output.write(chunk)
+
+    def _startOutput(self):
+        '''
+        create the temporary file, and copy the part which is equal to the existing file into it
+        '''
+        self._existing.close()
+
+        directory = os.path.dirname(os.path.abspath(self._filename))
+        fd, self._temporary_filename = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        self._output = io.open(fd, "w", newline='\n', encoding="utf-8")
+
+        existing = self._openExisting()
+        try:
+            remaining = self._matched
+            while remaining > 0:
+                chunk = existing.read(min(remaining, self.CHUNK_SIZE))
+                if not chunk:
+                    break
+                self._output.write(chunk)
+                remaining -= len(chunk)
+        finally:
+            existing.close()
+
+    def finish(self):
+        '''
+        replace the existing file when the content has changed
+
+        :return: ``True`` if the file was written, ``False`` if it was already up to date
+        '''
+        if self._output is None:
+            self._compareBuffer()
+        if self._output is None:
+            if not self._existing.read(1):
+                return False
+            self._startOutput()  # the existing file is longer
+
+        self._output.close()
+        shutil.copymode(self._filename, self._temporary_filename)
+        if hasattr(os, 'replace'):
+            os.replace(self._temporary_filename, self._filename)
+        else:
+            # python2: rename does not overwrite existing files on windows
+            if os.name == 'nt':
+                os.remove(self._filename)
+            os.rename(self._temporary_filename, self._filename)
+        self._temporary_filename = None
+        return True
+
+    def close(self):
+        '''
+        close all files, and remove the temporary file when finish() was not successful
+        '''
+        self._existing.close()
+        if self._output is not None:
+            self._output.close()
+        if self._temporary_filename is not None:
+            os.remove(self._temporary_filename)
+            self._temporary_filename = None
+
+
+class _PrefixedReader(object):
+    '''
+    read a string first, and then the rest of a stream
+    '''
+
+    def __init__(self, prefix, stream):
+        self._prefix = prefix
+        self._stream = stream
+
+    def read(self, size):
+        if not self._prefix:
+            return self._stream.read(size)
+
+        output, self._prefix = self._prefix[:size], self._prefix[size:]
+        if len(output) < size:
+            output += self._stream.read(size - len(output))
+        return output
+
+    def close(self):
+        self._stream.close()
@@ -13,9 +13,14 @@
 #
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import re
+import time
+
+from KicadModTree.CompiledFootprint import CompiledFootprint
 from KicadModTree.FileHandler import FileHandler
 from KicadModTree.util.kicad_util import *
-from KicadModTree.nodes.base.Pad import Pad  # TODO: why .KicadModTree is not enough?
+from KicadModTree.nodes.Footprint import Footprint
+from KicadModTree.nodes.base import *  # TODO: why .KicadModTree is not enough?
 
 
 DEFAULT_LAYER_WIDTH = {'F.SilkS': 0.12,
@@ -27,14 +32,45 @@ DEFAULT_LAYER_WIDTH = {'F.SilkS': 0.12,
 
 DEFAULT_WIDTH = 0.15
 
+_TEDIT_RE = re.compile(r'\(tedit ([0-9A-Fa-f]+)\)')
+
 
-def _get_layer_width(layer, width=None):
+def _get_layer_width(layer, width=None, format_length=None):
     if width is not None:
-        return width
+        return width if format_length is None else format_length(width)
     else:
         return DEFAULT_LAYER_WIDTH.get(layer, DEFAULT_WIDTH)
 
 
+class _NanometreTokens(dict):
+    '''
+    formatted integer nanometres, every distinct value is only formatted once
+    '''
+
+    def __missing__(self, value):
+        token = self[value] = FormattedNumber(formatNanometres(value))
+        return token
+
+
+def _get_attributes(sexpr, start=1):
+    '''
+    split the items of a sexpr into a dict of child expressions (name -> arguments) and a list of plain values
+    '''
+    attributes = {}
+    values = []
+    for item in sexpr[start:]:
+        if type(item) is list:
+            if item:
+                attributes[item[0]] = item[1:]
+        else:
+            values.append(item)
+    return attributes, values
+
+
+def _get_point(values):
+    return [float(v) for v in values]
+
+
 class KicadFileHandler(FileHandler):
     r"""Implementation of the FileHandler for .kicad_mod files
 
@@ -56,6 +92,15 @@ class KicadFileHandler(FileHandler):
     def serialize(self, **kwargs):
         r"""Get a valid string representation of the footprint in the .kicad_mod format
 
+        :param \**kwargs:
+            See below
+
+        :Keyword Arguments:
+            * *timestamp* (``int``) --
+              timestamp which is stored in the file (default: current time)
+            * *nanometres* (``bool``) --
+              compile the footprint with lengths in integer nanometres, see ``CompiledFootprint`` (default: False)
+
         :Example:
 
         >>> from KicadModTree import *
@@ -64,210 +109,389 @@ class KicadFileHandler(FileHandler):
         >>> print(file_handler.serialize())
         """
 
-        sexpr = ['module', self.kicad_mod.name,
-                 ['layer', 'F.Cu'],
-                 ['tedit', formatTimestamp(kwargs.get('timestamp'))],
-                 SexprSerializer.NEW_LINE
-                ]  # NOQA
+        return str(SexprSerializer(self._serializeFootprint(**kwargs)))
 
-        if self.kicad_mod.description:
-            sexpr.append(['descr', self.kicad_mod.description])
-            sexpr.append(SexprSerializer.NEW_LINE)
+    def serializeToStream(self, stream, **kwargs):
+        r"""Write the footprint in the .kicad_mod format into a file like object
 
-        if self.kicad_mod.tags:
-            sexpr.append(['tags', self.kicad_mod.tags])
-            sexpr.append(SexprSerializer.NEW_LINE)
+        The nodes are converted one after another, so the complete footprint is never held in memory as string.
 
-        if self.kicad_mod.attribute:
-            sexpr.append(['attr', self.kicad_mod.attribute])
-            sexpr.append(SexprSerializer.NEW_LINE)
+        :Example:
 
-        sexpr.extend(self._serializeTree())
+        >>> import sys
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = KicadFileHandler(kicad_mod)
+        >>> file_handler.serializeToStream(sys.stdout)
+        """
 
-        return str(SexprSerializer(sexpr))
+        SexprSerializer(self._serializeFootprint(**kwargs)).write(stream)
 
-    def _serializeTree(self):
-        nodes = self.kicad_mod.serialize()
+    @classmethod
+    def deserialize(cls, string):
+        r"""Create a footprint from a string in the .kicad_mod format
 
-        grouped_nodes = {}
+        Base nodes (``Arc``, ``Circle``, ``Line``, ``Pad``, ``Polygon``, ``Text`` and ``Model``) are rebuilt and
+        appended to the footprint. Expressions which have no representation in KicadModTree are skipped.
 
-        for single_node in nodes:
-            node_type = single_node.__class__.__name__
+        :param string:
+            content of a .kicad_mod file
+        :type string: ``str``
 
-            current_nodes = grouped_nodes.get(node_type, [])
-            current_nodes.append(single_node)
+        :Example:
 
-            grouped_nodes[node_type] = current_nodes
+        >>> from KicadModTree import *
+        >>> kicad_mod = KicadFileHandler.deserialize('(module example_footprint (layer F.Cu) (tedit 0))')
+        """
 
-        sexpr = []
+        sexpr = parseLispString(string)
+        if type(sexpr) is not list or len(sexpr) < 2 or sexpr[0] != 'module':
+            raise ValueError("expected a module expression")
 
-        # serialize initial text nodes
-        if 'Text' in grouped_nodes:
-            reference_nodes = list(filter(lambda node: node.type == 'reference', grouped_nodes['Text']))
-            for node in reference_nodes:
-                sexpr.append(self._serialize_Text(node))
-                sexpr.append(SexprSerializer.NEW_LINE)
-                grouped_nodes['Text'].remove(node)
-
-            value_nodes = list(filter(lambda node: node.type == 'value', grouped_nodes['Text']))
-            for node in value_nodes:
-                sexpr.append(self._serialize_Text(node))
-                sexpr.append(SexprSerializer.NEW_LINE)
-                grouped_nodes['Text'].remove(node)
-
-        for key, value in sorted(grouped_nodes.items()):
-            # check if key is a base node, except Model
-            if key not in {'Arc', 'Circle', 'Line', 'Pad', 'Polygon', 'Text'}:
+        kicad_mod = Footprint(sexpr[1])
+
+        nodes = []
+        for item in sexpr[2:]:
+            if type(item) is not list or not item:
                 continue
 
-            # render base nodes
-            for node in value:
-                sexpr.append(self._callSerialize(node))
-                sexpr.append(SexprSerializer.NEW_LINE)
+            name = item[0]
+            if name == 'descr':
+                kicad_mod.setDescription(item[1])
+            elif name == 'tags':
+                kicad_mod.setTags(item[1])
+            elif name == 'attr':
+                kicad_mod.setAttribute(item[1])
+            else:
+                method = getattr(cls, "_deserialize_{0}".format(name), None)
+                if method is not None:
+                    nodes.append(method(item))
 
-        # serialize 3D Models at the end
-        if grouped_nodes.get('Model'):
-            for node in grouped_nodes.get('Model'):
-                sexpr.append(self._serialize_Model(node))
-                sexpr.append(SexprSerializer.NEW_LINE)
+        kicad_mod.extend(nodes)
 
-        return sexpr
+        return kicad_mod
 
-    def _callSerialize(self, node):
-        '''
-        call the corresponding method to serialize the node
-        '''
-        method_type = node.__class__.__name__
-        method_name = "_serialize_{0}".format(method_type)
-        if hasattr(self, method_name):
-            return getattr(self, method_name)(node)
-        else:
-            exception_string = "{name} (node) not found, cannot serialized the node of type {type}"
-            raise NotImplementedError(exception_string.format(name=method_name, type=method_type))
+    @staticmethod
+    def _deserialize_fp_arc(sexpr):
+        attributes, _ = _get_attributes(sexpr)
+        width = attributes.get('width')
 
-    def _serialize_Arc(self, node):
         # in KiCAD, some file attributes of Arc are named not in the way of their real meaning
-        center_pos = node.getRealPosition(node.center_pos)
-        end_pos = node.getRealPosition(node.start_pos)
-
-        sexpr = ['fp_arc',
-                 ['start', center_pos.x, center_pos.y],
-                 ['end', end_pos.x, end_pos.y],
-                 ['angle', node.angle],
-                 ['layer', node.layer],
-                 ['width', _get_layer_width(node.layer, node.width)]
-                ]  # NOQA
-
-        return sexpr
+        return Arc(center=_get_point(attributes['start']),
+                   start=_get_point(attributes['end']),
+                   angle=float(attributes['angle'][0]),
+                   layer=attributes['layer'][0],
+                   width=float(width[0]) if width else None)
+
+    @staticmethod
+    def _deserialize_fp_circle(sexpr):
+        attributes, _ = _get_attributes(sexpr)
+        width = attributes.get('width')
+
+        center_x, center_y = _get_point(attributes['center'])
+        end_x, end_y = _get_point(attributes['end'])
+        radius = ((end_x - center_x)**2 + (end_y - center_y)**2)**0.5
+
+        return Circle(center=[center_x, center_y],
+                      radius=radius,
+                      layer=attributes['layer'][0],
+                      width=float(width[0]) if width else None)
+
+    @staticmethod
+    def _deserialize_fp_line(sexpr):
+        attributes, _ = _get_attributes(sexpr)
+        width = attributes.get('width')
+
+        return Line(start=_get_point(attributes['start']),
+                    end=_get_point(attributes['end']),
+                    layer=attributes['layer'][0],
+                    width=float(width[0]) if width else None)
+
+    @staticmethod
+    def _deserialize_fp_text(sexpr):
+        attributes, values = _get_attributes(sexpr, start=3)
+
+        at = _get_point(attributes['at'][:3])
+        font, _ = _get_attributes(_get_attributes(attributes.get('effects', []), start=0)[0].get('font', []),
+                                  start=0)
+
+        kwargs = {}
+        if 'size' in font:
+            kwargs['size'] = _get_point(font['size'])
+        if 'thickness' in font:
+            kwargs['thickness'] = float(font['thickness'][0])
+
+        return Text(type=sexpr[1], text=sexpr[2],
+                    at=at[:2], rotation=at[2] if len(at) > 2 else 0,
+                    layer=attributes['layer'][0],
+                    hide='hide' in values,
+                    **kwargs)
+
+    @staticmethod
+    def _deserialize_model(sexpr):
+        attributes, _ = _get_attributes(sexpr, start=2)
+
+        kwargs = {}
+        for name in ['at', 'scale', 'rotate']:
+            if name in attributes:
+                kwargs[name] = _get_point(attributes[name][0][1:])
+
+        return Model(filename=sexpr[1], **kwargs)
+
+    @staticmethod
+    def _deserialize_pad(sexpr):
+        attributes, _ = _get_attributes(sexpr, start=4)
+
+        at = _get_point(attributes['at'][:3])
+        kwargs = {'number': sexpr[1], 'type': sexpr[2], 'shape': sexpr[3],
+                  'at': at[:2], 'rotation': at[2] if len(at) > 2 else 0,
+                  'size': _get_point(attributes['size']),
+                  'layers': attributes['layers']}
+
+        drill = attributes.get('drill')
+        if drill:
+            # pads without hole (like SMT pads) only have a offset, like (drill (offset 0.1 0))
+            drill_attributes, drill_values = _get_attributes(drill, start=0)
+            if drill_values and drill_values[0] == 'oval':
+                kwargs['drill'] = _get_point(drill_values[1:3])
+            elif drill_values:
+                kwargs['drill'] = float(drill_values[0])
+            if 'offset' in drill_attributes:
+                kwargs['offset'] = _get_point(drill_attributes['offset'])
+
+        if 'solder_mask_margin' in attributes:
+            kwargs['solder_mask_margin'] = float(attributes['solder_mask_margin'][0])
+        if 'solder_paste_margin_ratio' in attributes:
+            kwargs['solder_paste_margin_ratio'] = float(attributes['solder_paste_margin_ratio'][0])
+
+        return Pad(**kwargs)
+
+    @staticmethod
+    def _deserialize_fp_poly(sexpr):
+        attributes, _ = _get_attributes(sexpr)
+        width = attributes.get('width')
+
+        return Polygon(nodes=[_get_point(xy[1:]) for xy in attributes['pts'] if xy[0] == 'xy'],
+                       layer=attributes['layer'][0],
+                       width=float(width[0]) if width else None)
+
+    def _prepareComparison(self, kwargs):
+        '''
+        ignore the timestamp of an existing file when no timestamp was requested explicitly
 
-    def _serialize_Circle(self, node):
-        center_pos = node.getRealPosition(node.center_pos)
-        end_pos = node.getRealPosition(node.end_pos)
+        The new content gets the current time, which only ends up in the file when something else has changed.
+        '''
+        if kwargs.get('timestamp') is not None:
+            return kwargs, None
 
-        sexpr = ['fp_circle',
-                 ['center', center_pos.x, center_pos.y],
-                 ['end', end_pos.x, end_pos.y],
-                 ['layer', node.layer],
-                 ['width', _get_layer_width(node.layer, node.width)]
-                ]  # NOQA
+        kwargs = dict(kwargs, timestamp=int(time.time()))
+        tedit = '(tedit {})'.format(formatTimestamp(kwargs['timestamp']))
+        return kwargs, lambda header: _TEDIT_RE.sub(tedit, header, count=1)
 
-        return sexpr
+    def _serializeFootprint(self, **kwargs):
+        '''
+        generator which yields the content of the module expression
+        '''
+        yield 'module'
+        yield self.kicad_mod.name
+        yield ['layer', 'F.Cu']
+        yield ['tedit', formatTimestamp(kwargs.get('timestamp'))]
+        yield SexprSerializer.NEW_LINE
 
-    def _serialize_Line(self, node):
-        start_pos = node.getRealPosition(node.start_pos)
-        end_pos = node.getRealPosition(node.end_pos)
+        if self.kicad_mod.description:
+            yield ['descr', self.kicad_mod.description]
+            yield SexprSerializer.NEW_LINE
 
-        sexpr = ['fp_line',
-                 ['start', start_pos.x, start_pos.y],
-                 ['end', end_pos.x, end_pos.y],
-                 ['layer', node.layer],
-                 ['width', _get_layer_width(node.layer, node.width)]
-                ]  # NOQA
+        if self.kicad_mod.tags:
+            yield ['tags', self.kicad_mod.tags]
+            yield SexprSerializer.NEW_LINE
 
-        return sexpr
+        if self.kicad_mod.attribute:
+            yield ['attr', self.kicad_mod.attribute]
+            yield SexprSerializer.NEW_LINE
 
-    def _serialize_Text(self, node):
-        sexpr = ['fp_text', node.type, node.text]
+        for sexpr in self._serializeTree(kwargs.get('nanometres', False)):
+            yield sexpr
 
-        position, rotation = node.getRealPosition(node.at, node.rotation)
-        if rotation:
-            sexpr.append(['at', position.x, position.y, rotation])
+    def _serializeTree(self, nanometres=False):
+        if isinstance(self.kicad_mod, CompiledFootprint):
+            compiled = self.kicad_mod
         else:
-            sexpr.append(['at', position.x, position.y])
-
-        sexpr.append(['layer', node.layer])
-        if node.hide:
-            sexpr.append('hide')
-        sexpr.append(SexprSerializer.NEW_LINE)
-
-        sexpr.append(['effects',
-                      ['font',
-                       ['size', node.size.x, node.size.y],
-                       ['thickness', node.thickness]
-                      ]
-                     ]
-                    )  # NOQA
-        sexpr.append(SexprSerializer.NEW_LINE)
+            compiled = self.kicad_mod.compile(nanometres=nanometres)
 
-        return sexpr
+        # lengths in nanometres are formatted by a integer routine, floats are formatted by SexprSerializer
+        format_length = _NanometreTokens().__getitem__ if compiled.nanometres else None
 
-    def _serialize_Model(self, node):
-        sexpr = ['model', node.filename,
-                 SexprSerializer.NEW_LINE,
-                 ['at', ['xyz', node.at.x, node.at.y, node.at.z]],
-                 SexprSerializer.NEW_LINE,
-                 ['scale', ['xyz', node.scale.x, node.scale.y, node.scale.z]],
-                 SexprSerializer.NEW_LINE,
-                 ['rotate', ['xyz', node.rotate.x, node.rotate.y, node.rotate.z]],
-                 SexprSerializer.NEW_LINE
-                ]  # NOQA
+        # serialize initial text nodes
+        for sexpr in self._serializeTexts(compiled, lambda text_type: text_type == 'reference', format_length):
+            yield sexpr
+        for sexpr in self._serializeTexts(compiled, lambda text_type: text_type == 'value', format_length):
+            yield sexpr
+
+        # base nodes, in the alphabetical order of their class names
+        for sexpr in self._serializeArcs(compiled, format_length):
+            yield sexpr
+        for sexpr in self._serializeCircles(compiled, format_length):
+            yield sexpr
+        for sexpr in self._serializeLines(compiled, format_length):
+            yield sexpr
+        for sexpr in self._serializePads(compiled, format_length):
+            yield sexpr
+        for sexpr in self._serializePolygons(compiled, format_length):
+            yield sexpr
+        for sexpr in self._serializeTexts(compiled, lambda text_type: text_type not in ['reference', 'value'],
+                                           format_length):
+            yield sexpr
 
-        return sexpr
+        # serialize 3D Models at the end
+        for sexpr in self._serializeModels(compiled, format_length):
+            yield sexpr
 
-    def _serialize_Pad(self, node):
-        sexpr = ['pad', node.number, node.type, node.shape]
+    def _serializeArcs(self, compiled, format_length=None):
+        # in KiCAD, some file attributes of Arc are named not in the way of their real meaning
+        layers = compiled.layers
+        rows = compiled.arcs.rows(format_length, ('center_x', 'center_y', 'start_x', 'start_y'))
+        for center_x, center_y, end_x, end_y, angle, layer, width in rows:
+            yield ['fp_arc',
+                   ['start', center_x, center_y],
+                   ['end', end_x, end_y],
+                   ['angle', angle],
+                   ['layer', layers[layer]],
+                   ['width', _get_layer_width(layers[layer], width, format_length)]
+                  ]  # NOQA
+            yield SexprSerializer.NEW_LINE
+
+    def _serializeCircles(self, compiled, format_length=None):
+        layers = compiled.layers
+        rows = compiled.circles.rows(format_length, ('center_x', 'center_y', 'end_x', 'end_y'))
+        for center_x, center_y, end_x, end_y, layer, width in rows:
+            yield ['fp_circle',
+                   ['center', center_x, center_y],
+                   ['end', end_x, end_y],
+                   ['layer', layers[layer]],
+                   ['width', _get_layer_width(layers[layer], width, format_length)]
+                  ]  # NOQA
+            yield SexprSerializer.NEW_LINE
+
+    def _serializeLines(self, compiled, format_length=None):
+        layers = compiled.layers
+        rows = compiled.lines.rows(format_length, ('start_x', 'start_y', 'end_x', 'end_y'))
+        for start_x, start_y, end_x, end_y, layer, width in rows:
+            yield ['fp_line',
+                   ['start', start_x, start_y],
+                   ['end', end_x, end_y],
+                   ['layer', layers[layer]],
+                   ['width', _get_layer_width(layers[layer], width, format_length)]
+                  ]  # NOQA
+            yield SexprSerializer.NEW_LINE
+
+    def _serializeTexts(self, compiled, type_filter, format_length=None):
+        layers = compiled.layers
+        rows = compiled.texts.rows(format_length, ('x', 'y', 'size_x', 'size_y', 'thickness'))
+        for text_type, text, x, y, rotation, layer, hide, size_x, size_y, thickness in rows:
+            if not type_filter(text_type):
+                continue
 
-        position, rotation = node.getRealPosition(node.at, node.rotation)
-        if not rotation % 360 == 0:
-            sexpr.append(['at', position.x, position.y, rotation])
-        else:
-            sexpr.append(['at', position.x, position.y])
+            sexpr = ['fp_text', text_type, text]
+            if rotation:
+                sexpr.append(['at', x, y, rotation])
+            else:
+                sexpr.append(['at', x, y])
 
-        sexpr.append(['size', node.size.x, node.size.y])
+            sexpr.append(['layer', layers[layer]])
+            if hide:
+                sexpr.append('hide')
+            sexpr.append(SexprSerializer.NEW_LINE)
 
-        if node.type in [Pad.TYPE_THT, Pad.TYPE_NPTH]:
-            if node.drill.x == node.drill.y:
-                sexpr.append(['drill', node.drill.x])
+            sexpr.append(['effects',
+                          ['font',
+                           ['size', size_x, size_y],
+                           ['thickness', thickness]
+                          ]
+                         ]
+                        )  # NOQA
+            sexpr.append(SexprSerializer.NEW_LINE)
+
+            yield sexpr
+            yield SexprSerializer.NEW_LINE
+
+    def _serializeModels(self, compiled, format_length=None):
+        # the settings of 3D models are not lengths of the footprint, and are always written as they are
+        for filename, at, scale, rotate in compiled.models.rows():
+            yield ['model', filename,
+                   SexprSerializer.NEW_LINE,
+                   ['at', ['xyz', at.x, at.y, at.z]],
+                   SexprSerializer.NEW_LINE,
+                   ['scale', ['xyz', scale.x, scale.y, scale.z]],
+                   SexprSerializer.NEW_LINE,
+                   ['rotate', ['xyz', rotate.x, rotate.y, rotate.z]],
+                   SexprSerializer.NEW_LINE
+                  ]  # NOQA
+            yield SexprSerializer.NEW_LINE
+
+    def _serializePads(self, compiled, format_length=None):
+        # the remaining expressions only depend on the template, which is shared by many pads
+        template_sexprs = [self._serializePadTemplate(template, format_length) for template in compiled.pad_templates]
+
+        for number, x, y, rotation, template in compiled.pads.rows(format_length, ('x', 'y')):
+            sexpr = ['pad', number, compiled.pad_templates[template].type, compiled.pad_templates[template].shape]
+
+            if not rotation % 360 == 0:
+                sexpr.append(['at', x, y, rotation])
             else:
-                sexpr.append(['drill', 'oval', node.drill.x, node.drill.y])
+                sexpr.append(['at', x, y])
 
-        sexpr.append(['layers'] + node.layers)
+            yield sexpr + template_sexprs[template]
+            yield SexprSerializer.NEW_LINE
 
-        if node.solder_paste_margin_ratio != 0 or node.solder_mask_margin != 0:
-            sexpr.append(SexprSerializer.NEW_LINE)
-            if node.solder_mask_margin != 0:
-                sexpr.append(['solder_mask_margin', node.solder_mask_margin])
-            if node.solder_paste_margin_ratio != 0:
-                sexpr.append(['solder_paste_margin_ratio', node.solder_paste_margin_ratio])
+    def _serializePadTemplate(self, template, format_length=None):
+        # templates are independent of the compiled footprint, so their lengths are always given in millimetres
+        def length(value):
+            return value if format_length is None else format_length(toNanometres(value))
 
-        return sexpr
+        sexpr = [['size', length(template.size.x), length(template.size.y)]]
 
-    def _serialize_Polygon(self, node):
-        node_points = ['pts']
-        points_appended = 0
-        for n in node.nodes:
-            if points_appended >= 4:
-                points_appended = 0
-                node_points.append(SexprSerializer.NEW_LINE)
-            points_appended += 1
+        drill = ['drill']
+        if template.type in [Pad.TYPE_THT, Pad.TYPE_NPTH]:
+            if template.drill.x == template.drill.y:
+                drill.append(length(template.drill.x))
+            else:
+                drill.extend(['oval', length(template.drill.x), length(template.drill.y)])
+        if template.offset.x != 0 or template.offset.y != 0:
+            drill.append(['offset', length(template.offset.x), length(template.offset.y)])
+        if len(drill) > 1:
+            sexpr.append(drill)
 
-            n_pos = node.getRealPosition(n)
-            node_points.append(['xy', n_pos.x, n_pos.y])
+        sexpr.append(['layers'] + list(template.layers))
 
-        sexpr = ['fp_poly',
-                 node_points,
-                 ['layer', node.layer],
-                 ['width', _get_layer_width(node.layer, node.width)]
-                ]  # NOQA
+        if template.solder_paste_margin_ratio != 0 or template.solder_mask_margin != 0:
+            sexpr.append(SexprSerializer.NEW_LINE)
+            if template.solder_mask_margin != 0:
+                sexpr.append(['solder_mask_margin', length(template.solder_mask_margin)])
+            if template.solder_paste_margin_ratio != 0:
+                sexpr.append(['solder_paste_margin_ratio', template.solder_paste_margin_ratio])
 
         return sexpr
+
+    def _serializePolygons(self, compiled, format_length=None):
+        layers = compiled.layers
+        points_x, points_y = compiled.polygon_points.x, compiled.polygon_points.y
+        if format_length is not None:
+            points_x, points_y = list(map(format_length, points_x)), list(map(format_length, points_y))
+        for first_point, point_count, layer, width in compiled.polygons.rows():
+            node_points = ['pts']
+            points_appended = 0
+            for i in range(first_point, first_point + point_count):
+                if points_appended >= 4:
+                    points_appended = 0
+                    node_points.append(SexprSerializer.NEW_LINE)
+                points_appended += 1
+
+                node_points.append(['xy', points_x[i], points_y[i]])
+
+            yield ['fp_poly',
+                   node_points,
+                   ['layer', layers[layer]],
+                   ['width', _get_layer_width(layers[layer], width, format_length)]
+                  ]  # NOQA
+            yield SexprSerializer.NEW_LINE
@@ -13,9 +13,16 @@
 #
 # (C) 2017 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import os
 import sys
+import time
 import argparse
 import csv
+import traceback
+import multiprocessing
+
+from KicadModTree.util.build_cache import BuildCache
+from KicadModTree.util.config_loader import loadYaml
 
 try:
     import yaml
@@ -59,6 +66,8 @@ class ModArgparser(object):
     def __init__(self, footprint_function):
         self._footprint_function = footprint_function
         self._params = {}
+        self._cache = None
+        self._quiet = False
 
     def add_parameter(self, name, **kwargs):
         r"""Add a parameter to the ModArgparser
@@ -97,6 +106,9 @@ class ModArgparser(object):
         This method parses the commandline arguments to determine which actions to take. Beside of parsing .yml and .csv
         files, it also allows us to output example files.
 
+        The footprints can be generated in parallel using ``--jobs N``. Errors of single footprints do not abort the
+        run, but are collected and lead to a non-zero exit code after all footprints were processed.
+
         >>> from KicadModTree import *
         >>> def footprint_gen(args):
         ...    print("create footprint: {}".format(args['name']))
@@ -108,9 +120,14 @@ class ModArgparser(object):
 
         parser = argparse.ArgumentParser(description='Parse footprint defintion file(s) and create matching footprints')
         parser.add_argument('files', metavar='file', type=str, nargs='*', help='.yml or .csv files which contains data')
-        parser.add_argument('-v', '--verbose', help='show some additional information', action='store_true')  # TODO
+        parser.add_argument('-v', '--verbose', help='show some additional information', action='store_true')
+        parser.add_argument('-q', '--quiet', help='only print errors and a summary at the end', action='store_true')
+        parser.add_argument('-j', '--jobs', type=int, default=1,
+                            help='number of footprints which are generated in parallel (0 uses all cpu cores)')
         parser.add_argument('--print_yml', help='print example .yml file', action='store_true')
         parser.add_argument('--print_csv', help='print example .csv file', action='store_true')
+        parser.add_argument('--cache', help='directory of the build cache, which allows skipping unchanged footprints',
+                            default=os.environ.get('KICADMODTREE_CACHE'))
 
         # TODO: allow writing into sub dir
 
@@ -128,41 +145,109 @@ class ModArgparser(object):
             parser.print_help()
             return
 
+        if args.cache:
+            self._cache = BuildCache(args.cache)
+        self._quiet = args.quiet
+
+        start_time = time.time()
+        tasks = []
+        results = []
+
         for filepath in args.files:
-            print("use file: {0}".format(filepath))
+            if not args.quiet:
+                print("use file: {0}".format(filepath))
             if filepath.endswith('.yml') or filepath.endswith('.yaml'):
-                self._parse_and_execute_yml(filepath)
+                tasks.extend(self._parse_yml(filepath, results))
             elif filepath.endswith('.csv'):
-                self._parse_and_execute_csv(filepath)
+                tasks.extend(self._parse_csv(filepath))
             else:
-                print("unexpected filetype: {0}".format(filepath))
+                results.append(self._create_result(filepath, ["unexpected filetype: {0}".format(filepath)]))
+
+        for result in results:
+            self._print_errors(result, args.verbose)
+
+        for result in self._execute_tasks(tasks, args.jobs):
+            results.append(result)
+            if not args.quiet:
+                print("  - generate {name}.kicad_mod".format(name=result['name']))
+            self._print_errors(result, args.verbose)
+
+        self._print_summary(results, time.time() - start_time)
+
+        if any(result['errors'] for result in results):
+            sys.exit(1)
+
+    def _execute_tasks(self, tasks, jobs):
+        '''
+        generator which executes all tasks (dicts of footprint parameters) and yields their results in order
+        '''
+        if jobs == 0:
+            jobs = multiprocessing.cpu_count()
+
+        if jobs <= 1 or len(tasks) <= 1:
+            for kwargs in tasks:
+                yield self._execute_script(**kwargs)
+            return
 
-    def _parse_and_execute_yml(self, filepath):
+        pool = multiprocessing.Pool(min(jobs, len(tasks)), initializer=_init_worker, initargs=(self,))
+        try:
+            for result in pool.imap(_execute_worker_task, tasks):
+                yield result
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _print_errors(self, result, verbose):
+        for error in result['errors']:
+            print("ERROR: {0}: {1}".format(result['name'], error))
+        if verbose and result.get('traceback'):
+            print(result['traceback'])
+
+    def _print_summary(self, results, duration):
+        generated = [result for result in results if not result['errors']]
+        failed = [result for result in results if result['errors']]
+        cached = [result for result in generated if result['cached']]
+
+        summary = "generated {0} footprints".format(len(generated) - len(cached))
+        if cached:
+            summary += ", {0} up to date".format(len(cached))
+        summary += ", {0} failed in {1:.2f}s".format(len(failed), duration)
+        if results:
+            footprint_time = sum(result['duration'] for result in results)
+            summary += " ({0:.1f}ms per footprint)".format(1000 * footprint_time / len(results))
+        print(summary)
+
+    def _parse_yml(self, filepath, results):
+        '''
+        return list of footprint parameters defined in a .yml file, errors are appended to results
+        '''
         if not YAML_AVAILABLE:
             print("pyyaml not available!")
             sys.exit(1)
 
-        with open(filepath, 'r') as stream:
-            try:
-                parsed = yaml.load(stream)  # parse file
+        tasks = []
+        try:
+            parsed = loadYaml(filepath)  # parse file
+        except yaml.YAMLError as exc:
+            results.append(self._create_result(filepath, [str(exc)]))
+            return tasks
 
-                if parsed is None:
-                    print("empty file!")
-                    return
+        if parsed is None:
+            print("empty file!")
+            return tasks
 
-                for footprint in parsed:
-                    kwargs = parsed.get(footprint)
+        for footprint in parsed:
+            kwargs = parsed.get(footprint)
 
-                    # name is a reserved key
-                    if 'name' in kwargs:
-                        print("ERROR: name is already used for root name!")
-                        continue
-                    kwargs['name'] = footprint
+            # name is a reserved key
+            if 'name' in kwargs:
+                results.append(self._create_result(footprint, ["name is already used for root name!"]))
+                continue
+            kwargs['name'] = footprint
 
-                    self._execute_script(**kwargs)  # now we can execute the script
+            tasks.append(kwargs)
 
-            except yaml.YAMLError as exc:
-                print(exc)
+        return tasks
 
     def _create_example_data_required(self, **kwargs):
         params = {}
@@ -207,7 +292,11 @@ class ModArgparser(object):
                 'footprint_full': self._create_example_data_full()}
         print(yaml.dump(data, default_flow_style=False))
 
-    def _parse_and_execute_csv(self, filepath):
+    def _parse_csv(self, filepath):
+        '''
+        return list of footprint parameters defined in a .csv file
+        '''
+        tasks = []
         with open(filepath, 'r') as stream:
             # dialect = csv.Sniffer().sniff(stream.read(1024))  # check which type of formating the csv file likel has
             # stream.seek(0)
@@ -220,7 +309,9 @@ class ModArgparser(object):
                 for k, v in row.items():
                     kwargs[k.strip()] = v.strip()
 
-                self._execute_script(**kwargs)  # now we can execute the script
+                tasks.append(kwargs)
+
+        return tasks
 
     def _print_example_csv(self):
         writer = csv.DictWriter(sys.stdout, fieldnames=self._params.keys())
@@ -229,9 +320,18 @@ class ModArgparser(object):
         writer.writerow(self._create_example_data_required(include_name=True))
         writer.writerow(self._create_example_data_full(include_name=True))
 
+    def _create_result(self, name, errors, duration=0, cached=False):
+        return {'name': name, 'errors': errors, 'duration': duration, 'cached': cached}
+
     def _execute_script(self, **kwargs):
+        '''
+        parse the parameters of a single footprint and call the footprint function
+
+        :return: dict containing the name of the footprint, a list of errors, the duration and if it was cached
+        '''
         parsed_args = {}
-        error = False
+        errors = []
+        start_time = time.time()
 
         for k, v in self._params.items():
             try:
@@ -252,12 +352,39 @@ class ModArgparser(object):
                     else:
                         parsed_args[k] = type(v.get('default'))
             except (ValueError, ParserException) as e:
-                error = True
-                print("ERROR: {}".format(e))
+                errors.append(str(e))
+
+        result = self._create_result(kwargs.get('name', '<anon>'), errors)
+        if errors:
+            return result
+
+        stdout = sys.stdout
+        if self._quiet:
+            sys.stdout = open(os.devnull, 'w')
+        try:
+            if self._cache:
+                result['cached'] = not self._cache.execute(self._footprint_function, parsed_args)
+            else:
+                self._footprint_function(parsed_args)
+        except Exception as e:
+            errors.append("{0}: {1}".format(e.__class__.__name__, e))
+            result['traceback'] = traceback.format_exc()
+        finally:
+            if self._quiet:
+                sys.stdout.close()
+                sys.stdout = stdout
 
-        print("  - generate {name}.kicad_mod".format(name=kwargs.get('name', '<anon>')))
+        result['duration'] = time.time() - start_time
+        return result
+
+
+_worker_parser = None
+
+
+def _init_worker(parser):
+    global _worker_parser
+    _worker_parser = parser
 
-        if error:
-            return
 
-        self._footprint_function(parsed_args)
+def _execute_worker_task(kwargs):
+    return _worker_parser._execute_script(**kwargs)
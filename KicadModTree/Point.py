@@ -18,9 +18,17 @@ import warnings
 from KicadModTree.util.kicad_util import formatFloat
 
 
+_NUMBER_TYPES = (int, float)
+
+_new = object.__new__
+
+
 class Point2D(object):
     r"""Representation of a 2D Point in space
 
+    Points are immutable values: all operations return a new point, and the coordinates of an existing point can not
+    be changed. This allows us to share points between nodes without copying them.
+
     :Example:
 
     >>> from KicadModTree import *
@@ -30,35 +38,54 @@ class Point2D(object):
     >>> Point2D({'x': 0, 'y':0})
     >>> Point2D(Point2D(0, 0))
     """
+
+    __slots__ = ('x', 'y')
+
     def __init__(self, coordinates=None, y=None):
         # parse constructor
-        if coordinates is None:
-            coordinates = {}
-        elif type(coordinates) in [int, float]:
-            if y is not None:
-                coordinates = [coordinates, y]
-            else:
+        coordinates_type = type(coordinates)
+
+        # parse points with format: Point2D(0, 0)
+        if coordinates_type in _NUMBER_TYPES:
+            if y is None:
                 raise TypeError('you have to give x and y coordinate')
-        elif isinstance(coordinates, Point2D):
-            # convert Point2D as well as Point3D to dict
-            coordinates = coordinates.__dict__()
+            _set_x(self, float(coordinates))
+            _set_y(self, float(y))
 
-        # parse points with format: Point2D({'x':0, 'y':0})
-        if type(coordinates) is dict:
-            self.x = float(coordinates.get('x', 0.))
-            self.y = float(coordinates.get('y', 0.))
-            return
+        # parse points with format: Point2D(Point2D(0, 0)), values are already floats
+        elif isinstance(coordinates, Point2D):
+            _set_x(self, coordinates.x)
+            _set_y(self, coordinates.y)
 
         # parse points with format: Point2D([0, 0]) or Point2D((0, 0))
-        if type(coordinates) in [list, tuple]:
-            if len(coordinates) == 2:
-                self.x = float(coordinates[0])
-                self.y = float(coordinates[1])
-                return
-            else:
+        elif coordinates_type in (list, tuple):
+            if len(coordinates) != 2:
                 raise TypeError('invalid list size (2 elements expected)')
+            _set_x(self, float(coordinates[0]))
+            _set_y(self, float(coordinates[1]))
+
+        # parse points with format: Point2D({'x':0, 'y':0})
+        elif coordinates_type is dict:
+            _set_x(self, float(coordinates.get('x', 0.)))
+            _set_y(self, float(coordinates.get('y', 0.)))
+
+        elif coordinates is None:
+            _set_x(self, 0.)
+            _set_y(self, 0.)
 
-        raise TypeError('invalid parameters given')
+        else:
+            raise TypeError('invalid parameters given')
+
+    @classmethod
+    def _from_xy(cls, x, y):
+        r"""Create a point without any parsing or validation
+
+        Only intended for internal use, where x and y are already known to be floats.
+        """
+        point = _new(cls)
+        _set_x(point, x)
+        _set_y(point, y)
+        return point
 
     def round_to(self, base):
         r"""Round to a specific base (like it's required for a grid)
@@ -72,17 +99,33 @@ class Point2D(object):
         if base == 0:
             return self
 
-        return Point2D({'x': round(self.x / base) * base,
-                        'y': round(self.y / base) * base})
+        return Point2D._from_xy(round(self.x / base) * base,
+                                round(self.y / base) * base)
 
     @staticmethod
     def __arithmetic_parse(value):
         if isinstance(value, Point2D):
-            return value
-        elif type(value) in [int, float]:
-            return Point2D([value, value])
+            return value.x, value.y
+        elif type(value) in _NUMBER_TYPES:
+            return value, value
         else:
-            return Point2D(value)
+            other = Point2D(value)
+            return other.x, other.y
+
+    def __setattr__(self, name, value):
+        raise AttributeError("points are immutable, can not set '{}'".format(name))
+
+    def __delattr__(self, name):
+        raise AttributeError("points are immutable, can not delete '{}'".format(name))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Point2D, (self.x, self.y))
 
     def __eq__(self, other):
         if not isinstance(self, other.__class__):
@@ -92,29 +135,28 @@ class Point2D(object):
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        return hash((self.x, self.y))
+
     def __add__(self, value):
-        other = Point2D.__arithmetic_parse(value)
+        other_x, other_y = Point2D.__arithmetic_parse(value)
 
-        return Point2D({'x': self.x + other.x,
-                        'y': self.y + other.y})
+        return Point2D._from_xy(self.x + other_x, self.y + other_y)
 
     def __sub__(self, value):
-        other = Point2D.__arithmetic_parse(value)
+        other_x, other_y = Point2D.__arithmetic_parse(value)
 
-        return Point2D({'x': self.x - other.x,
-                        'y': self.y - other.y})
+        return Point2D._from_xy(self.x - other_x, self.y - other_y)
 
     def __mul__(self, value):
-        other = Point2D.__arithmetic_parse(value)
+        other_x, other_y = Point2D.__arithmetic_parse(value)
 
-        return Point2D({'x': self.x * other.x,
-                        'y': self.y * other.y})
+        return Point2D._from_xy(self.x * other_x, self.y * other_y)
 
     def __div__(self, value):
-        other = Point2D.__arithmetic_parse(value)
+        other_x, other_y = Point2D.__arithmetic_parse(value)
 
-        return Point2D({'x': self.x / other.x,
-                        'y': self.y / other.y})
+        return Point2D._from_xy(self.x / other_x, self.y / other_y)
 
     def __truediv__(self, obj):
         return self.__div__(obj)
@@ -131,15 +173,23 @@ class Point2D(object):
                                  y=formatFloat(self.y))
 
     def __repr__(self):
-        return "Point2D (x={x}, y={y})".format(**self.__dict__())
+        return "Point2D (x={x}, y={y})".format(x=self.x, y=self.y)
 
     def __str__(self):
-        return "(x={x}, y={y})".format(**self.__dict__())
+        return "(x={x}, y={y})".format(x=self.x, y=self.y)
+
+
+# the slots are set through their descriptors, because __setattr__ rejects every change
+_set_x = Point2D.x.__set__
+_set_y = Point2D.y.__set__
 
 
 class Point3D(Point2D):
     r"""Representation of a 3D Point in space
 
+    Points are immutable values: all operations return a new point, and the coordinates of an existing point can not
+    be changed. This allows us to share points between nodes without copying them.
+
     :Example:
 
     >>> from KicadModTree import *
@@ -151,50 +201,65 @@ class Point3D(Point2D):
     >>> Point3D(Point3D(0, 0, 0))
     """
 
+    __slots__ = ('z',)
+
     def __init__(self, coordinates=None, y=None, z=None):
         # we don't need a super constructor here
 
         # parse constructor
-        if coordinates is None:
-            coordinates = {}
-        elif type(coordinates) in [int, float]:
-            if y is not None:
-                if z is not None:
-                    coordinates = [coordinates, y, z]
-                else:
-                    coordinates = [coordinates, y]
-            else:
+        coordinates_type = type(coordinates)
+
+        # parse points with format: Point3D(0, 0) or Point3D(0, 0, 0)
+        if coordinates_type in _NUMBER_TYPES:
+            if y is None:
                 raise TypeError('you have to give at least x and y coordinate')
-        elif isinstance(coordinates, Point2D):
-            # convert Point2D as well as Point3D to dict
-            coordinates = coordinates.__dict__()
+            _set_x(self, float(coordinates))
+            _set_y(self, float(y))
+            _set_z(self, 0. if z is None else float(z))
 
-        # parse points with format: Point2D({'x':0, 'y':0})
-        if type(coordinates) is dict:
-            self.x = float(coordinates.get('x', 0.))
-            self.y = float(coordinates.get('y', 0.))
-            self.z = float(coordinates.get('z', 0.))
-            return
+        # parse points with format: Point3D(Point2D(0, 0)) or Point3D(Point3D(0, 0, 0))
+        elif isinstance(coordinates, Point2D):
+            _set_x(self, coordinates.x)
+            _set_y(self, coordinates.y)
+            _set_z(self, coordinates.z if isinstance(coordinates, Point3D) else 0.)
 
         # parse points with format: Point3D([0, 0]), Point3D([0, 0, 0]) or Point3D((0, 0)), Point3D((0, 0, 0))
-        if type(coordinates) in [list, tuple]:
-            if len(coordinates) >= 2:
-                self.x = float(coordinates[0])
-                self.y = float(coordinates[1])
-            else:
+        elif coordinates_type in (list, tuple):
+            if len(coordinates) < 2:
                 raise TypeError('invalid list size (to small)')
-
-            if len(coordinates) == 3:
-                self.z = float(coordinates[2])
-            else:
-                self.z = 0.
-
             if len(coordinates) > 3:
                 raise TypeError('invalid list size (to big)')
 
+            _set_x(self, float(coordinates[0]))
+            _set_y(self, float(coordinates[1]))
+            _set_z(self, float(coordinates[2]) if len(coordinates) == 3 else 0.)
+
+        # parse points with format: Point3D({'x':0, 'y':0, 'z':0})
+        elif coordinates_type is dict:
+            _set_x(self, float(coordinates.get('x', 0.)))
+            _set_y(self, float(coordinates.get('y', 0.)))
+            _set_z(self, float(coordinates.get('z', 0.)))
+
+        elif coordinates is None:
+            _set_x(self, 0.)
+            _set_y(self, 0.)
+            _set_z(self, 0.)
+
         else:
             raise TypeError('dict or list type required')
 
+    @classmethod
+    def _from_xyz(cls, x, y, z):
+        r"""Create a point without any parsing or validation
+
+        Only intended for internal use, where x, y and z are already known to be floats.
+        """
+        point = _new(cls)
+        _set_x(point, x)
+        _set_y(point, y)
+        _set_z(point, z)
+        return point
+
     def round_to(self, base):
         r"""Round to a specific base (like it's required for a grid)
 
@@ -207,18 +272,22 @@ class Point3D(Point2D):
         if base == 0:
             return self
 
-        return Point3D({'x': round(self.x / base) * base,
-                        'y': round(self.y / base) * base,
-                        'z': round(self.z / base) * base})
+        return Point3D._from_xyz(round(self.x / base) * base,
+                                 round(self.y / base) * base,
+                                 round(self.z / base) * base)
 
     @staticmethod
     def __arithmetic_parse(value):
         if isinstance(value, Point3D):
-            return value
-        elif type(value) in [int, float]:
-            return Point3D([value, value, value])
+            return value.x, value.y, value.z
+        elif type(value) in _NUMBER_TYPES:
+            return value, value, value
         else:
-            return Point3D(value)
+            other = Point3D(value)
+            return other.x, other.y, other.z
+
+    def __reduce__(self):
+        return (Point3D, (self.x, self.y, self.z))
 
     def __eq__(self, other):
         if not isinstance(self, other.__class__):
@@ -228,33 +297,28 @@ class Point3D(Point2D):
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        return hash((self.x, self.y, self.z))
+
     def __add__(self, value):
-        other = Point3D.__arithmetic_parse(value)
+        other_x, other_y, other_z = Point3D.__arithmetic_parse(value)
 
-        return Point3D({'x': self.x + other.x,
-                        'y': self.y + other.y,
-                        'z': self.z + other.z})
+        return Point3D._from_xyz(self.x + other_x, self.y + other_y, self.z + other_z)
 
     def __sub__(self, value):
-        other = Point3D.__arithmetic_parse(value)
+        other_x, other_y, other_z = Point3D.__arithmetic_parse(value)
 
-        return Point3D({'x': self.x - other.x,
-                        'y': self.y - other.y,
-                        'z': self.z - other.z})
+        return Point3D._from_xyz(self.x - other_x, self.y - other_y, self.z - other_z)
 
     def __mul__(self, value):
-        other = Point3D.__arithmetic_parse(value)
+        other_x, other_y, other_z = Point3D.__arithmetic_parse(value)
 
-        return Point3D({'x': self.x * other.x,
-                        'y': self.y * other.y,
-                        'z': self.z * other.z})
+        return Point3D._from_xyz(self.x * other_x, self.y * other_y, self.z * other_z)
 
     def __div__(self, value):
-        other = Point3D.__arithmetic_parse(value)
+        other_x, other_y, other_z = Point3D.__arithmetic_parse(value)
 
-        return Point3D({'x': self.x / other.x,
-                        'y': self.y / other.y,
-                        'z': self.z / other.z})
+        return Point3D._from_xyz(self.x / other_x, self.y / other_y, self.z / other_z)
 
     def __truediv__(self, obj):
         return self.__div__(obj)
@@ -272,16 +336,37 @@ class Point3D(Point2D):
                                  z=formatFloat(self.z))
 
     def __repr__(self):
-        return "Point3D (x={x}, y={y}, z={z})".format(**self.__dict__())
+        return "Point3D (x={x}, y={y}, z={z})".format(x=self.x, y=self.y, z=self.z)
 
     def __str__(self):
-        return "(x={x}, y={y}, z={z})".format(**self.__dict__())
+        return "(x={x}, y={y}, z={z})".format(x=self.x, y=self.y, z=self.z)
+
+
+_set_z = Point3D.z.__set__
 
 
 class Point(Point3D):
+    r"""Deprecated variant of Point3D, which is kept for old scripts
+
+    In contrast to Point2D and Point3D, old scripts are changing the coordinates of existing points.
+    """
+
+    __slots__ = ()
+
+    __hash__ = None
+
+    __setattr__ = object.__setattr__
+    __delattr__ = object.__delattr__
+
     def __init__(self, coordinates=None, y=None, z=None):
         Point3D.__init__(self, coordinates, y, z)
         warnings.warn(
             "Point is deprecated, use Point2D or Point3D instead",
             DeprecationWarning
         )
+
+    def __copy__(self):
+        return Point._from_xyz(self.x, self.y, self.z)
+
+    def __deepcopy__(self, memo):
+        return Point._from_xyz(self.x, self.y, self.z)
@@ -18,6 +18,9 @@ from KicadModTree.Point import *
 # all different types of nodes
 from KicadModTree.nodes import *
 
+# flat representation of footprints
+from KicadModTree.CompiledFootprint import CompiledFootprint, PrimitiveTable
+
 # File Handlers
 from KicadModTree.KicadFileHandler import KicadFileHandler
 
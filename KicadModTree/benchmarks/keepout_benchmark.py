@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import sys
+import os
+import timeit
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.append(BASE_DIR)  # enable package import from parent directory
+sys.path.append(os.path.join(BASE_DIR, "scripts", "tools"))
+sys.path.append(os.path.join(BASE_DIR, "scripts", "TO_SOT_THT"))
+sys.path.append(os.path.join(BASE_DIR, "scripts", "Conn_PinSocket"))
+
+from KicadModTree import *  # NOQA
+
+'''
+Clip the silkscreen of a two row connector with PIN_COUNT round pads, using the keepout handling of the three
+different generator families: scripts/tools/drawing_tools.py, scripts/TO_SOT_THT/tools.py and
+scripts/Conn_PinSocket/canvas.py
+'''
+
+PIN_COUNT = 40
+PITCH = 2.54
+PAD_SIZE = 1.7
+
+
+def pad_positions():
+    return [(x * PITCH, y * PITCH) for x in range(PIN_COUNT // 2) for y in range(2)]
+
+
+def drawing_tools_footprint():
+    import drawing_tools
+
+    keepouts = []
+    for x, y in pad_positions():
+        keepouts += drawing_tools.addKeepoutRound(x, y, PAD_SIZE + 0.3, PAD_SIZE + 0.3)
+
+    kicad_mod = Footprint("bench")
+    w, h = PIN_COUNT // 2 * PITCH, 2 * PITCH
+    drawing_tools.addRectWithKeepout(kicad_mod, -PITCH / 2, -PITCH / 2, w, h, 'F.SilkS', 0.12, keepouts)
+    for x, y in pad_positions():
+        drawing_tools.addHLineWithKeepout(kicad_mod, x - PITCH / 2, x + PITCH / 2, y, 'F.SilkS', 0.12, keepouts)
+        drawing_tools.addCircleWithKeepout(kicad_mod, x, y, PAD_SIZE / 2 + 0.2, 'F.SilkS', 0.12, keepouts)
+        drawing_tools.addLineWithKeepout(kicad_mod, x - 1, y - 1, x + 1, y + 1, 'F.SilkS', 0.12, keepouts)
+    return kicad_mod
+
+
+def to_sot_tht_footprint():
+    import tools
+
+    keepouts = []
+    for x, y in pad_positions():
+        keepouts += tools.addKeepoutRound(x, y, PAD_SIZE + 0.3, PAD_SIZE + 0.3)
+
+    kicad_mod = Footprint("bench")
+    for x, y in pad_positions():
+        tools.addHLineWithKeepout(kicad_mod, x - PITCH, x + PITCH, y, 'F.SilkS', 0.12, keepouts)
+        tools.addVLineWithKeepout(kicad_mod, x, y - PITCH, y + PITCH, 'F.SilkS', 0.12, keepouts)
+        tools.addHDLineWithKeepout(kicad_mod, x - PITCH, 0.2, x + PITCH, y + 0.5, 'F.SilkS', 0.12, keepouts)
+    return kicad_mod
+
+
+def canvas_footprint():
+    from canvas import Layer, PadLayer, Keepout
+
+    kicad_mod = Footprint("bench")
+    silk = Layer(kicad_mod, 'F.SilkS')
+    pads = PadLayer(kicad_mod, [PAD_SIZE, PAD_SIZE], Pad.TYPE_THT, Pad.SHAPE_OVAL, drill=1.0)
+    for x, y in pad_positions():
+        pads.add(x, y)
+
+    keepout = Keepout(silk)
+    keepout.addPads()
+    for x, y in pad_positions():
+        silk.goto(x - PITCH / 2, y).right(PITCH)
+        silk.goto(x, y - PITCH / 2).down(PITCH)
+        silk.goto(x - 1, y - 1).to(2, 2)
+    return kicad_mod
+
+
+def measure(name, create_footprint):
+    try:
+        lines = len(create_footprint().getNormalChilds())
+    except Exception as e:
+        print("{:14s} not available: {}".format(name, e))
+        return
+
+    duration = min(timeit.repeat(create_footprint, repeat=3, number=1))
+    print("{:14s} {:8.2f} ms ({} nodes)".format(name, duration * 1e3, lines))
+
+
+if __name__ == '__main__':
+    measure("drawing_tools", drawing_tools_footprint)
+    measure("TO_SOT_THT", to_sot_tht_footprint)
+    measure("canvas", canvas_footprint)
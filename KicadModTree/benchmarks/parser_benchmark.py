@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import sys
+import os
+import fnmatch
+import timeit
+
+sys.path.append(os.path.join(sys.path[0], "../.."))  # enable package import from parent directory
+
+from KicadModTree import *  # NOQA
+from KicadModTree.util.kicad_util import parseLispString  # NOQA
+from KicadModTree.benchmarks.serializer_benchmark import create_footprint  # NOQA
+
+
+def load_files(paths):
+    files = []
+    for path in paths:
+        for root, _, filenames in os.walk(path):
+            for filename in fnmatch.filter(filenames, '*.kicad_mod'):
+                with open(os.path.join(root, filename), 'r') as f:
+                    files.append(f.read())
+    return files
+
+
+if __name__ == '__main__':
+    # parse existing libraries given as arguments, or generate some footprints to parse
+    files = load_files(sys.argv[1:])
+    if not files:
+        files = [KicadFileHandler(create_footprint(pincount, pincount * 10)).serialize(timestamp=0)
+                 for pincount in range(1, 200)]
+
+    size = sum(len(f) for f in files)
+    duration = min(timeit.repeat(lambda: [parseLispString(f) for f in files], repeat=3, number=1))
+    print("parsed {} files ({:.2f} MB) in {:.3f} s: {:.2f} MB/s".format(len(files), size / 1e6, duration,
+                                                                          size / 1e6 / duration))
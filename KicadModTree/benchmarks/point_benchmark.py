@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import sys
+import os
+import timeit
+import tracemalloc
+
+sys.path.append(os.path.join(sys.path[0], "../.."))  # enable package import from parent directory
+
+from KicadModTree import *  # NOQA
+
+
+POINT_COUNT = 100000
+
+
+def measure_memory(create_point):
+    tracemalloc.start()
+    points = [create_point(i) for i in range(POINT_COUNT)]  # NOQA
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # do not count the list which holds the points, as well as the float objects
+    return (current - sys.getsizeof(points) - POINT_COUNT * sys.getsizeof(1.)) / float(POINT_COUNT)
+
+
+def measure_time(statement, setup, number=POINT_COUNT):
+    return min(timeit.repeat(statement, setup, repeat=5, number=number)) / number * 1e9
+
+
+if __name__ == '__main__':
+    setup = "from KicadModTree import Point2D; p = Point2D(1, 2); q = Point2D(3, 4)"
+
+    print("memory per Point2D:          {:6.1f} bytes".format(measure_memory(lambda i: Point2D(float(i), 1.))))
+    print("Point2D(x, y):               {:6.1f} ns".format(measure_time("Point2D(1.5, 2.5)", setup)))
+    print("Point2D([x, y]):             {:6.1f} ns".format(measure_time("Point2D([1.5, 2.5])", setup)))
+    print("Point2D(Point2D):            {:6.1f} ns".format(measure_time("Point2D(p)", setup)))
+    if hasattr(Point2D, '_from_xy'):
+        print("Point2D._from_xy(x, y):      {:6.1f} ns".format(measure_time("Point2D._from_xy(1.5, 2.5)", setup)))
+    print("Point2D + Point2D:           {:6.1f} ns".format(measure_time("p + q", setup)))
+    print("Point2D * float:             {:6.1f} ns".format(measure_time("p * 2.", setup)))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import sys
+import os
+import timeit
+
+sys.path.append(os.path.join(sys.path[0], "../.."))  # enable package import from parent directory
+
+from KicadModTree import *  # NOQA
+
+
+def create_footprint(pincount, polygon_points):
+    kicad_mod = Footprint("benchmark")
+    kicad_mod.append(Text(type='reference', text='REF**', at=[0, -3], layer='F.SilkS'))
+    kicad_mod.append(Text(type='value', text="benchmark", at=[0, 3], layer='F.Fab'))
+
+    kicad_mod.append(PadArray(pincount=pincount, x_spacing=2.54, center=[0, 0], type=Pad.TYPE_THT,
+                              shape=Pad.SHAPE_OVAL, size=[1.7, 1.7], drill=1.0, layers=Pad.LAYERS_THT))
+    kicad_mod.append(RectLine(start=[-pincount * 1.27, -1.5], end=[pincount * 1.27, 1.5], layer='F.SilkS'))
+    kicad_mod.append(Polygon(nodes=[[i * 0.01, (i % 7) * 0.1] for i in range(polygon_points)], layer='F.SilkS'))
+
+    return kicad_mod
+
+
+if __name__ == '__main__':
+    for pincount, polygon_points in [(10, 100), (100, 1000), (1000, 10000)]:
+        file_handler = KicadFileHandler(create_footprint(pincount, polygon_points))
+        duration = min(timeit.repeat(lambda: file_handler.serialize(timestamp=0), repeat=3, number=1))
+        print("{:5d} pads, {:5d} polygon points: {:8.2f} ms".format(pincount, polygon_points, duration * 1000))
@@ -14,8 +14,14 @@
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 
+import math
+
+from KicadModTree.CompiledFootprint import CompiledFootprint
 from KicadModTree.Point import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.nodes.specialized.PolygoneLine import PolygoneLine
+from KicadModTree.nodes.specialized.RectLine import RectLine
+from KicadModTree.util.geometric_util import mergeBoundingBoxes, rectUnionOutline
 
 
 '''
@@ -57,3 +63,64 @@ class Footprint(Node):
 
     def setAttribute(self, value):
         self.attribute = value
+
+    def compile(self, nanometres=False):
+        '''
+        resolve all transformations and convert the footprint into flat arrays per kind of primitive
+
+        The result does not follow later changes of the footprint.
+
+        :param nanometres: store lengths as integer nanometres instead of millimetres (default: False)
+        :return: ``CompiledFootprint``
+        '''
+        return CompiledFootprint(self, nanometres=nanometres)
+
+    def addCourtyard(self, offset=0.25, grid=0.01, layers=None, pads=True, polygonal=False, layer='F.CrtYd',
+                     width=None):
+        '''
+        add a courtyard around the pads and the body of the footprint
+
+        The extents are taken from the cached bounding boxes of the footprint, so everything which should be
+        enclosed has to be added before.
+
+        :param offset: clearance between the enclosed geometry and the courtyard
+        :param grid: the courtyard is rounded outwards to this grid
+        :param layers: layers which show the body of the part (default: ['F.Fab'])
+        :param pads: enclose the copper of the pads
+        :param polygonal: enclose the body layers and the pads by separate rectangles, and draw the outline of their
+                          union instead of one rectangle around everything
+        :param layer: layer of the courtyard (default: 'F.CrtYd')
+        :param width: line width (default: None, which means auto detection)
+        :return: ``{'min': Point2D, 'max': Point2D}`` of the courtyard, or None when there is nothing to enclose
+        '''
+        layer_groups = [[body_layer] for body_layer in (['F.Fab'] if layers is None else layers)]
+        if pads:
+            layer_groups.append(['F.Cu', 'B.Cu', '*.Cu'])
+
+        rects = []
+        for layer_group in layer_groups:
+            bounding_box = self._getBoundingBox(layer_group)
+            if bounding_box:
+                min_x, min_y, max_x, max_y = bounding_box
+                rects.append((_roundDown(min_x - offset, grid), _roundDown(min_y - offset, grid),
+                              _roundUp(max_x + offset, grid), _roundUp(max_y + offset, grid)))
+        if not rects:
+            return None
+
+        min_x, min_y, max_x, max_y = mergeBoundingBoxes(rects)
+        if polygonal:
+            for outline in rectUnionOutline(rects):
+                self.append(PolygoneLine(polygone=outline + outline[:1], layer=layer, width=width))
+        else:
+            self.append(RectLine(start=[min_x, min_y], end=[max_x, max_y], layer=layer, width=width))
+
+        return {'min': Point2D(min_x, min_y), 'max': Point2D(max_x, max_y)}
+
+
+def _roundDown(value, grid):
+    # the tolerance prevents floating point errors from moving values which are already on the grid
+    return round(math.floor(value / grid + 1e-6) * grid, 6)
+
+
+def _roundUp(value, grid):
+    return round(math.ceil(value / grid - 1e-6) * grid, 6)
@@ -13,9 +13,28 @@
 #
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
-from copy import copy, deepcopy
+from collections import OrderedDict
+from copy import deepcopy
 
 from KicadModTree.Point import *
+from KicadModTree.util.geometric_util import IDENTITY_TRANSFORMATION, composeTransformation, applyTransformation, \
+    applyTransformationArray, NUMPY_AVAILABLE, EMPTY_BOUNDING_BOX, mergeBoundingBoxes
+
+if NUMPY_AVAILABLE:
+    import numpy
+
+
+def _parseXY(coordinate):
+    if isinstance(coordinate, Point2D):
+        return coordinate.x, coordinate.y
+    elif type(coordinate) is dict:
+        return coordinate.get('x', 0.), coordinate.get('y', 0.)
+    return coordinate[0], coordinate[1]
+
+
+def _mergeLayerBoundingBoxes(boxes, other_boxes):
+    for layer, box in other_boxes.items():
+        boxes[layer] = mergeBoundingBoxes([boxes.get(layer), box])
 
 
 class MultipleParentsError(RuntimeError):
@@ -35,7 +54,18 @@ class RecursionDetectedError(RuntimeError):
 class Node(object):
     def __init__(self):
         self._parent = None
-        self._childs = []
+
+        # ordered set of the normal childs. Nodes are hashed by identity, so lookup and removal are O(1)
+        self._childs = OrderedDict()
+
+        # cached transformation of this node, relative to the root node
+        self._transformation = None
+
+        # cached bounding boxes of this node and its childs per layer, relative to the root node
+        self._bounding_boxes = None
+
+        # virtual childs are created when they are requested for the first time
+        self._virtual_childs = None
 
     def append(self, node):
         '''
@@ -47,15 +77,17 @@ class Node(object):
         if node._parent:
             raise MultipleParentsError('muliple parents are not allowed!')
 
-        self._childs.append(node)
+        self._childs[node] = None
 
         node._parent = self
+        node._invalidateTransformation()
+        self.invalidateBoundingBox()
 
     def extend(self, nodes):
         '''
         add list of nodes to child
         '''
-        new_nodes = []
+        new_nodes = OrderedDict()
         for node in nodes:
             if not isinstance(node, Node):
                 raise TypeError('invalid object, has to be based on Node')
@@ -63,13 +95,15 @@ class Node(object):
             if node._parent or node in new_nodes:
                 raise MultipleParentsError('muliple parents are not allowed!')
 
-            new_nodes.append(node)
+            new_nodes[node] = None
 
         # when all went smooth by now, we can set the parent nodes to ourself
         for node in new_nodes:
             node._parent = self
+            node._invalidateTransformation()
 
-        self._childs.extend(new_nodes)
+        self._childs.update(new_nodes)
+        self.invalidateBoundingBox()
 
     def remove(self, node):
         '''
@@ -78,10 +112,11 @@ class Node(object):
         if not isinstance(node, Node):
             raise TypeError('invalid object, has to be based on Node')
 
-        while node in self._childs:
-            self._childs.remove(node)
+        self._childs.pop(node, None)
 
         node._parent = None
+        node._invalidateTransformation()
+        self.invalidateBoundingBox()
 
     def insert(self, node):
         '''
@@ -90,35 +125,123 @@ class Node(object):
         if not isinstance(node, Node):
             raise TypeError('invalid object, has to be based on Node')
 
-        for child in copy(self._childs):
-            self.remove(child)
-            node.append(child)
+        childs = list(self._childs)
+        self._childs = OrderedDict()
+        for child in childs:
+            child._parent = None
+        node.extend(childs)
 
         self.append(node)
 
     def copy(self):
-        copy = deepcopy(self)
-        copy._parent = None
+        # the tree above this node is not part of the copy
+        parent = self._parent
+        self._parent = None
+        try:
+            copy = deepcopy(self)
+        finally:
+            self._parent = parent
+
+        copy._invalidateTransformation()
         return copy
 
+    def __getstate__(self):
+        # virtual childs are not copied, the copy creates them again when they are needed
+        state = self.__dict__.copy()
+        state['_virtual_childs'] = None
+        return state
+
     def serialize(self):
-        nodes = [self]
-        for child in self.getAllChilds():
-            nodes += child.serialize()
-        return nodes
+        '''
+        list of this node and all of its childs, see walk()
+        '''
+        return [node for node, _ in self.walk()]
+
+    def walk(self, type=None, layer=None, handle_virtual_childs=None):
+        '''
+        iterate over this node and all of its childs (depth first, normal childs before virtual childs)
+
+        Every node is yielded together with its transformation relative to the root node, which is also stored as the
+        cached transformation of the node. The tree is traversed using an explicit stack, so no lists of nodes are
+        built up.
+
+        :param type: only yield nodes which are an instance of this class (or tuple of classes)
+        :param layer: only yield nodes which are drawn on this layer
+        :param handle_virtual_childs: called with a node before its virtual childs are created (after its normal
+                                      childs). When it returns True, the virtual childs were handled otherwise and are
+                                      skipped.
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> for pad, transformation in kicad_mod.walk(type=Pad):
+        ...     print(pad.number)
+        '''
+        transformation = IDENTITY_TRANSFORMATION if self._parent is None else self._parent.getTransformation()
+        stack = [(self, transformation, False)]
+        while stack:
+            node, transformation, virtual_childs = stack.pop()
+            if virtual_childs:
+                if handle_virtual_childs is None or not handle_virtual_childs(node):
+                    for child in reversed(node.getVirtualChilds()):
+                        stack.append((child, transformation, False))
+                continue
+
+            if node._transformation is None:
+                local_transformation = node._getLocalTransformation()
+                if local_transformation is not None:
+                    transformation = composeTransformation(transformation, local_transformation)
+                node._transformation = transformation
+            else:
+                transformation = node._transformation
+
+            if (type is None or isinstance(node, type)) and (layer is None or layer in node._getGeometryLayers()):
+                yield node, transformation
+
+            # the virtual childs are taken from the stack after all normal childs, which are pushed in reverse order
+            stack.append((node, transformation, True))
+            for child in reversed(node._childs):
+                stack.append((child, transformation, False))
 
     def getNormalChilds(self):
         '''
         Get all normal childs of this node
         '''
-        return self._childs
+        return list(self._childs)
 
     def getVirtualChilds(self):
         '''
         Get virtual childs of this node
+
+        They are created by _createVirtualChilds when they are requested for the first time.
+        '''
+        if self._virtual_childs is None:
+            self._virtual_childs = self._createVirtualChilds()
+        return self._virtual_childs
+
+    def _createVirtualChilds(self):
+        '''
+        create the virtual childs of this node, with this node set as their parent
         '''
         return []
 
+    def _compileVirtualChilds(self, compiled):
+        '''
+        add the virtual childs to a CompiledFootprint without creating them
+
+        :return: False when this is not supported, so the virtual childs have to be created and compiled
+        '''
+        return False
+
+    def _getCreatedChilds(self):
+        '''
+        normal childs and the virtual childs which were already created
+        '''
+        if self._virtual_childs is None:
+            return list(self._childs)
+        return list(self._childs) + self._virtual_childs
+
     def getAllChilds(self):
         '''
         Get virtual and normal childs of this node
@@ -146,35 +269,161 @@ class Node(object):
         '''
         return position of point after applying all transformation and rotation operations
         '''
-        if not self._parent:
-            if rotation is None:
-                # TODO: most of the points are 2D Nodes
-                return Point3D(coordinate)
-            else:
-                return Point3D(coordinate), rotation
+        transformation = self.getTransformation()
 
-        return self._parent.getRealPosition(coordinate, rotation)
+        # TODO: most of the points are 2D Nodes
+        position = coordinate if type(coordinate) is Point3D else Point3D(coordinate)
+        if transformation is not IDENTITY_TRANSFORMATION:
+            x, y = applyTransformation(transformation, position.x, position.y)
+            position = Point3D._from_xyz(x, y, position.z)
 
-    def calculateBoundingBox(self, outline=None):
-        min_x, min_y = 0, 0
-        max_x, max_y = 0, 0
+        if rotation is None:
+            return position
 
-        if outline:
-            min_x = outline['min']['x']
-            min_y = outline['min']['y']
-            max_x = outline['max']['x']
-            max_y = outline['max']['y']
+        return position, rotation + transformation[6]
 
-        for child in self.getAllChilds():
-            child_outline = child.calculateBoundingBox()
+    def getRealPositions(self, coordinates):
+        '''
+        return positions of many points after applying all transformation operations
+
+        The points can be given as (N,2) array or as list of points. When numpy is available a (N,2) numpy array is
+        returned, otherwise a list of (x, y) tuples.
+        '''
+        if not NUMPY_AVAILABLE or not isinstance(coordinates, numpy.ndarray):
+            coordinates = [_parseXY(c) for c in coordinates]
 
-            min_x = min([min_x, child_outline['min']['x']])
-            min_y = min([min_y, child_outline['min']['y']])
-            max_x = max([max_x, child_outline['max']['x']])
-            max_y = max([max_y, child_outline['max']['y']])
+        return applyTransformationArray(self.getTransformation(), coordinates)
 
+    def getTransformation(self):
+        '''
+        get the transformation of this node relative to the root node
+
+        The result is cached, so resolving many points below the same node only walks the parent chain once.
+        '''
+        if self._transformation is not None:
+            return self._transformation
+
+        # collect all parents which do not know their transformation yet
+        uncached_nodes = []
+        node = self
+        while node is not None and node._transformation is None:
+            uncached_nodes.append(node)
+            node = node._parent
+
+        transformation = IDENTITY_TRANSFORMATION if node is None else node._transformation
+        for node in reversed(uncached_nodes):
+            local_transformation = node._getLocalTransformation()
+            if local_transformation is not None:
+                transformation = composeTransformation(transformation, local_transformation)
+            node._transformation = transformation
+
+        return transformation
+
+    def _getLocalTransformation(self):
+        '''
+        transformation which is applied by this node to its childs (None means no transformation)
+        '''
+        return None
+
+    def _invalidateTransformation(self):
+        '''
+        drop the cached transformation and bounding box of this node and all of its childs
+        '''
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+
+            # childs can only have a cached transformation when their parent has one. Bounding boxes which contain
+            # any geometry were calculated using the transformation, so they are covered as well.
+            if node._transformation is None and node is not self:
+                continue
+
+            node._transformation = None
+            node._bounding_boxes = None
+            nodes.extend(node._getCreatedChilds())
+
+    def invalidateBoundingBox(self):
+        '''
+        drop the cached bounding box of this node and all of its parents
+
+        This is done automatically when the tree is changed, but has to be called after modifying the attributes of
+        a node which already calculated its bounding box.
+        '''
+        node = self
+        while node is not None:
+            node._bounding_boxes = None
+            node = node._parent
+
+    def calculateBoundingBox(self, layers=None):
+        '''
+        get the bounding box of this node and all of its childs, relative to the root node
+
+        The bounding boxes are cached per layer until the tree is changed.
+
+        :param layers: only include geometry on the given layers (pads are on all of their layers)
+        :return: ``{'min': Point2D, 'max': Point2D}``, or None when there is no geometry
+        '''
+        bounding_box = self._getBoundingBox(layers)
+        if not bounding_box:
+            return None
+
+        min_x, min_y, max_x, max_y = bounding_box
         return {'min': Point2D(min_x, min_y), 'max': Point2D(max_x, max_y)}
 
+    def _getBoundingBox(self, layers=None):
+        '''
+        bounding box of the given layers (default: all layers) as (min_x, min_y, max_x, max_y) tuple
+        '''
+        boxes = self._getLayerBoundingBoxes()
+        if layers is None:
+            return mergeBoundingBoxes(boxes.values())
+        return mergeBoundingBoxes([boxes.get(layer) for layer in layers])
+
+    def _getLayerBoundingBoxes(self):
+        '''
+        cached bounding boxes of this node and all of its childs, as dict of layer: (min_x, min_y, max_x, max_y)
+        '''
+        if self._bounding_boxes is None:
+            self._bounding_boxes = self._calculateLayerBoundingBoxes()
+        return self._bounding_boxes
+
+    def _calculateLayerBoundingBoxes(self):
+        boxes = {}
+
+        own_box = self._calculateOwnBoundingBox()
+        if own_box:
+            for layer in self._getGeometryLayers():
+                boxes[layer] = own_box
+
+        for child in self.getNormalChilds():
+            _mergeLayerBoundingBoxes(boxes, child._getLayerBoundingBoxes())
+        _mergeLayerBoundingBoxes(boxes, self._calculateVirtualChildsBoundingBoxes())
+
+        return boxes
+
+    def _calculateVirtualChildsBoundingBoxes(self):
+        '''
+        bounding boxes of all virtual childs per layer
+
+        Nodes which can calculate them from their parameters should do so, to avoid creating the virtual childs.
+        '''
+        boxes = {}
+        for child in self.getVirtualChilds():
+            _mergeLayerBoundingBoxes(boxes, child._getLayerBoundingBoxes())
+        return boxes
+
+    def _calculateOwnBoundingBox(self):
+        '''
+        bounding box of the geometry of this node without its childs, relative to the root node
+        '''
+        return EMPTY_BOUNDING_BOX
+
+    def _getGeometryLayers(self):
+        '''
+        layers on which the geometry of this node is placed
+        '''
+        return [getattr(self, 'layer', None)]
+
     def _getRenderTreeText(self):
         '''
         Text which is displayed when generating a render tree
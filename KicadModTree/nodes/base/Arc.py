@@ -15,6 +15,7 @@
 
 from KicadModTree.Point import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.geometric_util import arcBoundingBox
 import math
 
 
@@ -51,30 +52,11 @@ class Arc(Node):
         self.layer = kwargs.get('layer', 'F.SilkS')
         self.width = kwargs.get('width')
 
-    def calculateBoundingBox(self):
-        # TODO: finish implementation
-        min_x = min(self.start_pos.x, self._calulateEndPos().x)
-        min_y = min(self.start_pos.x, self._calulateEndPos().y)
-        max_x = max(self.start_pos.x, self._calulateEndPos().x)
-        max_y = max(self.start_pos.x, self._calulateEndPos().y)
+    def _calculateOwnBoundingBox(self):
+        center = self.getRealPosition(self.center_pos)
+        start = self.getRealPosition(self.start_pos)
 
-        '''
-        for angle in range(4):
-            float_angle = angle * math.pi/2.
-
-            start_angle = _calculateStartAngle(self)
-            end_angle = start_angle + math.radians(self.angle)
-
-            # TODO: +- pi border
-            if float_angle < start_angle:
-                continue
-            if float_angle > end_angle:
-                continue
-
-            print("TODO: add angle side: {1}".format(float_angle))
-        '''
-
-        return Node.calculateBoundingBox({'min': Point2D((min_x, min_y)), 'max': Point2D((max_x, max_y))})
+        return arcBoundingBox(center.x, center.y, start.x, start.y, self.angle)
 
     def _calulateEndPos(self):
         radius = self._calculateRadius()
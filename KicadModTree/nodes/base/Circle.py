@@ -49,13 +49,10 @@ class Circle(Node):
         self.layer = kwargs.get('layer', 'F.SilkS')
         self.width = kwargs.get('width')
 
-    def calculateBoundingBox(self):
-        min_x = self.center_pos.x-self.radius
-        min_y = self.center_pos.y-self.radius
-        max_x = self.center_pos.x+self.radius
-        max_y = self.center_pos.y+self.radius
+    def _calculateOwnBoundingBox(self):
+        center = self.getRealPosition(self.center_pos)
 
-        return Node.calculateBoundingBox({'min': ParseXY(min_x, min_y), 'max': ParseXY(max_x, max_y)})
+        return (center.x-self.radius, center.y-self.radius, center.x+self.radius, center.y+self.radius)
 
     def _getRenderTreeText(self):
         render_strings = ['fp_circle']
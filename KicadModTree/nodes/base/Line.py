@@ -15,6 +15,7 @@
 
 from KicadModTree.Point import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.geometric_util import pointsBoundingBox
 
 
 class Line(Node):
@@ -47,16 +48,8 @@ class Line(Node):
         self.layer = kwargs.get('layer', 'F.SilkS')
         self.width = kwargs.get('width')
 
-    def calculateBoundingBox(self):
-        render_start_pos = self.getRealPosition(self.start_pos)
-        render_end_pos = self.getRealPosition(self.end_pos)
-
-        min_x = min([render_start_pos.x, render_end_pos.x])
-        min_y = min([render_start_pos.y, render_end_pos.y])
-        max_x = max([render_start_pos.x, render_end_pos.x])
-        max_y = max([render_start_pos.y, render_end_pos.y])
-
-        return Node.calculateBoundingBox({'min': Point2D(min_x, min_y), 'max': Point2D(max_x, max_y)})
+    def _calculateOwnBoundingBox(self):
+        return pointsBoundingBox(self.getRealPositions([self.start_pos, self.end_pos]))
 
     def _getRenderTreeText(self):
         render_strings = ['fp_line']
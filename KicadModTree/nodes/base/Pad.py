@@ -13,28 +13,51 @@
 #
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import math
+
 from KicadModTree.Point import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.geometric_util import pointsBoundingBox, rotatedRectExtents
 from KicadModTree.util.kicad_util import lispString
 
 
+def _templateProperty(name):
+    # settings of a pad are read from its template. Changing them replaces the template of this pad only, the other
+    # pads which share the template are not affected.
+    def getter(self):
+        return getattr(self.template, name)
+
+    def setter(self, value):
+        self.template = self.template.derive(**{name: value})
+        self.invalidateBoundingBox()
+
+    return property(getter, setter)
+
+
 class Pad(Node):
     r"""Add a Pad to the render tree
 
+    All settings except number, position and rotation are held by a ``PadTemplate``. Pads which are created with the
+    same *template* share it, so the settings are only validated and stored once. Setting them on a pad (like
+    ``pad.size = [2, 2]``) gives this pad a new template. The layers of a pad are a tuple, so they have to be replaced
+    as a whole (like ``pad.layers = pad.layers + ('F.SilkS',)``).
+
     :param \**kwargs:
         See below
 
     :Keyword Arguments:
         * *number* (``int``, ``str``) --
           number/name of the pad (default: \"\")
-        * *type* (``Pad.TYPE_THT``, ``Pad.TYPE_SMT``, ``Pad.TYPE_CONNECT``, ``Pad.TYPE_NPTH``) --
-          type of the pad
-        * *shape* (``Pad.SHAPE_CIRCLE``, ``Pad.SHAPE_OVAL``, ``Pad.SHAPE_RECT``, ``Pad.SHAPE_TRAPEZE``) --
-          shape of the pad
         * *at* (``Point``) --
           center position of the pad
         * *rotation* (``float``) --
           rotation of the pad
+        * *template* (``PadTemplate``) --
+          shared settings of the pad. When not given, a new template is created from the following arguments
+        * *type* (``Pad.TYPE_THT``, ``Pad.TYPE_SMT``, ``Pad.TYPE_CONNECT``, ``Pad.TYPE_NPTH``) --
+          type of the pad
+        * *shape* (``Pad.SHAPE_CIRCLE``, ``Pad.SHAPE_OVAL``, ``Pad.SHAPE_RECT``, ``Pad.SHAPE_TRAPEZE``) --
+          shape of the pad
         * *size* (``float``, ``Point``) --
           size of the pad
         * *offset* (``Point``) --
@@ -53,6 +76,8 @@ class Pad(Node):
     >>> from KicadModTree import *
     >>> Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
     ...     at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT)
+    >>> template = PadTemplate(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, size=[1, 2], layers=Pad.LAYERS_SMT)
+    >>> Pad(number=2, at=[1.27, 0], template=template)
     """
 
     TYPE_THT = 'thru_hole'
@@ -76,9 +101,94 @@ class Pad(Node):
         Node.__init__(self)
 
         self._initNumber(**kwargs)
+        self._initPosition(**kwargs)
+        self._initTemplate(**kwargs)
+
+    def _initNumber(self, **kwargs):
+        self.number = kwargs.get('number', "")  # default to an un-numbered pad
+
+    def _initPosition(self, **kwargs):
+        if not kwargs.get('at'):
+            raise KeyError('center position not declared (like "at=[0,0]")')
+        self.at = Point2D(kwargs.get('at'))
+
+        self.rotation = kwargs.get('rotation', 0)
+
+    def _initTemplate(self, **kwargs):
+        template = kwargs.get('template')
+        if template is None:
+            self.template = PadTemplate(**kwargs)
+            return
+
+        if not isinstance(template, PadTemplate):
+            raise TypeError('template has to be a PadTemplate')
+        overridden = [key for key in PadTemplate.__slots__ if key in kwargs]
+        if overridden:
+            raise KeyError('{keys} cannot be declared together with a template'.format(keys=', '.join(overridden)))
+        self.template = template
+
+    type = _templateProperty('type')
+    shape = _templateProperty('shape')
+    size = _templateProperty('size')
+    offset = _templateProperty('offset')
+    drill = _templateProperty('drill')
+    solder_paste_margin_ratio = _templateProperty('solder_paste_margin_ratio')
+    solder_mask_margin = _templateProperty('solder_mask_margin')
+
+    # a tuple, so changing the shared layers in place fails. Use pad.layers = pad.layers + ('F.SilkS',) instead.
+    layers = _templateProperty('layers')
+
+    def _calculateOwnBoundingBox(self):
+        position, rotation = self.getRealPosition(self.at, self.rotation)
+        offset_x, offset_y, half_width, half_height = self.template.calculateExtents(rotation)
+
+        x = position.x + offset_x
+        y = position.y + offset_y
+        return (x-half_width, y-half_height, x+half_width, y+half_height)
+
+    def _getGeometryLayers(self):
+        return self.template.layers
+
+    def _getRenderTreeText(self):
+        render_strings = ['pad']
+        render_strings.append(lispString(self.number))
+        render_strings.append(lispString(self.type))
+        render_strings.append(lispString(self.shape))
+        render_strings.append(self.at.render('(at {x} {y})'))
+        render_strings.append(self.size.render('(size {x} {y})'))
+        render_strings.append('(drill {})'.format(self.drill))
+        render_strings.append('(layers {})'.format(' '.join(self.layers)))
+
+        render_text = Node._getRenderTreeText(self)
+        render_text += '({})'.format(' '.join(render_strings))
+
+        return render_text
+
+
+class PadTemplate(object):
+    r"""Settings of a pad which are shared by many pads, like all pins of a connector
+
+    The settings are validated once when the template is created and cannot be changed afterwards, the layers are
+    stored as tuple. Use ``derive()`` to get a template with other settings.
+
+    :param \**kwargs:
+        *type*, *shape*, *size*, *offset*, *drill*, *solder_paste_margin_ratio*, *solder_mask_margin* and *layers*,
+        see ``Pad``. Other arguments are ignored.
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> template = PadTemplate(type=Pad.TYPE_THT, shape=Pad.SHAPE_OVAL, size=[1.7, 1.7], drill=1,
+    ...                        layers=Pad.LAYERS_THT)
+    >>> pads = [Pad(number=i + 1, at=[i * 2.54, 0], template=template) for i in range(10)]
+    """
+
+    __slots__ = ('type', 'shape', 'size', 'offset', 'drill', 'solder_paste_margin_ratio', 'solder_mask_margin',
+                 'layers')
+
+    def __init__(self, **kwargs):
         self._initType(**kwargs)
         self._initShape(**kwargs)
-        self._initPosition(**kwargs)
         self._initSize(**kwargs)
         self._initOffset(**kwargs)
         self._initDrill(**kwargs)  # requires pad type and offset
@@ -86,41 +196,108 @@ class Pad(Node):
         self._initSolderMaskMargin(**kwargs)
         self._initLayers(**kwargs)
 
-    def _initNumber(self, **kwargs):
-        self.number = kwargs.get('number', "")  # default to an un-numbered pad
+    def __setattr__(self, name, value):
+        raise AttributeError('PadTemplate is immutable')
+
+    def derive(self, **kwargs):
+        '''
+        get a new template with the given settings, all other settings are taken from this template
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> template = PadTemplate(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, size=[1, 2], layers=Pad.LAYERS_SMT)
+        >>> template.derive(size=[1, 3])
+        '''
+        settings = self.__getstate__()
+        settings.update(kwargs)
+        return PadTemplate(**settings)
+
+    def __copy__(self):
+        # templates are immutable, so copied pads can share them
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getstate__(self):
+        return dict((name, getattr(self, name)) for name in PadTemplate.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            self._set(name, value)
+
+    def calculateExtents(self, rotation):
+        '''
+        outline of a pad with this template, which is rotated by the given angle (in degree)
+
+        :return: (offset_x, offset_y, half_width, half_height) of the bounding box, relative to the pad position
+        '''
+        phi = rotation*math.pi/180
+        cos_phi = math.cos(phi)
+        sin_phi = math.sin(phi)
+
+        offset_x = cos_phi*self.offset.x + sin_phi*self.offset.y
+        offset_y = -sin_phi*self.offset.x + cos_phi*self.offset.y
+
+        if self.shape == Pad.SHAPE_CIRCLE:
+            radius = self.size.x / 2.
+            return offset_x, offset_y, radius, radius
+
+        if self.shape == Pad.SHAPE_OVAL:
+            # straight segment between the two half circles
+            radius = min(self.size.x, self.size.y) / 2.
+            length = abs(self.size.x - self.size.y) / 2.
+            if self.size.x >= self.size.y:
+                return offset_x, offset_y, abs(cos_phi*length) + radius, abs(sin_phi*length) + radius
+            return offset_x, offset_y, abs(sin_phi*length) + radius, abs(cos_phi*length) + radius
+
+        half_width, half_height = rotatedRectExtents(self.size.x, self.size.y, rotation)
+        return offset_x, offset_y, half_width, half_height
+
+    def calculatePadsBoundingBox(self, positions, rotation):
+        '''
+        bounding box of pads with this template, at the given positions and rotation relative to the root node
+
+        :return: (min_x, min_y, max_x, max_y) tuple, or an empty tuple when no position is given
+        '''
+        bounding_box = pointsBoundingBox(positions)
+        if not bounding_box:
+            return bounding_box
+
+        offset_x, offset_y, half_width, half_height = self.calculateExtents(rotation)
+        min_x, min_y, max_x, max_y = bounding_box
+        return (min_x + offset_x - half_width, min_y + offset_y - half_height,
+                max_x + offset_x + half_width, max_y + offset_y + half_height)
+
+    def _set(self, name, value):
+        object.__setattr__(self, name, value)
 
     def _initType(self, **kwargs):
         if not kwargs.get('type'):
             raise KeyError('type not declared (like "type=Pad.TYPE_THT")')
-        self.type = kwargs.get('type')
+        self._set('type', kwargs.get('type'))
         if self.type not in Pad._TYPES:
             raise ValueError('{type} is an invalid type for pads'.format(type=self.type))
 
     def _initShape(self, **kwargs):
         if not kwargs.get('shape'):
             raise KeyError('shape not declared (like "shape=Pad.SHAPE_CIRCLE")')
-        self.shape = kwargs.get('shape')
+        self._set('shape', kwargs.get('shape'))
         if self.shape not in Pad._SHAPES:
             raise ValueError('{shape} is an invalid shape for pads'.format(shape=self.shape))
 
-    def _initPosition(self, **kwargs):
-        if not kwargs.get('at'):
-            raise KeyError('center position not declared (like "at=[0,0]")')
-        self.at = Point2D(kwargs.get('at'))
-
-        self.rotation = kwargs.get('rotation', 0)
-
     def _initSize(self, **kwargs):
         if not kwargs.get('size'):
             raise KeyError('pad size not declared (like "size=[1,1]")')
         if type(kwargs.get('size')) in [int, float]:
             # when the attribute is a simple number, use it for x and y
-            self.size = Point2D([kwargs.get('size'), kwargs.get('size')])
+            self._set('size', Point2D([kwargs.get('size'), kwargs.get('size')]))
         else:
-            self.size = Point2D(kwargs.get('size'))
+            self._set('size', Point2D(kwargs.get('size')))
 
     def _initOffset(self, **kwargs):
-        self.offset = Point2D(kwargs.get('offset', [0, 0]))
+        self._set('offset', Point2D(kwargs.get('offset', [0, 0])))
 
     def _initDrill(self, **kwargs):
         if self.type in [Pad.TYPE_THT, Pad.TYPE_NPTH]:
@@ -128,42 +305,23 @@ class Pad(Node):
                 raise KeyError('drill size required (like "drill=1")')
             if type(kwargs.get('drill')) in [int, float]:
                 # when the attribute is a simple number, use it for x and y
-                self.drill = Point2D([kwargs.get('drill'), kwargs.get('drill')])
+                self._set('drill', Point2D([kwargs.get('drill'), kwargs.get('drill')]))
             else:
-                self.drill = Point2D(kwargs.get('drill'))
+                self._set('drill', Point2D(kwargs.get('drill')))
             if self.drill.x < 0 or self.drill.y < 0:
                 raise ValueError("negative drill size not allowed")
         else:
-            self.drill = None
+            self._set('drill', None)
             if kwargs.get('drill'):
                 pass  # TODO: throw warning because drill is not supported
 
     def _initSolderPasteMargin(self, **kwargs):
-        self.solder_paste_margin_ratio = kwargs.get('solder_paste_margin_ratio', 0)
+        self._set('solder_paste_margin_ratio', kwargs.get('solder_paste_margin_ratio', 0))
 
     def _initSolderMaskMargin(self, **kwargs):
-        self.solder_mask_margin = kwargs.get('solder_mask_margin', 0)
+        self._set('solder_mask_margin', kwargs.get('solder_mask_margin', 0))
 
     def _initLayers(self, **kwargs):
         if not kwargs.get('layers'):
             raise KeyError('layers not declared (like "layers=[\'*.Cu\', \'*.Mask\', \'F.SilkS\']")')
-        self.layers = kwargs.get('layers')
-
-    # calculate the outline of a pad
-    def calculateBoundingBox(self):
-        return Node.calculateBoundingBox(self)
-
-    def _getRenderTreeText(self):
-        render_strings = ['pad']
-        render_strings.append(lispString(self.number))
-        render_strings.append(lispString(self.type))
-        render_strings.append(lispString(self.shape))
-        render_strings.append(self.at.render('(at {x} {y})'))
-        render_strings.append(self.size.render('(size {x} {y})'))
-        render_strings.append('(drill {})'.format(self.drill))
-        render_strings.append('(layers {})'.format(' '.join(self.layers)))
-
-        render_text = Node._getRenderTreeText(self)
-        render_text += '({})'.format(' '.join(render_strings))
-
-        return render_text
+        self._set('layers', tuple(kwargs.get('layers')))
@@ -15,6 +15,7 @@
 
 from KicadModTree.Point import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.geometric_util import pointsBoundingBox
 
 
 class Polygon(Node):
@@ -46,16 +47,8 @@ class Polygon(Node):
         self.layer = kwargs.get('layer', 'F.SilkS')
         self.width = kwargs.get('width')
 
-    def calculateBoundingBox(self):
-        min = max = self.getRealPosition(self.nodes[0])
-
-        for n in self.nodes:
-            min.x = min([min.x, n.x])
-            min.y = min([min.y, n.y])
-            max.x = max([max.x, n.x])
-            max.y = max([max.y, n.y])
-
-        return Node.calculateBoundingBox({'min': min, 'max': max})
+    def _calculateOwnBoundingBox(self):
+        return pointsBoundingBox(self.getRealPositions(self.nodes))
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -15,6 +15,7 @@
 
 from KicadModTree.Point import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.geometric_util import rotatedRectExtents
 
 
 class Text(Node):
@@ -61,16 +62,11 @@ class Text(Node):
 
         self.hide = kwargs.get('hide', False)
 
-    def calculateBoundingBox(self):
-        width = len(self.text)*self.size['x']
-        height = self.size['y']
+    def _calculateOwnBoundingBox(self):
+        position, rotation = self.getRealPosition(self.at, self.rotation)
+        half_width, half_height = rotatedRectExtents(len(str(self.text))*self.size.x, self.size.y, rotation)
 
-        min_x = self.at['x']-width/2.
-        min_y = self.at['y']-height/2.
-        max_x = self.at['x']+width/2.
-        max_y = self.at['y']+height/2.
-
-        return Node.calculateBoundingBox({'min': Point2D(min_x, min_y), 'max': Point2D(max_x, max_y)})
+        return (position.x-half_width, position.y-half_height, position.x+half_width, position.y+half_height)
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -21,7 +21,7 @@ from .Line import Line
 
 from .Model import Model
 
-from .Pad import Pad
+from .Pad import Pad, PadTemplate
 
 from .Polygon import Polygon
 
@@ -51,16 +51,16 @@ class FilledRect(Node):
         self.layer = kwargs.get('layer', 'F.SilkS')
         self.width = kwargs.get('width', 0.12)  # TODO: better variation to get line width
 
-        rect_line = RectLine(**kwargs)
+        self._kwargs = kwargs
+
+    def _createVirtualChilds(self):
+        rect_line = RectLine(**self._kwargs)
         rect_line._parent = self
 
-        rect_fill = RectFill(**kwargs)
+        rect_fill = RectFill(**self._kwargs)
         rect_fill._parent = self
 
-        self.virtual_childs = [rect_line, rect_fill]
-
-    def getVirtualChilds(self):
-        return self.virtual_childs
+        return [rect_line, rect_fill]
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -0,0 +1,150 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+from collections import OrderedDict
+from copy import copy, deepcopy
+
+from KicadModTree.Point import *
+from KicadModTree.nodes.Node import Node, MultipleParentsError
+from KicadModTree.util.geometric_util import composeTransformation, pointsBoundingBox, rotationTransformation, \
+    translationTransformation
+
+
+class Instance(Node):
+    r"""Place a shared node tree at a given position and rotation
+
+    All instances of a node reference the same tree, so placing the same part (a pin, a mounting hole, ...) many times
+    only creates one small node per placement. The nodes of the tree are instantiated when they are requested for the
+    first time (normally when the footprint is serialized).
+
+    The shared tree must not be part of another tree and should not be changed after the first instance is created.
+    Call ``modify()`` to get a private copy of the tree for a single instance.
+
+    :param node: root of the shared tree
+    :type node: ``Node``
+    :param at: position of the origin of the shared tree (default: [0, 0])
+    :type at: ``Point``
+    :param rotation: rotation of the shared tree around its origin (default: 0)
+    :type rotation: ``float``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> hole = Node()
+    >>> hole.append(Pad(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=[0, 0], size=3.2, drill=3.2,
+    ...                 layers=Pad.LAYERS_NPTH))
+    >>> hole.append(Circle(center=[0, 0], radius=3, layer='F.CrtYd'))
+    >>> Instance(hole, at=[10, 0])
+    """
+
+    def __init__(self, node, at=[0, 0], rotation=0):
+        Node.__init__(self)
+
+        if not isinstance(node, Node):
+            raise TypeError('invalid object, has to be based on Node')
+        if node._parent:
+            raise MultipleParentsError('the shared node must not be part of a tree!')
+
+        self.node = node
+        self.shared = True
+
+        self.at = at
+        self.rotation = rotation
+
+    @property
+    def at(self):
+        return self._at
+
+    @at.setter
+    def at(self, value):
+        self._at = Point2D(value)
+        self._invalidateTransformation()
+        self.invalidateBoundingBox()
+
+    @property
+    def rotation(self):
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value):
+        self._rotation = value
+        self._invalidateTransformation()
+        self.invalidateBoundingBox()
+
+    def modify(self):
+        '''
+        get the tree of this instance for modification
+
+        The first call replaces the shared tree by a private copy (copy-on-write), which becomes a normal child of
+        this instance. Other instances of the shared tree are not affected.
+        '''
+        if self.shared:
+            node = self.node.copy()
+            self.node = node
+            self.shared = False
+            self._virtual_childs = None
+            self.append(node)
+
+        return self.node
+
+    def _getLocalTransformation(self):
+        return composeTransformation(translationTransformation(self.at.x, self.at.y),
+                                     rotationTransformation(self.rotation))
+
+    def _createVirtualChilds(self):
+        if not self.shared:
+            return []
+
+        return [self._instantiate(self.node, self)]
+
+    def _instantiate(self, node, parent):
+        # structural copy: the attributes are shared with the node of the shared tree, only the tree links are new
+        instance = copy(node)
+        instance._parent = parent
+        instance._transformation = None
+        instance._bounding_boxes = None
+        instance._childs = OrderedDict((self._instantiate(child, instance), None) for child in node._childs)
+        return instance
+
+    def _calculateVirtualChildsBoundingBoxes(self):
+        if not self.shared:
+            return {}
+
+        # the bounding boxes of the shared tree are calculated once, relative to its own origin. Rotations by
+        # multiples of 90 degree keep them exact, all other rotations need the instantiated nodes.
+        if self.getTransformation()[6] % 90 != 0:
+            return Node._calculateVirtualChildsBoundingBoxes(self)
+
+        boxes = {}
+        for layer, box in self.node._getLayerBoundingBoxes().items():
+            min_x, min_y, max_x, max_y = box
+            boxes[layer] = pointsBoundingBox(self.getRealPositions([(min_x, min_y), (max_x, max_y)]))
+        return boxes
+
+    def __deepcopy__(self, memo):
+        # copies of an instance reference the same shared tree
+        if self.shared:
+            memo.setdefault(id(self.node), self.node)
+
+        instance = type(self).__new__(type(self))
+        memo[id(self)] = instance
+        for name, value in self.__getstate__().items():
+            instance.__dict__[name] = deepcopy(value, memo)
+        return instance
+
+    def _getRenderTreeText(self):
+        render_text = Node._getRenderTreeText(self)
+        render_text += " [at: [x: {x}, y: {y}], r: {r}{shared}]".format(x=self.at.x, y=self.at.y, r=self.rotation,
+                                                                        shared=", shared" if self.shared else "")
+
+        return render_text
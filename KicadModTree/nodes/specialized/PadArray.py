@@ -18,6 +18,7 @@
 
 from KicadModTree.nodes.base.Pad import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.geometric_util import EMPTY_BOUNDING_BOX, mergeBoundingBoxes
 
 
 class PadArray(Node):
@@ -76,7 +77,7 @@ class PadArray(Node):
         self._initIncrement(**kwargs)
         self._initSpacing(**kwargs)
         self._initStartingPosition(**kwargs)
-        self.virtual_childs = self._createPads(**kwargs)
+        self._initPadTemplates(**kwargs)
 
     # How many pads in the array
     def _initPincount(self, **kwargs):
@@ -167,34 +168,57 @@ class PadArray(Node):
         if all([i == 0 for i in self.spacing]):
             raise ValueError('pad spacing ({sp}) must be non-zero'.format(sp=self.spacing))
 
-    def _createPads(self, **kwargs):
+    # Pad settings, which are validated once
+    def _initPadTemplates(self, **kwargs):
+        # all pads share one template, except the rectangular first pin of THT arrays
+        self.template = PadTemplate(**kwargs)
+        self.first_template = self.template
+        if kwargs.get('type') == Pad.TYPE_THT:
+            self.first_template = PadTemplate(**dict(kwargs, shape=Pad.SHAPE_RECT))
 
-        pads = []
-
-        x_start, y_start = self.startingPosition
-        x_spacing, y_spacing = self.spacing
-
-        padShape = kwargs.get('shape')
+        self.rotation = kwargs.get('rotation', 0)
 
+    def _getPadNumbers(self):
         # Special case, increment = 0
         # this can be used for creating an array with all the same pad number
         if self.increment == 0:
-            pad_numbers = [self.initialPin] * self.pincount
+            return [self.initialPin] * self.pincount
 
-        else:
-            pad_numbers = range(self.initialPin, self.initialPin + (self.pincount * self.increment), self.increment)
+        return range(self.initialPin, self.initialPin + (self.pincount * self.increment), self.increment)
 
-        for i, number in enumerate(pad_numbers):
-            x_pad = x_start + i * x_spacing
-            y_pad = y_start + i * y_spacing
+    def _getPadPositions(self):
+        x_start, y_start = self.startingPosition
+        x_spacing, y_spacing = self.spacing
 
-            if kwargs.get('type') == Pad.TYPE_THT and number == 1:
-                kwargs['shape'] = Pad.SHAPE_RECT
-            else:
-                kwargs['shape'] = padShape
+        return [(x_start + i * x_spacing, y_start + i * y_spacing) for i in range(self.pincount)]
 
-            pads.append(Pad(number=number, at=[x_pad, y_pad], **kwargs))
+    def _getPadTemplate(self, number):
+        return self.first_template if number == 1 else self.template
+
+    def _createVirtualChilds(self):
+        pads = []
+        for number, position in zip(self._getPadNumbers(), self._getPadPositions()):
+            pad = Pad(number=number, at=position, rotation=self.rotation, template=self._getPadTemplate(number))
+            pad._parent = self
+            pads.append(pad)
         return pads
 
-    def getVirtualChilds(self):
-        return self.virtual_childs
+    def _compileVirtualChilds(self, compiled):
+        rotation = self.rotation + self.getTransformation()[6]
+        for number, position in zip(self._getPadNumbers(), self.getRealPositions(self._getPadPositions())):
+            compiled.addPads([number], [position], rotation, self._getPadTemplate(number))
+        return True
+
+    def _calculateVirtualChildsBoundingBoxes(self):
+        # the outline of the pads is known without creating them
+        rotation = self.getTransformation()[6] + self.rotation
+        positions = {}
+        for number, position in zip(self._getPadNumbers(), self.getRealPositions(self._getPadPositions())):
+            positions.setdefault(self._getPadTemplate(number), []).append(position)
+
+        boxes = {}
+        for template, template_positions in positions.items():
+            bounding_box = template.calculatePadsBoundingBox(template_positions, rotation)
+            for layer in template.layers:
+                boxes[layer] = mergeBoundingBoxes([boxes.get(layer, EMPTY_BOUNDING_BOX), bounding_box])
+        return boxes
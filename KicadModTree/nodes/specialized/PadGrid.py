@@ -0,0 +1,199 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+from array import array
+
+from KicadModTree.nodes.base.Pad import *
+from KicadModTree.nodes.Node import Node
+
+
+class PadGrid(Node):
+    r"""Add a two dimensional grid of Pads, like the ball field of a BGA
+
+    Only the grid parameters and the indices of the populated pads are stored. The Pad nodes are created when they
+    are requested for the first time (normally when the footprint is serialized), all of them share one
+    ``PadTemplate``.
+
+    :param \**kwargs:
+        See below
+
+    :Keyword Arguments:
+        * *rows* (``int``) --
+          number of rows
+        * *columns* (``int``) --
+          number of columns
+        * *spacing* (``float``, ``Point``) --
+          offset between two columns (x) and two rows (y)
+        * *start* (``Point``) --
+          position of the first pad (first row, first column)
+        * *center* (``Point``) --
+          center the grid around the given point (default: [0, 0])
+        * *naming* (``PadGrid.NAMING_ALPHANUMERIC``, ``PadGrid.NAMING_NUMERIC``) --
+          alphanumeric: rows are named by letters (A, B, ..., Y, AA, AB, ...) without I, O, Q, S, X and Z, columns
+          are counted from 1 ("A1"). numeric: pads are numbered row by row, starting with *initial*.
+          (default: ``PadGrid.NAMING_ALPHANUMERIC``)
+        * *initial* (``int``) --
+          number of the first pad when using numeric naming (default: 1)
+        * *depopulated* (``list``) --
+          pads which are not placed, given by name (``"A1"``) or as zero based ``(row, column)`` pair
+        * *rotation* (``float``) --
+          rotation of every pad
+        * *template* (``PadTemplate``) --
+          settings of every pad. When not given, a template is created from the following arguments
+        * *type*, *shape*, *size*, *offset*, *drill*, *solder_paste_margin_ratio*, *solder_mask_margin*, *layers* --
+          settings of every pad, see ``Pad``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> PadGrid(rows=16, columns=16, spacing=0.8, center=[0, 0], depopulated=['A1', (7, 7)],
+    ...         type=Pad.TYPE_SMT, shape=Pad.SHAPE_CIRCLE, size=0.4, layers=Pad.LAYERS_SMT)
+    """
+
+    NAMING_ALPHANUMERIC = 'alphanumeric'
+    NAMING_NUMERIC = 'numeric'
+
+    # row letters of JEDEC JEP95, which skips letters that could be confused with numbers
+    ROW_LETTERS = 'ABCDEFGHJKLMNPRTUVWY'
+
+    def __init__(self, **kwargs):
+        Node.__init__(self)
+        self._initDimensions(**kwargs)
+        self._initSpacing(**kwargs)
+        self._initStartingPosition(**kwargs)
+        self._initNaming(**kwargs)
+        self._initPadTemplate(**kwargs)
+        self._initPopulated(**kwargs)
+
+    def _initDimensions(self, **kwargs):
+        for name in ('rows', 'columns'):
+            value = kwargs.get(name)
+            if value is None:
+                raise KeyError('{name} not declared (like "{name}=10")'.format(name=name))
+            if type(value) is not int or value <= 0:
+                raise ValueError('{value} is an invalid value for {name}'.format(value=value, name=name))
+        self.rows = kwargs['rows']
+        self.columns = kwargs['columns']
+
+    def _initSpacing(self, **kwargs):
+        if not kwargs.get('spacing'):
+            raise KeyError('spacing not declared (like "spacing=[1, 1]")')
+        if type(kwargs.get('spacing')) in [int, float]:
+            self.spacing = Point2D(kwargs.get('spacing'), kwargs.get('spacing'))
+        else:
+            self.spacing = Point2D(kwargs.get('spacing'))
+
+    def _initStartingPosition(self, **kwargs):
+        if kwargs.get('start'):
+            self.startingPosition = Point2D(kwargs.get('start'))
+        else:
+            center = Point2D(kwargs.get('center', [0, 0]))
+            self.startingPosition = Point2D(center.x - (self.columns - 1) * self.spacing.x / 2.,
+                                            center.y - (self.rows - 1) * self.spacing.y / 2.)
+
+    def _initNaming(self, **kwargs):
+        self.naming = kwargs.get('naming', PadGrid.NAMING_ALPHANUMERIC)
+        if self.naming not in [PadGrid.NAMING_ALPHANUMERIC, PadGrid.NAMING_NUMERIC]:
+            raise ValueError('{naming} is an invalid naming scheme'.format(naming=self.naming))
+
+        self.initialPin = kwargs.get('initial', 1)
+        if type(self.initialPin) is not int:
+            raise ValueError('{pn} is not a valid starting pin number'.format(pn=self.initialPin))
+
+    def _initPadTemplate(self, **kwargs):
+        self.template = kwargs.get('template')
+        if self.template is None:
+            self.template = PadTemplate(**kwargs)
+        self.rotation = kwargs.get('rotation', 0)
+
+    def _initPopulated(self, **kwargs):
+        depopulated = set()
+        names = None
+        for pad in kwargs.get('depopulated', []):
+            if type(pad) in [list, tuple]:
+                row, column = pad
+            else:
+                if names is None:
+                    names = dict((self.getPadName(i // self.columns, i % self.columns), i)
+                                 for i in range(self.rows * self.columns))
+                if str(pad) not in names:
+                    raise ValueError('{pad} is not a pad of the grid'.format(pad=pad))
+                row, column = divmod(names[str(pad)], self.columns)
+
+            if not 0 <= row < self.rows or not 0 <= column < self.columns:
+                raise ValueError('{pad} is not a pad of the grid'.format(pad=pad))
+            depopulated.add(row * self.columns + column)
+
+        # indices of all populated pads (row * columns + column)
+        self.populated = array('l', (i for i in range(self.rows * self.columns) if i not in depopulated))
+
+    @staticmethod
+    def rowName(row):
+        '''
+        name of a row (zero based) with letters like used for BGAs: A, B, ..., Y, AA, AB, ...
+        '''
+        letters = PadGrid.ROW_LETTERS
+        name = letters[row % len(letters)]
+        row = row // len(letters)
+        while row > 0:
+            row -= 1
+            name = letters[row % len(letters)] + name
+            row = row // len(letters)
+        return name
+
+    def getPadName(self, row, column):
+        '''
+        name of the pad at the given row and column (both zero based)
+        '''
+        if self.naming == PadGrid.NAMING_NUMERIC:
+            return self.initialPin + row * self.columns + column
+        return "{}{}".format(PadGrid.rowName(row), column + 1)
+
+    def getPadPositions(self):
+        '''
+        list of (x, y) positions of all populated pads, in the order of the pads
+        '''
+        x0, y0 = self.startingPosition.x, self.startingPosition.y
+        dx, dy = self.spacing.x, self.spacing.y
+        columns = self.columns
+        return [(x0 + (i % columns) * dx, y0 + (i // columns) * dy) for i in self.populated]
+
+    def _createVirtualChilds(self):
+        pads = []
+        columns = self.columns
+        for i, position in zip(self.populated, self.getPadPositions()):
+            pad = Pad(number=self.getPadName(i // columns, i % columns), at=position, rotation=self.rotation,
+                      template=self.template)
+            pad._parent = self
+            pads.append(pad)
+        return pads
+
+    def _compileVirtualChilds(self, compiled):
+        columns = self.columns
+        numbers = [self.getPadName(i // columns, i % columns) for i in self.populated]
+        compiled.addPads(numbers, self.getRealPositions(self.getPadPositions()),
+                         self.rotation + self.getTransformation()[6], self.template)
+        return True
+
+    def _calculateVirtualChildsBoundingBoxes(self):
+        # all pads have the same outline, so the pads do not need to be created
+        bounding_box = self.template.calculatePadsBoundingBox(self.getRealPositions(self.getPadPositions()),
+                                                              self.getTransformation()[6] + self.rotation)
+        if not bounding_box:
+            return {}
+        return dict((layer, bounding_box) for layer in self.template.layers)
+
+    def _getRenderTreeText(self):
+        render_text = Node._getRenderTreeText(self)
+        render_text += " [rows: {}, columns: {}, pads: {}]".format(self.rows, self.columns, len(self.populated))
+        return render_text
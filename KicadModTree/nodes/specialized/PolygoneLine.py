@@ -16,6 +16,7 @@
 from KicadModTree.Point import *
 from KicadModTree.nodes.Node import Node
 from KicadModTree.nodes.base.Line import Line
+from KicadModTree.util.geometric_util import pointsBoundingBox
 
 
 class PolygoneLine(Node):
@@ -48,8 +49,6 @@ class PolygoneLine(Node):
 
         self._initPolygone(**kwargs)
 
-        self.virtual_childs = self._createChildNodes(self.polygone_line)
-
     def _initMirror(self, **kwargs):
         self.mirror = [None, None]
         if kwargs.get('x_mirror') and type(kwargs['x_mirror']) in [float, int]:
@@ -67,6 +66,9 @@ class PolygoneLine(Node):
             if self.mirror[1] is not None:
                 point['y'] = 2 * self.mirror[1] - point['y']
 
+        # the lines are created on demand, so keep a copy which is independent of later changes to the given points
+        self.polygone_line = [Point2D(point) for point in self.polygone_line]
+
     def _createChildNodes(self, polygone_line):
         nodes = []
 
@@ -77,8 +79,14 @@ class PolygoneLine(Node):
 
         return nodes
 
-    def getVirtualChilds(self):
-        return self.virtual_childs
+    def _createVirtualChilds(self):
+        return self._createChildNodes(self.polygone_line)
+
+    def _calculateVirtualChildsBoundingBoxes(self):
+        # the lines cover exactly the points of the polygone
+        if len(self.polygone_line) < 2:
+            return {}
+        return {self.layer: pointsBoundingBox(self.getRealPositions(self.polygone_line))}
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
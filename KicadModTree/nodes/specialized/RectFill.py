@@ -16,6 +16,7 @@
 from KicadModTree.Point import *
 from KicadModTree.nodes.Node import Node
 from KicadModTree.nodes.base import Line
+from KicadModTree.util.geometric_util import pointsBoundingBox
 
 
 class RectFill(Node):
@@ -50,27 +51,39 @@ class RectFill(Node):
         self.layer = kwargs.get('layer', 'F.SilkS')
         self.width = kwargs.get('width', 0.12)  # TODO: auto detection
 
-        self.virtual_childs = self._createChildNodes(self.start_pos, self.end_pos, self.layer, self.width)
+    def _getFillPositions(self):
+        positions = []
 
-    def _createChildNodes(self, start_pos, end_pos, layer, width):
-        nodes = []
+        cur_y_pos = min([self.start_pos.y, self.end_pos.y])
+        max_y_pos = max([self.start_pos.y, self.end_pos.y])
+
+        while (cur_y_pos + self.width) < max_y_pos:
+            cur_y_pos += self.width
+            positions.append(cur_y_pos)
 
-        cur_y_pos = min([start_pos.y, end_pos.y])
-        max_y_pos = max([start_pos.y, end_pos.y])
+        return positions
 
-        while (cur_y_pos + width) < max_y_pos:
-            cur_y_pos += width
-            new_node = Line(start=Point2D(start_pos.x, cur_y_pos),
-                            end=Point2D(end_pos.x, cur_y_pos),
-                            layer=layer,
-                            width=width)
+    def _createVirtualChilds(self):
+        nodes = []
+
+        for y_pos in self._getFillPositions():
+            new_node = Line(start=Point2D(self.start_pos.x, y_pos),
+                            end=Point2D(self.end_pos.x, y_pos),
+                            layer=self.layer,
+                            width=self.width)
             new_node._parent = self
             nodes.append(new_node)
 
         return nodes
 
-    def getVirtualChilds(self):
-        return self.virtual_childs
+    def _calculateVirtualChildsBoundingBoxes(self):
+        positions = self._getFillPositions()
+        if not positions:
+            return {}
+
+        corners = [(self.start_pos.x, positions[0]), (self.end_pos.x, positions[0]),
+                   (self.start_pos.x, positions[-1]), (self.end_pos.x, positions[-1])]
+        return {self.layer: pointsBoundingBox(self.getRealPositions(corners))}
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -69,11 +69,8 @@ class RectLine(PolygoneLine):
             y2 = max(self.start_pos.y, self.end_pos.y)
 
             # Put the offset back in
-            self.start_pos.x = x1 - offset[0]
-            self.start_pos.y = y1 - offset[1]
-
-            self.end_pos.x = x2 + offset[0]
-            self.end_pos.y = y2 + offset[1]
+            self.start_pos = Point2D(x1 - offset[0], y1 - offset[1])
+            self.end_pos = Point2D(x2 + offset[0], y2 + offset[1])
 
         polygone_line = [{'x': self.start_pos.x, 'y': self.start_pos.y},
                          {'x': self.start_pos.x, 'y': self.end_pos.y},
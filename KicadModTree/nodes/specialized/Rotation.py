@@ -13,10 +13,9 @@
 #
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
-import math
-
 from KicadModTree.Point import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.geometric_util import rotationTransformation
 
 
 class Rotation(Node):
@@ -35,25 +34,18 @@ class Rotation(Node):
         Node.__init__(self)
         self.rotation = r  # in degree
 
-    def getRealPosition(self, coordinate, rotation=None):
-        if rotation is None:
-            rotation = 0
-
-        parsed_coordinate = Point2D(coordinate)
-
-        phi = self.rotation*math.pi/180
-        rotation_coordinate = {'x': parsed_coordinate.x*math.cos(phi) + parsed_coordinate.y*math.sin(phi),
-                               'y': -parsed_coordinate.x*math.sin(phi) + parsed_coordinate.y*math.cos(phi)}
-
-        if not self._parent:
-            if rotation is None:
-                return rotation_coordinate
-            else:
-                return rotation_coordinate, rotation + self.rotation
-        else:
-            if rotation is None:
-                rotation = 0
-            return self._parent.getRealPosition(rotation_coordinate, rotation + self.rotation)
+    @property
+    def rotation(self):
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value):
+        self._rotation = value
+        self._invalidateTransformation()
+        self.invalidateBoundingBox()
+
+    def _getLocalTransformation(self):
+        return rotationTransformation(self.rotation)
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -15,6 +15,7 @@
 
 from KicadModTree.Point import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.geometric_util import translationTransformation
 
 
 class Translation(Node):
@@ -37,20 +38,28 @@ class Translation(Node):
         self.offset_x = x
         self.offset_y = y
 
-    def getRealPosition(self, coordinate, rotation=None):
-        parsed_coordinate = Point2D(coordinate)
+    @property
+    def offset_x(self):
+        return self._offset_x
 
-        # calculate translation
-        translation_coordinate = {'x': parsed_coordinate.x + self.offset_x,
-                                  'y': parsed_coordinate.y + self.offset_y}
+    @offset_x.setter
+    def offset_x(self, value):
+        self._offset_x = value
+        self._invalidateTransformation()
+        self.invalidateBoundingBox()
 
-        if not self._parent:
-            if rotation is None:
-                return translation_coordinate
-            else:
-                return translation_coordinate, rotation
-        else:
-            return self._parent.getRealPosition(translation_coordinate, rotation)
+    @property
+    def offset_y(self):
+        return self._offset_y
+
+    @offset_y.setter
+    def offset_y(self, value):
+        self._offset_y = value
+        self._invalidateTransformation()
+        self.invalidateBoundingBox()
+
+    def _getLocalTransformation(self):
+        return translationTransformation(self.offset_x, self.offset_y)
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
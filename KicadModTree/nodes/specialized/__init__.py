@@ -22,3 +22,6 @@ from .RectFill import RectFill
 from .FilledRect import FilledRect
 
 from .PadArray import PadArray
+from .PadGrid import PadGrid
+
+from .Instance import Instance
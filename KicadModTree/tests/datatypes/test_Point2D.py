@@ -14,6 +14,7 @@
 # (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 import unittest
+from copy import copy, deepcopy
 
 from KicadModTree.Point import *
 
@@ -49,6 +50,30 @@ class Point2DTests(unittest.TestCase):
         # TODO: invalid type tests
         # TODO: tests if int is always converted to float
 
+    def test_from_xy(self):
+        p1 = Point2D._from_xy(1., 2.)
+        self.assertIs(type(p1), Point2D)
+        self.assertEqual(p1, Point2D(1, 2))
+
+    def test_immutable(self):
+        p1 = Point2D([1, 2])
+        with self.assertRaises(AttributeError):
+            p1.z = 5
+        with self.assertRaises(AttributeError):
+            p1.x = 5
+        with self.assertRaises(AttributeError):
+            p1.y += 1
+        with self.assertRaises(AttributeError):
+            del p1.x
+
+        p2 = p1 + 1
+        self.assertEqual(p1, Point2D(1, 2))
+        self.assertEqual(p2, Point2D(2, 3))
+
+        self.assertIs(copy(p1), p1)
+        self.assertIs(deepcopy(p1), p1)
+        self.assertEqual(hash(p1), hash(Point2D(1, 2)))
+
     def test_round_to(self):
         p1 = Point2D([1.234, 5.678]).round_to(0)
         self.assertAlmostEqual(p1.x, 1.234)
@@ -14,6 +14,7 @@
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 import unittest
+from copy import deepcopy
 
 from KicadModTree.Point import *
 
@@ -75,6 +76,27 @@ class Point3DTests(unittest.TestCase):
         # TODO: invalid type tests
         # TODO: tests if int is always converted to float
 
+    def test_from_xyz(self):
+        p1 = Point3D._from_xyz(1., 2., 3.)
+        self.assertIs(type(p1), Point3D)
+        self.assertEqual(p1, Point3D(1, 2, 3))
+
+    def test_immutable(self):
+        p1 = Point3D([1, 2, 3])
+        with self.assertRaises(AttributeError):
+            p1.w = 5
+        with self.assertRaises(AttributeError):
+            p1.x = 5
+        with self.assertRaises(AttributeError):
+            p1.z += 1
+
+        p2 = p1 * 2
+        self.assertEqual(p1, Point3D(1, 2, 3))
+        self.assertEqual(p2, Point3D(2, 4, 6))
+
+        self.assertIs(deepcopy(p1), p1)
+        self.assertEqual(hash(p1), hash(Point3D(1, 2, 3)))
+
     def test_round_to(self):
         p1 = Point3D([1.234, 5.678, 9.012]).round_to(0)
         self.assertAlmostEqual(p1.x, 1.234)
@@ -13,4 +13,6 @@
 #
 # (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+from .test_modargparser import ModArgparserTests
 from .test_simple_footprints import SimpleFootprintTests
+from .test_compiled_footprint import CompiledFootprintTests
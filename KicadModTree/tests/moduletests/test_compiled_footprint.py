@@ -0,0 +1,129 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import itertools
+import unittest
+
+from KicadModTree import *
+
+
+def createFootprint(offset=0):
+    kicad_mod = Footprint("compiled")
+    kicad_mod.setDescription("A example footprint")
+    kicad_mod.append(Text(type='value', text="compiled", at=[0, 3], layer='F.Fab'))
+    kicad_mod.append(Text(type='reference', text='REF**', at=[0, -3], layer='F.SilkS'))
+    kicad_mod.append(Text(type='user', text='%R', at=[0, 0], rotation=90, layer='F.Fab'))
+
+    translation = Translation(offset, 1)
+    kicad_mod.append(translation)
+    rotation = Rotation(90)
+    translation.append(rotation)
+    rotation.append(RectLine(start=[-2, -2], end=[2, 2], layer='F.SilkS'))
+    rotation.append(Circle(center=[0, 0], radius=1.5, layer='F.Fab', width=0.1))
+    rotation.append(Arc(center=[0, 0], start=[1, 0], angle=90, layer='F.Fab'))
+    rotation.append(Polygon(nodes=[[0, 0], [1, 0], [1, 1], [0, 1], [-1, 1]], layer='F.Cu', width=0))
+    rotation.append(PadArray(pincount=3, x_spacing=2.54, start=[0, 3], type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
+                             size=1.7, drill=1, layers=Pad.LAYERS_THT))
+
+    kicad_mod.append(PadGrid(rows=2, columns=2, spacing=1, center=[10, 0], rotation=45, type=Pad.TYPE_SMT,
+                             shape=Pad.SHAPE_RECT, size=[0.5, 0.3], layers=Pad.LAYERS_SMT))
+    kicad_mod.append(Model(filename="example.3dshapes/example_footprint.wrl"))
+    return kicad_mod
+
+
+class CompiledFootprintTests(unittest.TestCase):
+
+    def testTables(self):
+        compiled = createFootprint().compile()
+        self.assertEqual(len(compiled.lines), 4)
+        self.assertEqual(len(compiled.arcs), 1)
+        self.assertEqual(len(compiled.circles), 1)
+        self.assertEqual(len(compiled.polygons), 1)
+        self.assertEqual(len(compiled.polygon_points), 5)
+        self.assertEqual(len(compiled.texts), 3)
+        self.assertEqual(len(compiled.models), 1)
+        self.assertEqual(list(compiled.pads.number), [1, 2, 3, 'A1', 'A2', 'B1', 'B2'])
+        self.assertEqual(len(compiled.pad_templates), 3)
+
+        self.assertAlmostEqual(compiled.pads.x[1], 3)
+        self.assertAlmostEqual(compiled.pads.y[1], 1 - 2.54)
+        self.assertEqual(compiled.pads.rotation[0], 90)
+        self.assertEqual(compiled.pads.rotation[3], 45)
+        self.assertEqual(compiled.layers[compiled.lines.layer[0]], 'F.SilkS')
+        self.assertIs(compiled.lines.width[0], None)
+        self.assertEqual(compiled.circles.width[0], 0.1)
+
+        # rows with converted columns
+        rows = list(compiled.pads.rows(lambda value: value * 2, ('x', 'y')))
+        self.assertEqual(rows[1][:3], (2, compiled.pads.x[1] * 2, compiled.pads.y[1] * 2))
+        self.assertEqual(rows[1][3:], (compiled.pads.rotation[1], compiled.pads.template[1]))
+
+    def testSerialize(self):
+        kicad_mod = createFootprint()
+        output = KicadFileHandler(kicad_mod).serialize()
+        self.assertEqual(KicadFileHandler(kicad_mod.compile()).serialize(), output)
+
+        # the pads of PadArray and PadGrid are added without creating them
+        self.assertEqual(output.count('(pad '), 7)
+        for node in kicad_mod.getNormalChilds():
+            if isinstance(node, PadGrid):
+                self.assertIs(node._virtual_childs, None)
+
+        # compare with the output of the nodes after they were created
+        for node, _ in kicad_mod.walk():
+            node.getVirtualChilds()
+        self.assertEqual(KicadFileHandler(kicad_mod).serialize(), output)
+
+    def testNanometres(self):
+        kicad_mod = createFootprint(offset=0.1)
+        compiled = kicad_mod.compile(nanometres=True)
+
+        self.assertEqual(compiled.lines.start_x.typecode, 'l')
+        self.assertEqual(list(compiled.lines.width), [None] * 4)
+        self.assertEqual((compiled.pads.x[0], compiled.pads.y[0]), (3100000, 1000000))
+
+        # the output only differs in negative zeros, which are not written in nanometres
+        output = KicadFileHandler(kicad_mod).serialize(timestamp=0)
+        self.assertEqual(KicadFileHandler(compiled).serialize(timestamp=0), output.replace(' -0)', ' 0)'))
+        self.assertEqual(KicadFileHandler(kicad_mod).serialize(timestamp=0, nanometres=True),
+                         KicadFileHandler(compiled).serialize(timestamp=0))
+
+        self.assertNotEqual(compiled, kicad_mod.compile())
+        self.assertEqual(compiled, kicad_mod.compile(nanometres=True))
+
+    def testBoundingBox(self):
+        kicad_mod = createFootprint()
+
+        compiled_footprints = [kicad_mod.compile(), kicad_mod.compile(nanometres=True)]
+        layer_lists = [None, ['F.SilkS'], ['F.Fab'], ['F.Cu'], ['*.Cu'], ['F.Cu', 'F.Fab'], ['B.Cu']]
+
+        for compiled, layers in itertools.product(compiled_footprints, layer_lists):
+            expected = kicad_mod.calculateBoundingBox(layers)
+            bounding_box = compiled.calculateBoundingBox(layers)
+            if expected is None:
+                self.assertIs(bounding_box, None)
+                continue
+
+            for key in ['min', 'max']:
+                self.assertAlmostEqual(bounding_box[key].x, expected[key].x)
+                self.assertAlmostEqual(bounding_box[key].y, expected[key].y)
+
+    def testCompare(self):
+        compiled = createFootprint().compile()
+        self.assertEqual(compiled, createFootprint().compile())
+        self.assertEqual(hash(compiled), hash(createFootprint().compile()))
+        self.assertNotEqual(compiled, createFootprint(offset=0.01).compile())
+
+        kicad_mod = createFootprint()
+        kicad_mod.setDescription("other description")
+        self.assertNotEqual(compiled, kicad_mod.compile())
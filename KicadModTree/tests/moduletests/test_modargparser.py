@@ -0,0 +1,47 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import unittest
+
+from KicadModTree import *
+
+
+def footprint_function(args):
+    if args['pincount'] < 1:
+        raise ValueError("pincount too small")
+
+
+class ModArgparserTests(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = ModArgparser(footprint_function)
+        self.parser.add_parameter("name", type=str, required=True)
+        self.parser.add_parameter("pincount", type=int, required=True)
+
+    def testExecuteScript(self):
+        result = self.parser._execute_script(name='test', pincount='2')
+        self.assertEqual(result['name'], 'test')
+        self.assertEqual(result['errors'], [])
+
+        result = self.parser._execute_script(name='test')
+        self.assertEqual(result['errors'], ["parameter expected: pincount"])
+
+        result = self.parser._execute_script(name='test', pincount='0')
+        self.assertEqual(result['errors'], ["ValueError: pincount too small"])
+
+    def testExecuteTasksParallel(self):
+        tasks = [{'name': 'test_{}'.format(i), 'pincount': i} for i in range(10)]
+
+        results = list(self.parser._execute_tasks(tasks, 2))
+        self.assertEqual([result['name'] for result in results], [task['name'] for task in tasks])
+        self.assertEqual([len(result['errors']) for result in results], [1] + [0] * 9)
@@ -13,9 +13,12 @@
 #
 # (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import io
+import sys
 import unittest
 
 from KicadModTree import *
+from KicadModTree.FileHandler import _UnicodeWriter
 
 
 RESULT_MINIMUM = """(module test (layer F.Cu) (tedit 0)
@@ -72,6 +75,13 @@ RESULT_BASIC_NODES = """(module test (layer F.Cu) (tedit 0)
 )"""
 
 
+RESULT_PAD_OFFSETS = """(module test (layer F.Cu) (tedit 0)
+  (pad 1 thru_hole oval (at 0 0) (size 2 3) (drill 1.2 (offset 0 0.5)) (layers *.Cu *.Mask))
+  (pad 2 thru_hole oval (at 3 0) (size 2 3) (drill oval 1 1.5 (offset 0.1 0)) (layers *.Cu *.Mask))
+  (pad 3 smd rect (at 6 0) (size 2 3) (drill (offset 0.1 0)) (layers F.Cu F.Mask F.Paste))
+)"""
+
+
 class SimpleFootprintTests(unittest.TestCase):
 
     def testMinimum(self):
@@ -126,3 +136,53 @@ class SimpleFootprintTests(unittest.TestCase):
 
         file_handler = KicadFileHandler(kicad_mod)
         self.assertEqual(file_handler.serialize(timestamp=0), RESULT_BASIC_NODES)
+
+    def testSerializeToStream(self):
+        kicad_mod = Footprint("test")
+
+        kicad_mod.setDescription("A example footprint")
+        kicad_mod.setTags("example")
+
+        kicad_mod.append(Text(type='reference', text='REF**', at=[0, -3], layer='F.SilkS'))
+        kicad_mod.append(Text(type='value', text="test", at=[1.5, 3], layer='F.Fab'))
+        kicad_mod.append(RectLine(start=[-2, -2], end=[5, 2], layer='F.SilkS'))
+        kicad_mod.append(RectLine(start=[-2.25, -2.25], end=[5.25, 2.25], layer='F.CrtYd'))
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
+                             at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+        kicad_mod.append(Pad(number=2, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
+                             at=[3, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+        kicad_mod.append(Model(filename="example.3dshapes/example_footprint.wrl",
+                               at=[0, 0, 0], scale=[1, 1, 1], rotate=[0, 0, 0]))
+
+        file_handler = KicadFileHandler(kicad_mod)
+        stream = io.StringIO()
+        # io.StringIO only accepts unicode, which is not what python2 strings are
+        file_handler.serializeToStream(_UnicodeWriter(stream) if sys.version_info[0] == 2 else stream, timestamp=0)
+        self.assertEqual(stream.getvalue(), RESULT_SIMPLE_FOOTPRINT)
+
+    def testPadOffsets(self):
+        kicad_mod = Footprint("test")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_OVAL,
+                             at=[0, 0], size=[2, 3], drill=1.2, offset=[0, 0.5], layers=Pad.LAYERS_THT))
+        kicad_mod.append(Pad(number=2, type=Pad.TYPE_THT, shape=Pad.SHAPE_OVAL,
+                             at=[3, 0], size=[2, 3], drill=[1, 1.5], offset=[0.1, 0], layers=Pad.LAYERS_THT))
+        kicad_mod.append(Pad(number=3, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                             at=[6, 0], size=[2, 3], offset=[0.1, 0], layers=Pad.LAYERS_SMT))
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_PAD_OFFSETS)
+        self.assertEqual(file_handler.serialize(timestamp=0, nanometres=True), RESULT_PAD_OFFSETS)
+
+    def testDeserialize(self):
+        for result in [RESULT_MINIMUM, RESULT_BASIC_TAGS, RESULT_SIMPLE_FOOTPRINT, RESULT_BASIC_NODES,
+                       RESULT_PAD_OFFSETS]:
+            kicad_mod = KicadFileHandler.deserialize(result)
+
+            file_handler = KicadFileHandler(kicad_mod)
+            self.assertEqual(file_handler.serialize(timestamp=0), result)
+
+        kicad_mod = KicadFileHandler.deserialize(RESULT_BASIC_NODES)
+        self.assertEqual([node.__class__.__name__ for node in kicad_mod.getNormalChilds()],
+                         ['Text', 'Text', 'Arc', 'Circle', 'Line', 'Pad', 'Model'])
+
+        self.assertRaises(ValueError, KicadFileHandler.deserialize, "(fp_line (start 0 0) (end 1 1))")
@@ -14,3 +14,8 @@
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 from .test_Node import NodeTests
+from .test_Footprint import FootprintTests
+from .test_BoundingBox import BoundingBoxTests
+from .test_Pad import PadTests
+from .test_PadGrid import PadGridTests
+from .test_Instance import InstanceTests
@@ -0,0 +1,111 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util.geometric_util import mergeBoundingBoxes
+
+
+class BoundingBoxTests(unittest.TestCase):
+
+    def assertBoundingBox(self, node, min_x, min_y, max_x, max_y):
+        bbox = node.calculateBoundingBox()
+        for value, expected in zip([bbox['min'].x, bbox['min'].y, bbox['max'].x, bbox['max'].y],
+                                   [min_x, min_y, max_x, max_y]):
+            self.assertAlmostEqual(value, expected)
+
+    def testEmpty(self):
+        self.assertIs(Node().calculateBoundingBox(), None)
+        self.assertIs(Footprint("empty").calculateBoundingBox(), None)
+
+    def testBaseNodes(self):
+        self.assertBoundingBox(Line(start=[1, 3], end=[2, 1]), 1, 1, 2, 3)
+        self.assertBoundingBox(Circle(center=[2, 2], radius=1), 1, 1, 3, 3)
+        self.assertBoundingBox(Polygon(nodes=[[1, 1], [3, 2], [2, 4]]), 1, 1, 3, 4)
+        self.assertBoundingBox(Text(type='user', text='ab', at=[0, 0], rotation=90), -0.5, -1, 0.5, 1)
+
+    def testArc(self):
+        self.assertBoundingBox(Arc(center=[0, 0], start=[1, 0], angle=90), 0, 0, 1, 1)
+        self.assertBoundingBox(Arc(center=[0, 0], start=[1, 0], angle=-90), 0, -1, 1, 0)
+        self.assertBoundingBox(Arc(center=[0, 0], start=[1, 0], angle=180), -1, 0, 1, 1)
+        self.assertBoundingBox(Arc(center=[1, 1], start=[1, 2], angle=-270), 0, 0, 2, 2)
+        self.assertBoundingBox(Arc(center=[0, 0], start=[0, 1], angle=360), -1, -1, 1, 1)
+
+    def testPad(self):
+        self.assertBoundingBox(Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[5, 0], size=[2, 1],
+                                   layers=Pad.LAYERS_SMT), 4, -0.5, 6, 0.5)
+        self.assertBoundingBox(Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[5, 0], size=[2, 1], rotation=90,
+                                   layers=Pad.LAYERS_SMT), 4.5, -1, 5.5, 1)
+        self.assertBoundingBox(Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_OVAL, at=[0, 0], size=[3, 1], rotation=45,
+                                   layers=Pad.LAYERS_SMT), -0.5 - 0.5**0.5, -0.5 - 0.5**0.5,
+                               0.5 + 0.5**0.5, 0.5 + 0.5**0.5)
+        self.assertBoundingBox(Pad(type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=[0, 0], size=2, drill=1,
+                                   offset=[1, 0], layers=Pad.LAYERS_THT), 0, -1, 2, 1)
+
+    def testTransformation(self):
+        rotation = Rotation(90)
+        rotation.append(Line(start=[1, 0], end=[2, 0]))
+        translation = Translation(0, 5)
+        translation.append(rotation)
+        self.assertBoundingBox(translation, 0, 3, 0, 4)
+        self.assertBoundingBox(rotation, 0, 3, 0, 4)
+
+    def testCache(self):
+        kicad_mod = Footprint("cached")
+        translation = Translation(10, 0)
+        kicad_mod.append(translation)
+        line = Line(start=[0, 0], end=[1, 1])
+        translation.append(line)
+
+        self.assertBoundingBox(kicad_mod, 10, 0, 11, 1)
+        self.assertIs(kicad_mod._getLayerBoundingBoxes(), kicad_mod._getLayerBoundingBoxes())
+
+        circle = Circle(center=[0, 0], radius=2)
+        translation.append(circle)
+        self.assertBoundingBox(kicad_mod, 8, -2, 12, 2)
+
+        translation.remove(circle)
+        self.assertBoundingBox(kicad_mod, 10, 0, 11, 1)
+
+        line.end_pos = Point2D(3, 3)
+        line.invalidateBoundingBox()
+        self.assertBoundingBox(kicad_mod, 10, 0, 13, 3)
+
+    def testVirtualChilds(self):
+        nodes = [PolygoneLine(polygone=[[0, 0], [2, 1], [1, 3]], layer='F.SilkS'),
+                 RectLine(start=[-1, -2], end=[3, 4], layer='F.Fab', offset=0.5),
+                 RectFill(start=[0, 0], end=[2, 1], layer='F.SilkS', width=0.3),
+                 PadArray(pincount=4, spacing=[0, 2.54], start=[1, 1], type=Pad.TYPE_THT,
+                          shape=Pad.SHAPE_OVAL, size=[2, 1.5], drill=1, layers=Pad.LAYERS_THT)]
+
+        for node in nodes:
+            translation = Translation(1, 2)
+            rotation = Rotation(30)
+            translation.append(rotation)
+            rotation.append(node)
+
+            # the bounding boxes are calculated without creating the virtual childs
+            boxes = translation._getLayerBoundingBoxes()
+            self.assertIs(node._virtual_childs, None)
+
+            expected_boxes = {}
+            for child in node.getVirtualChilds():
+                for layer in child._getGeometryLayers():
+                    expected_boxes[layer] = mergeBoundingBoxes([expected_boxes.get(layer),
+                                                                child._calculateOwnBoundingBox()])
+
+            self.assertEqual(sorted(boxes.keys()), sorted(expected_boxes.keys()))
+            for layer, box in boxes.items():
+                for value, expected in zip(box, expected_boxes[layer]):
+                    self.assertAlmostEqual(value, expected)
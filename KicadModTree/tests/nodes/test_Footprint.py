@@ -0,0 +1,57 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import unittest
+
+from KicadModTree import *
+
+
+def createFootprint():
+    kicad_mod = Footprint("courtyard")
+    kicad_mod.append(RectLine(start=[-1, -2], end=[1, 2], layer='F.Fab'))
+    kicad_mod.append(PadArray(pincount=2, x_spacing=3, center=[0, 0], type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                              size=[1.003, 1], layers=Pad.LAYERS_SMT))
+    kicad_mod.append(Line(start=[-5, -5], end=[5, 5], layer='F.SilkS'))
+    return kicad_mod
+
+
+def courtyardPoints(kicad_mod):
+    return [(line.start_pos.x, line.start_pos.y) for line, _ in kicad_mod.walk(type=Line, layer='F.CrtYd')]
+
+
+class FootprintTests(unittest.TestCase):
+
+    def testCourtyard(self):
+        kicad_mod = createFootprint()
+        courtyard = kicad_mod.addCourtyard(offset=0.25, grid=0.01, width=0.05)
+
+        self.assertEqual(courtyard['min'], Point2D(-2.26, -2.25))
+        self.assertEqual(courtyard['max'], Point2D(2.26, 2.25))
+        self.assertEqual(courtyardPoints(kicad_mod), [(-2.26, -2.25), (-2.26, 2.25), (2.26, 2.25), (2.26, -2.25)])
+
+    def testCourtyardLayers(self):
+        kicad_mod = createFootprint()
+        courtyard = kicad_mod.addCourtyard(offset=0.5, grid=0.1, pads=False)
+        self.assertEqual(courtyard['min'], Point2D(-1.5, -2.5))
+        self.assertEqual(courtyard['max'], Point2D(1.5, 2.5))
+
+        self.assertIs(Footprint("empty").addCourtyard(), None)
+
+    def testPolygonalCourtyard(self):
+        kicad_mod = createFootprint()
+        kicad_mod.addCourtyard(offset=0.25, grid=0.01, polygonal=True)
+
+        self.assertEqual(courtyardPoints(kicad_mod),
+                         [(-1.25, -2.25), (1.25, -2.25), (1.25, -0.75), (2.26, -0.75), (2.26, 0.75), (1.25, 0.75),
+                          (1.25, 2.25), (-1.25, 2.25), (-1.25, 0.75), (-2.26, 0.75), (-2.26, -0.75), (-1.25, -0.75)])
+
@@ -0,0 +1,115 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import unittest
+
+from KicadModTree import *
+
+
+def createPart():
+    part = Node()
+    part.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=[0, 0], size=2, drill=1,
+                    layers=Pad.LAYERS_THT))
+    part.append(PolygoneLine(polygone=[[0, 1], [1, 1], [1, 2]], layer='F.SilkS'))
+    return part
+
+
+def serialize(*nodes):
+    kicad_mod = Footprint("instance")
+    kicad_mod.extend(nodes)
+    return KicadFileHandler(kicad_mod).serialize()
+
+
+class InstanceTests(unittest.TestCase):
+
+    def testInit(self):
+        part = createPart()
+        Node().append(part)
+        self.assertRaises(MultipleParentsError, Instance, part)
+        self.assertRaises(TypeError, Instance, [])
+
+    def testSerialize(self):
+        part = createPart()
+        instances = [Instance(part, at=[10, 0]), Instance(part, at=[0, 5], rotation=90)]
+
+        expected = []
+        for offset_x, offset_y, rotation in [(10, 0, 0), (0, 5, 90)]:
+            translation = Translation(offset_x, offset_y)
+            rotation_node = Rotation(rotation)
+            translation.append(rotation_node)
+            rotation_node.append(createPart())
+            expected.append(translation)
+
+        self.assertEqual(serialize(*instances), serialize(*expected))
+        self.assertIsNot(instances[0].getVirtualChilds()[0], instances[1].getVirtualChilds()[0])
+        self.assertEqual(len(part.getNormalChilds()[1]._getCreatedChilds()), 0)
+
+    def testBoundingBox(self):
+        part = createPart()
+        for rotation in [0, 90, 30]:
+            instance = Instance(part, at=[10, 0], rotation=rotation)
+            expected = Translation(10, 0)
+            rotation_node = Rotation(rotation)
+            expected.append(rotation_node)
+            rotation_node.append(createPart())
+
+            boxes = instance._getLayerBoundingBoxes()
+            expected_boxes = expected._getLayerBoundingBoxes()
+            self.assertEqual(sorted(boxes.keys()), sorted(expected_boxes.keys()))
+            for layer, box in boxes.items():
+                for value, expected_value in zip(box, expected_boxes[layer]):
+                    self.assertAlmostEqual(value, expected_value)
+
+            self.assertEqual(instance._virtual_childs is None, rotation % 90 == 0)
+
+    def testChangePosition(self):
+        part = createPart()
+        instance = Instance(part, at=[10, 0])
+        self.assertEqual(instance.calculateBoundingBox()['max'], Point2D(11, 2))
+
+        instance.at = [20, 0]
+        self.assertEqual(instance.at, Point2D(20, 0))
+        self.assertEqual(instance.calculateBoundingBox()['max'], Point2D(21, 2))
+
+        instance.rotation = 180
+        self.assertAlmostEqual(instance.calculateBoundingBox()['max'].x, 21)
+        self.assertAlmostEqual(instance.calculateBoundingBox()['max'].y, 1)
+
+    def testCopy(self):
+        part = createPart()
+        instance = Instance(part, at=[1, 2])
+        copy = instance.copy()
+        self.assertIs(copy.node, part)
+        self.assertEqual(copy.at, Point2D(1, 2))
+
+    def testModify(self):
+        part = createPart()
+        instance = Instance(part, at=[10, 0])
+        other = Instance(part, at=[20, 0])
+        self.assertEqual(instance.calculateBoundingBox()['max'], Point2D(11, 2))
+
+        node = instance.modify()
+        self.assertIsNot(node, part)
+        self.assertIs(instance.modify(), node)
+        self.assertFalse(instance.shared)
+        self.assertEqual(len(instance.getVirtualChilds()), 0)
+
+        node.append(Line(start=[0, 0], end=[5, 5], layer='F.SilkS'))
+        self.assertEqual(instance.calculateBoundingBox()['max'], Point2D(15, 5))
+        self.assertEqual(other.calculateBoundingBox()['max'], Point2D(21, 2))
+        self.assertEqual(len(part.getNormalChilds()), 2)
+
+        output = serialize(instance, other)
+        self.assertEqual(output.count('(fp_line '), 5)
+        self.assertIn('(pad 1 thru_hole circle (at 10 0)', output)
+        self.assertIn('(pad 1 thru_hole circle (at 20 0)', output)
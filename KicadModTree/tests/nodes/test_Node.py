@@ -16,6 +16,7 @@
 import unittest
 
 from KicadModTree.nodes.Node import *
+from KicadModTree.Point import *
 
 
 class TestChildNode(Node):
@@ -264,3 +265,183 @@ class NodeTests(unittest.TestCase):
         node.insert(insertNode)
         self.assertEqual(len(node.getNormalChilds()), 1)
         self.assertEqual(len(insertNode.getNormalChilds()), 200)
+
+    def testChildOrder(self):
+        node = Node()
+        childs = [Node() for i in range(10000)]
+        node.extend(childs)
+        self.assertEqual(node.getNormalChilds(), childs)
+
+        for child in childs[::2]:
+            node.remove(child)
+        self.assertEqual(node.getNormalChilds(), childs[1::2])
+
+        node.append(childs[0])
+        self.assertEqual(node.getNormalChilds(), childs[1::2] + childs[:1])
+
+        insertNode = Node()
+        node.insert(insertNode)
+        self.assertEqual(insertNode.getNormalChilds(), childs[1::2] + childs[:1])
+        self.assertEqual(node.getNormalChilds(), [insertNode])
+        self.assertIs(childs[1].getParent(), insertNode)
+
+        duplicate = Node()
+        self.assertRaises(MultipleParentsError, node.extend, [Node(), duplicate, duplicate])
+        self.assertEqual(node.getNormalChilds(), [insertNode])
+
+    def testGetRealPosition(self):
+        from KicadModTree.nodes.specialized import Translation, Rotation
+
+        node = Node()
+        self.assertEqual(node.getRealPosition([1, 2]), Point3D(1, 2, 0))
+
+        translation = Translation(10, 20)
+        rotation = Rotation(90)
+        childNode = Node()
+        translation.append(rotation)
+        rotation.append(childNode)
+
+        position, rotation_angle = childNode.getRealPosition([1, 0], 45)
+        self.assertAlmostEqual(position.x, 10)
+        self.assertAlmostEqual(position.y, 19)
+        self.assertEqual(rotation_angle, 135)
+
+        # the transformation of the parents is cached, but has to follow changes of the tree
+        node.append(translation)
+        position = childNode.getRealPosition([1, 0])
+        self.assertAlmostEqual(position.x, 10)
+        self.assertAlmostEqual(position.y, 19)
+
+        translation.remove(rotation)
+        position, rotation_angle = childNode.getRealPosition([1, 0], 45)
+        self.assertAlmostEqual(position.x, 0)
+        self.assertAlmostEqual(position.y, -1)
+        self.assertEqual(rotation_angle, 135)
+
+        insertNode = Translation(-1, -1)
+        rotation.insert(insertNode)
+        position = childNode.getRealPosition([1, 0])
+        self.assertAlmostEqual(position.x, -1)
+        self.assertAlmostEqual(position.y, 0)
+
+    def testGetRealPositions(self):
+        from KicadModTree.nodes.specialized import Translation, Rotation
+
+        translation = Translation(10, 20)
+        rotation = Rotation(90)
+        childNode = Node()
+        translation.append(rotation)
+        rotation.append(childNode)
+
+        points = [[1, 0], (0, 1), {'x': 2, 'y': 2}, Point2D(-1, 0)]
+        positions = childNode.getRealPositions(points)
+        self.assertEqual(len(positions), len(points))
+        for point, (x, y) in zip(points, positions):
+            expected = childNode.getRealPosition(point)
+            self.assertAlmostEqual(x, expected.x)
+            self.assertAlmostEqual(y, expected.y)
+
+        self.assertEqual(len(childNode.getRealPositions([])), 0)
+
+    def testChangeTransformation(self):
+        from KicadModTree.nodes.base import Circle
+        from KicadModTree.nodes.specialized import Translation, Rotation
+
+        translation = Translation(1, 0)
+        rotation = Rotation(0)
+        circle = Circle(center=[1, 0], radius=0.5, layer='F.Fab')
+        translation.append(rotation)
+        rotation.append(circle)
+        self.assertEqual(circle.getRealPosition(Point2D(0, 0)), Point3D(1, 0))
+        self.assertEqual(translation.calculateBoundingBox()['max'], Point2D(2.5, 0.5))
+
+        # changing a transformation drops the cached transformations and bounding boxes
+        translation.offset_x = 10
+        translation.offset_y = 2
+        self.assertEqual(circle.getRealPosition(Point2D(0, 0)), Point3D(10, 2))
+        self.assertEqual(translation.calculateBoundingBox()['max'], Point2D(11.5, 2.5))
+
+        rotation.rotation = 180
+        self.assertAlmostEqual(translation.calculateBoundingBox()['max'].x, 9.5)
+        self.assertAlmostEqual(translation.calculateBoundingBox()['max'].y, 2.5)
+
+    def testVirtualChilds(self):
+        from KicadModTree.nodes.specialized import PolygoneLine
+
+        polygone = [{'x': 0, 'y': 0}, {'x': 1, 'y': 0}, {'x': 1, 'y': 1}]
+        node = PolygoneLine(polygone=polygone)
+        polygone[0]['x'] = 5
+        self.assertIs(node._virtual_childs, None)
+
+        childs = node.getVirtualChilds()
+        self.assertIs(node.getVirtualChilds(), childs)
+        self.assertEqual(len(childs), 2)
+        self.assertEqual(childs[0].start_pos, Point2D(0, 0))
+        for child in childs:
+            self.assertIs(child.getParent(), node)
+
+    def testCopy(self):
+        from KicadModTree.nodes.specialized import PolygoneLine
+
+        parent = Node()
+        node = PolygoneLine(polygone=[[0, 0], [1, 0], [1, 1]])
+        parent.append(node)
+        node.getVirtualChilds()
+
+        copy = node.copy()
+        self.assertIs(copy.getParent(), None)
+        self.assertIs(node.getParent(), parent)
+        self.assertIs(copy._virtual_childs, None)
+        self.assertEqual(len(copy.getVirtualChilds()), 2)
+        self.assertIs(copy.getVirtualChilds()[0].getParent(), copy)
+
+    def testWalk(self):
+        from KicadModTree.nodes.base import Line, Pad
+        from KicadModTree.nodes.specialized import Translation, Rotation, RectLine
+
+        root = Node()
+        translation = Translation(1, 2)
+        rotation = Rotation(90)
+        line = Line(start=[0, 0], end=[1, 0], layer='F.Fab')
+        rect = RectLine(start=[0, 0], end=[1, 1], layer='F.SilkS')
+        pad = Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[0, 0], size=1, layers=Pad.LAYERS_SMT)
+        root.extend([translation, pad])
+        translation.extend([rotation, rect])
+        rotation.append(line)
+
+        nodes = [node for node, _ in root.walk()]
+        self.assertEqual(nodes, [root, translation, rotation, line, rect] + rect.getVirtualChilds() + [pad])
+        self.assertEqual(root.serialize(), nodes)
+        self.assertEqual([node for node, _ in translation.walk()], nodes[1:-1])
+
+        for node, transformation in root.walk():
+            self.assertEqual(transformation, node.getTransformation())
+        self.assertAlmostEqual(dict(root.walk())[line][6], 90)
+
+        self.assertEqual([node for node, _ in root.walk(type=Pad)], [pad])
+        self.assertEqual([node for node, _ in root.walk(type=(Pad, Rotation))], [rotation, pad])
+        self.assertEqual([node for node, _ in root.walk(layer='F.Fab')], [line])
+        self.assertEqual([node for node, _ in root.walk(type=Line, layer='F.SilkS')], rect.getVirtualChilds())
+        self.assertEqual([node for node, _ in root.walk(layer='F.Cu')], [pad])
+
+    def testWalkHandleVirtualChilds(self):
+        from KicadModTree.nodes.base import Line
+        from KicadModTree.nodes.specialized import RectLine
+
+        root = Node()
+        rect = RectLine(start=[0, 0], end=[1, 1], layer='F.SilkS')
+        line = Line(start=[0, 0], end=[1, 0], layer='F.Fab')
+        rect.append(line)
+        root.append(rect)
+
+        # the virtual childs are handled after the normal childs, and are not created when the handler takes them
+        handled = []
+
+        def handleVirtualChilds(node):
+            handled.append(node)
+            return node is rect
+
+        nodes = [node for node, _ in root.walk(handle_virtual_childs=handleVirtualChilds)]
+        self.assertEqual(nodes, [root, rect, line])
+        self.assertEqual(handled, [line, rect, root])
+        self.assertIs(rect._virtual_childs, None)
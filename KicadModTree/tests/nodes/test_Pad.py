@@ -0,0 +1,99 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import pickle
+import unittest
+
+from KicadModTree import *
+
+
+class PadTests(unittest.TestCase):
+
+    def testTemplate(self):
+        template = PadTemplate(type=Pad.TYPE_THT, shape=Pad.SHAPE_OVAL, size=1.7, drill=1, layers=Pad.LAYERS_THT)
+        pad1 = Pad(number=1, at=[0, 0], template=template)
+        pad2 = Pad(number=2, at=[2.54, 0], template=template)
+
+        self.assertIs(pad1.template, pad2.template)
+        self.assertIs(pad1.size, pad2.size)
+        self.assertEqual(pad2.size, Point2D(1.7, 1.7))
+        self.assertEqual(pad2.drill, Point2D(1, 1))
+        self.assertEqual(pad2.layers, tuple(Pad.LAYERS_THT))
+        self.assertEqual(pad2.at, Point2D(2.54, 0))
+
+    def testChangeSettings(self):
+        template = PadTemplate(type=Pad.TYPE_THT, shape=Pad.SHAPE_OVAL, size=1.7, drill=1, layers=Pad.LAYERS_THT)
+        pad1 = Pad(number=1, at=[0, 0], template=template)
+        pad2 = Pad(number=2, at=[2.54, 0], template=template)
+        self.assertEqual(pad1.calculateBoundingBox()['max'], Point2D(0.85, 0.85))
+
+        # the layers of the shared template can not be changed in place through a pad
+        with self.assertRaises(AttributeError):
+            pad1.layers.append('F.SilkS')
+        self.assertEqual(template.layers, tuple(Pad.LAYERS_THT))
+        self.assertIsInstance(pad1.layers, tuple)
+        self.assertIsInstance(template.layers, tuple)
+
+        # changing a setting replaces the template of this pad only
+        pad1.size = [2, 3]
+        pad1.layers = pad1.layers + ('F.SilkS',)
+        self.assertIsNot(pad1.template, template)
+        self.assertEqual(pad1.size, Point2D(2, 3))
+        self.assertEqual(pad1.drill, Point2D(1, 1))
+        self.assertEqual(pad1.layers, tuple(Pad.LAYERS_THT + ['F.SilkS']))
+        self.assertIs(pad2.template, template)
+        self.assertEqual(pad2.size, Point2D(1.7, 1.7))
+        self.assertEqual(pad1.calculateBoundingBox()['max'], Point2D(1, 1.5))
+
+        self.assertRaises(ValueError, setattr, pad1, 'shape', 'other')
+        self.assertEqual(template.derive(drill=0.8).drill, Point2D(0.8, 0.8))
+
+    def testTemplateValidation(self):
+        self.assertRaises(KeyError, PadTemplate, shape=Pad.SHAPE_OVAL, size=1, layers=Pad.LAYERS_SMT)
+        self.assertRaises(ValueError, PadTemplate, type='other', shape=Pad.SHAPE_OVAL, size=1, layers=Pad.LAYERS_SMT)
+        self.assertRaises(KeyError, PadTemplate, type=Pad.TYPE_THT, shape=Pad.SHAPE_OVAL, size=1,
+                          layers=Pad.LAYERS_THT)
+
+        template = PadTemplate(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, size=1, layers=Pad.LAYERS_SMT)
+        self.assertRaises(AttributeError, setattr, template, 'size', Point2D(2, 2))
+        self.assertRaises(KeyError, Pad, at=[0, 0], size=2, template=template)
+        self.assertRaises(TypeError, Pad, at=[0, 0], template={'size': 2})
+
+    def testSerializeTemplate(self):
+        kwargs = dict(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, size=[1, 2], layers=Pad.LAYERS_SMT,
+                      solder_mask_margin=0.05)
+        template = PadTemplate(**kwargs)
+
+        kicad_mod = Footprint("pads")
+        kicad_mod.append(Pad(number=1, at=[0, 0], **kwargs))
+        kicad_mod.append(Pad(number=2, at=[1, 0], **kwargs))
+        expected = KicadFileHandler(kicad_mod).serialize()
+
+        kicad_mod = Footprint("pads")
+        kicad_mod.append(Pad(number=1, at=[0, 0], template=template))
+        kicad_mod.append(Pad(number=2, at=[1, 0], template=template))
+        self.assertEqual(KicadFileHandler(kicad_mod).serialize(), expected)
+        self.assertIn('(pad 2 smd rect (at 1 0) (size 1 2) (layers F.Cu F.Mask F.Paste)\n'
+                      '    (solder_mask_margin 0.05))', expected)
+
+    def testCopy(self):
+        pad = Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=[1, 2], size=2, drill=1,
+                  layers=Pad.LAYERS_THT)
+        copy = pad.copy()
+        self.assertIs(copy.template, pad.template)
+        self.assertEqual(copy.at, Point2D(1, 2))
+
+        template = pickle.loads(pickle.dumps(pad.template, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(template.size, pad.template.size)
+        self.assertEqual(template.layers, pad.template.layers)
+        self.assertRaises(AttributeError, setattr, template, 'drill', 2)
@@ -0,0 +1,79 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import unittest
+
+from KicadModTree import *
+
+
+def createGrid(**kwargs):
+    return PadGrid(type=Pad.TYPE_SMT, shape=Pad.SHAPE_CIRCLE, size=0.4, layers=Pad.LAYERS_SMT, **kwargs)
+
+
+class PadGridTests(unittest.TestCase):
+
+    def testRowName(self):
+        self.assertEqual(PadGrid.rowName(0), 'A')
+        self.assertEqual(PadGrid.rowName(7), 'H')
+        self.assertEqual(PadGrid.rowName(8), 'J')
+        self.assertEqual(PadGrid.rowName(19), 'Y')
+        self.assertEqual(PadGrid.rowName(20), 'AA')
+        self.assertEqual(PadGrid.rowName(39), 'AY')
+        self.assertEqual(PadGrid.rowName(40), 'BA')
+
+    def testPads(self):
+        grid = createGrid(rows=2, columns=3, spacing=[1, 2], center=[0, 0])
+        pads = grid.getVirtualChilds()
+        self.assertEqual([pad.number for pad in pads], ['A1', 'A2', 'A3', 'B1', 'B2', 'B3'])
+        self.assertEqual(pads[0].at, Point2D(-1, -1))
+        self.assertEqual(pads[5].at, Point2D(1, 1))
+        self.assertEqual(pads[0].size, Point2D(0.4, 0.4))
+        self.assertIs(pads[0].getParent(), grid)
+        self.assertIs(grid.getVirtualChilds(), pads)
+
+    def testNumericNaming(self):
+        grid = createGrid(rows=2, columns=2, spacing=1, start=[1, 1], naming=PadGrid.NAMING_NUMERIC, initial=5)
+        pads = grid.getVirtualChilds()
+        self.assertEqual([pad.number for pad in pads], [5, 6, 7, 8])
+        self.assertEqual(pads[3].at, Point2D(2, 2))
+
+    def testDepopulated(self):
+        grid = createGrid(rows=3, columns=3, spacing=1, depopulated=['A1', (1, 1)])
+        self.assertEqual(len(grid.populated), 7)
+        numbers = [pad.number for pad in grid.getVirtualChilds()]
+        self.assertNotIn('A1', numbers)
+        self.assertNotIn('B2', numbers)
+
+        self.assertRaises(ValueError, createGrid, rows=3, columns=3, spacing=1, depopulated=['D1'])
+        self.assertRaises(ValueError, createGrid, rows=3, columns=3, spacing=1, depopulated=[(0, 3)])
+
+    def testInvalid(self):
+        self.assertRaises(KeyError, createGrid, columns=3, spacing=1)
+        self.assertRaises(ValueError, createGrid, rows=0, columns=3, spacing=1)
+        self.assertRaises(KeyError, createGrid, rows=3, columns=3)
+        self.assertRaises(ValueError, createGrid, rows=3, columns=3, spacing=1, naming='other')
+
+    def testBoundingBox(self):
+        grid = createGrid(rows=3, columns=4, spacing=1, start=[0, 0])
+        bbox = grid.calculateBoundingBox()
+        self.assertEqual(bbox['min'], Point2D(-0.2, -0.2))
+        self.assertEqual(bbox['max'], Point2D(3.2, 2.2))
+
+    def testSerialize(self):
+        kicad_mod = Footprint("BGA")
+        translation = Translation(1, 0)
+        translation.append(createGrid(rows=2, columns=2, spacing=1, center=[0, 0]))
+        kicad_mod.append(translation)
+        output = KicadFileHandler(kicad_mod).serialize()
+        self.assertEqual(output.count('(pad '), 4)
+        self.assertIn('(pad A1 smd circle (at 0.5 -0.5)', output)
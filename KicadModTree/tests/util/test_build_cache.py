@@ -0,0 +1,134 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util import config_loader
+from KicadModTree.util.build_cache import BuildCache
+
+
+class BuildCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def footprint_function(self, args):
+        self.calls.append(args['name'])
+
+        kicad_mod = Footprint(args['name'])
+        kicad_mod.append(Line(start=[0, 0], end=[args['length'], 0]))
+
+        file_handler = KicadFileHandler(kicad_mod)
+        file_handler.writeFile(os.path.join(self.directory, '{}.kicad_mod'.format(args['name'])))
+
+    def testWriteFileUnchanged(self):
+        filename = os.path.join(self.directory, 'test.kicad_mod')
+        file_handler = KicadFileHandler(Footprint("test"))
+
+        self.assertTrue(file_handler.writeFile(filename, timestamp=0))
+        self.assertFalse(file_handler.writeFile(filename))  # keeps the stored timestamp
+        self.assertTrue(file_handler.writeFile(filename, timestamp=1))
+
+        # a changed footprint is streamed only once, and gets the current time as timestamp
+        file_handler = KicadFileHandler(Footprint("other"))
+        calls = []
+        serialize_to_stream = file_handler.serializeToStream
+        file_handler.serializeToStream = lambda stream, **kwargs: (calls.append(kwargs) or
+                                                                   serialize_to_stream(stream, **kwargs))
+        file_handler.serialize = None  # the footprint is never created as one string
+        self.assertTrue(file_handler.writeFile(filename))
+        self.assertEqual(len(calls), 1)
+
+        with io.open(filename, "r", newline='\n', encoding="utf-8") as f:
+            content = f.read()
+        self.assertNotIn('(tedit 1)', content)
+        self.assertEqual(KicadFileHandler.deserialize(content).name, "other")
+        self.assertFalse(file_handler.writeFile(filename))
+        self.assertEqual(os.listdir(self.directory), ['test.kicad_mod'])
+
+    def testWriteFileChanges(self):
+        filename = os.path.join(self.directory, 'test.kicad_mod')
+        kicad_mod = Footprint("test")
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertTrue(file_handler.writeFile(filename, timestamp=0))
+
+        with io.open(filename, "r", newline='\n', encoding="utf-8") as f:
+            content = f.read()
+
+        # a existing file which is longer or shorter than the new content
+        for existing_content in [content + u"\n", content[:-1], u""]:
+            with io.open(filename, "w", newline='\n', encoding="utf-8") as f:
+                f.write(existing_content)
+            self.assertTrue(file_handler.writeFile(filename, timestamp=0))
+            with io.open(filename, "r", newline='\n', encoding="utf-8") as f:
+                self.assertEqual(f.read(), content)
+
+        # a difference after the first chunk
+        for i in range(5000):
+            kicad_mod.append(Line(start=[0, 0], end=[i, 0]))
+        self.assertTrue(file_handler.writeFile(filename, timestamp=0))
+        with io.open(filename, "r", newline='\n', encoding="utf-8") as f:
+            content = f.read()
+        kicad_mod.append(Line(start=[0, 0], end=[-1, 0]))
+        self.assertTrue(file_handler.writeFile(filename, timestamp=0))
+        line = "  (fp_line (start 0 0) (end -1 0) (layer F.SilkS) (width 0.12))"
+        with io.open(filename, "r", newline='\n', encoding="utf-8") as f:
+            self.assertEqual(f.read(), content[:-2] + "\n" + line + "\n)")
+        self.assertEqual(os.listdir(self.directory), ['test.kicad_mod'])
+
+    def testExecute(self):
+        cache = BuildCache(os.path.join(self.directory, 'cache'))
+
+        self.assertTrue(cache.execute(self.footprint_function, {'name': 'a', 'length': 1}))
+        self.assertTrue(cache.execute(self.footprint_function, {'name': 'b', 'length': 1}))
+        self.assertFalse(cache.execute(self.footprint_function, {'name': 'a', 'length': 1}))
+        self.assertTrue(cache.execute(self.footprint_function, {'name': 'a', 'length': 2}))
+
+        os.remove(os.path.join(self.directory, 'b.kicad_mod'))
+        self.assertTrue(cache.execute(self.footprint_function, {'name': 'b', 'length': 1}))
+
+        self.assertEqual(self.calls, ['a', 'b', 'a', 'b'])
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+    def testDependencies(self):
+        config = os.path.join(self.directory, 'config.yaml')
+        with open(config, 'w') as f:
+            f.write("a: 1\n")
+
+        # pretend the file was loaded by the generator, like loadYaml(config) does
+        config_loader._parsed_files[(config, False)] = (None, None)
+        try:
+            cache = BuildCache(os.path.join(self.directory, 'cache'))
+            self.assertTrue(cache.execute(self.footprint_function, {'name': 'a', 'length': 1}))
+            self.assertFalse(cache.execute(self.footprint_function, {'name': 'a', 'length': 1}))
+
+            with open(config, 'w') as f:
+                f.write("a: 2\n")
+
+            # dependencies are expected to be unchanged during a run, so a new cache sees the change
+            cache = BuildCache(os.path.join(self.directory, 'cache'))
+            self.assertTrue(cache.execute(self.footprint_function, {'name': 'a', 'length': 1}))
+            self.assertFalse(cache.execute(self.footprint_function, {'name': 'a', 'length': 1}))
+        finally:
+            del config_loader._parsed_files[(config, False)]
+
+        self.assertEqual(self.calls, ['a', 'a'])
@@ -0,0 +1,66 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree.util import config_loader
+from KicadModTree.util.config_loader import loadYaml, loadYamlAll
+
+
+class ConfigLoaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'config.yaml')
+        self.cache_dir = os.path.join(self.directory, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def writeConfig(self, content, mtime):
+        with open(self.filename, 'w') as f:
+            f.write(content)
+        os.utime(self.filename, (mtime, mtime))
+
+    def testLoadYaml(self):
+        self.writeConfig("a: 1\nb: [1, 2]\n", 1000)
+
+        config = loadYaml(self.filename)
+        self.assertEqual(config, {'a': 1, 'b': [1, 2]})
+
+        config['a'] = 2  # returned data is a copy
+        self.assertEqual(loadYaml(self.filename), {'a': 1, 'b': [1, 2]})
+
+        self.writeConfig("a: 3\nb: [1, 2]\n", 2000)
+        self.assertEqual(loadYaml(self.filename), {'a': 3, 'b': [1, 2]})
+
+    def testLoadYamlAll(self):
+        self.writeConfig("a: 1\n---\nb: 2\n", 1000)
+        self.assertEqual(loadYamlAll(self.filename), [{'a': 1}, {'b': 2}])
+
+    def testDiskCache(self):
+        self.writeConfig("a: 1\n", 1000)
+        self.assertEqual(loadYaml(self.filename, cache_dir=self.cache_dir), {'a': 1})
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_dir, 'yaml'))), 1)
+
+        # a new process would only find the file on disk, and does not need to parse the file again
+        config_loader._parsed_files.clear()
+        loader = config_loader.YamlLoader
+        config_loader.YamlLoader = None
+        try:
+            self.assertEqual(loadYaml(self.filename, cache_dir=self.cache_dir), {'a': 1})
+        finally:
+            config_loader.YamlLoader = loader
@@ -0,0 +1,146 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import math
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util.keepout import *
+
+
+class KeepoutTests(unittest.TestCase):
+
+    def assertLinesAlmostEqual(self, lines, expected):
+        self.assertEqual(len(lines), len(expected))
+        for (start, end), (expected_start, expected_end) in zip(lines, expected):
+            for value, expected_value in zip(start + end, expected_start + expected_end):
+                self.assertAlmostEqual(value, expected_value)
+
+    def testSubtractIntervals(self):
+        self.assertEqual(subtractIntervals([[0, 10]], []), [[0, 10]])
+        self.assertEqual(subtractIntervals([[0, 10]], [[2, 3], [5, 6]]), [[0, 2], [3, 5], [6, 10]])
+        self.assertEqual(subtractIntervals([[0, 10]], [[5, 6], [2, 3], [2.5, 4]]), [[6, 10], [0, 2], [4, 5]])
+        self.assertEqual(subtractIntervals([[0, 10]], [[-1, 0], [10, 11]]), [[0, 10]])
+        self.assertEqual(subtractIntervals([[0, 10]], [[-1, 4], [4, 11]]), [])
+        self.assertEqual(subtractIntervals([[0, 2], [4, 6]], [[1, 5]]), [[5, 6], [0, 1]])
+        self.assertEqual(subtractIntervals([[1, 1], [3, 3]], [[0, 2]]), [[3, 3]])
+
+    def testSubtractIntervalsOrder(self):
+        # parts are emitted in the order of the original algorithm, which subtracted one interval after another
+        cases = [([[0, 10]], [[4, 5], [1, 2], [1.5, 4.5]], False, [[5, 10], [0, 1]]),
+                 ([[0, 10]], [[4, 6], [4, 6]], False, [[6, 10], [0, 4]]),
+                 ([[0, 10]], [[4, 6], [3, 7]], False, [[7, 10], [0, 3]]),
+                 ([[0, 10]], [[4, 6], [3, 7], [2, 5]], False, [[7, 10], [0, 2]]),
+                 ([[0, 4], [6, 10]], [[3, 7], [1, 2], [8, 9]], False, [[0, 1], [2, 3], [7, 8], [9, 10]]),
+                 ([[0, 4], [6, 10]], [[3, 7], [1, 2], [8, 9]], True, [[0, 1], [2, 3], [7, 8], [9, 10]]),
+                 ([[0, 4], [6, 10]], [[8, 9], [1, 2]], False, [[6, 8], [9, 10], [0, 1], [2, 4]]),
+                 ([[0, 4], [6, 10]], [[8, 9], [1, 2]], True, [[0, 1], [2, 4], [6, 8], [9, 10]])]
+
+        # more intervals are subtracted in one sorted sweep, which has to keep the same order
+        far_away = [[100 + i, 101 + i] for i in range(DIRECT_SUBTRACTION_LIMIT)]
+        for lines, intervals, separately, expected in cases:
+            self.assertEqual(subtractIntervals(lines, intervals, separately), expected)
+            self.assertEqual(subtractIntervals(lines, intervals + far_away, separately), expected)
+            self.assertEqual(subtractIntervals(lines, far_away + intervals, separately), expected)
+
+    def testContains(self):
+        keepouts = KeepoutSet()
+        keepouts.addRect([1, 1], [-1, -1])
+        keepouts.addCircle([3, 0], 0.5)
+        keepouts.addRoundRect([5, -1], [7, 1], 0.5)
+
+        self.assertTrue(keepouts.contains(0, 0))
+        self.assertTrue(keepouts.contains(1, 1))
+        self.assertTrue(keepouts.contains(3.5, 0))
+        self.assertFalse(keepouts.contains(3.4, 0.4))
+        self.assertTrue(keepouts.contains(5, 0))
+        self.assertFalse(keepouts.contains(5.05, 0.95))
+        self.assertTrue(keepouts.contains(5.2, 0.6))
+        self.assertEqual(keepouts.containsPoints([[0, 0], [2, 0]]), [True, False])
+
+    def testClipAxisLines(self):
+        keepouts = KeepoutSet.fromRects([[-1, 1, -1, 1], [2, 4, 0, 2]])
+        keepouts.addCircle([6, 0], 1)
+
+        self.assertEqual(keepouts.clipAxisLines([[-5, 10]], 0, 0), [[-5, -1], [1, 2], [4, 5], [7, 10]])
+        self.assertEqual(keepouts.clipAxisLines([[10, -5]], 1.5, 0), [[-5, 2], [4, 10]])
+        self.assertEqual(keepouts.clipAxisLines([[-5, 5]], 0, 1), [[-5, -1], [1, 5]])
+        self.assertEqual(keepouts.clipAxisLines([[-5, 5]], 3, 1), [[-5, 0], [2, 5]])
+
+    def testClipLine(self):
+        keepouts = KeepoutSet()
+        keepouts.addRect([-1, -1], [1, 1])
+        keepouts.addCircle([4, 4], 1)
+
+        self.assertLinesAlmostEqual(keepouts.clipLine((-3, 0), (3, 0)), [((-3, 0), (-1, 0)), ((1, 0), (3, 0))])
+        self.assertLinesAlmostEqual(keepouts.clipLine((3, 0), (-3, 0)), [((3, 0), (1, 0)), ((-1, 0), (-3, 0))])
+        self.assertLinesAlmostEqual(keepouts.clipLine((0, 3), (0, -3)), [((0, 3), (0, 1)), ((0, -1), (0, -3))])
+
+        d = math.sqrt(0.5)
+        self.assertLinesAlmostEqual(keepouts.clipLine((-2, -2), (6, 6)),
+                                    [((-2, -2), (-1, -1)), ((1, 1), (4 - d, 4 - d)), ((4 + d, 4 + d), (6, 6))])
+        self.assertEqual(keepouts.clipLine((-3, 3), (3, 2)), [((-3, 3), (3, 2))])
+        self.assertEqual(keepouts.clipLine((-0.5, 0.5), (0.5, -0.5)), [])
+
+    def testVisibleCircleIntervals(self):
+        keepouts = KeepoutSet()
+        keepouts.addRect([-2, 0.5], [2, 2])
+
+        intervals = keepouts.visibleCircleIntervals(0, 0, 1, 0, 2 * math.pi)
+        self.assertEqual(len(intervals), 1)
+        self.assertAlmostEqual(intervals[0][0], math.pi / 3)
+        self.assertAlmostEqual(intervals[0][1], 5 * math.pi / 3)
+
+        self.assertEqual(keepouts.visibleCircleIntervals(0, 5, 1, 0, 2 * math.pi), [[0, 2 * math.pi]])
+
+    def testCircleKeepoutIntersections(self):
+        keepouts = KeepoutSet()
+        keepouts.addCircle([1, 0], 1)
+
+        intervals = keepouts.visibleCircleIntervals(0, 0, 1, -math.pi, math.pi)
+        self.assertEqual(len(intervals), 2)
+        self.assertAlmostEqual(intervals[0][0], -math.pi)
+        self.assertAlmostEqual(intervals[0][1], math.pi / 6)
+        self.assertAlmostEqual(intervals[1][0], 5 * math.pi / 6)
+        self.assertAlmostEqual(intervals[1][1], math.pi)
+
+    def testClipNodes(self):
+        keepouts = KeepoutSet()
+        keepouts.addRect([-0.5, 0.5], [0.5, 2])
+
+        line = Line(start=[-3, 0], end=[3, 0], layer='F.Fab', width=0.1)
+        self.assertEqual(keepouts.clipNodes([line]), [line])
+
+        nodes = keepouts.clipNodes([Line(start=[0, -1], end=[0, 3], layer='F.Fab', width=0.1)])
+        self.assertEqual(len(nodes), 2)
+        self.assertEqual(nodes[0].end_pos, Point2D(0, 0.5))
+        self.assertEqual(nodes[1].start_pos, Point2D(0, 2))
+        self.assertEqual(nodes[0].layer, 'F.Fab')
+        self.assertEqual(nodes[0].width, 0.1)
+
+        nodes = keepouts.clipNodes([Circle(center=[0, 0], radius=1, layer='F.SilkS', width=0.12)])
+        self.assertEqual(len(nodes), 1)
+        self.assertTrue(isinstance(nodes[0], Arc))
+        self.assertAlmostEqual(nodes[0].angle, -360 + 2 * math.degrees(math.asin(0.5)))
+        self.assertAlmostEqual(nodes[0].start_pos.x, 0.5)
+        self.assertAlmostEqual(nodes[0].start_pos.y, math.sqrt(0.75))
+
+        nodes = keepouts.clipNodes([Arc(center=[0, 0], start=[1, 0], angle=180)])
+        self.assertEqual(len(nodes), 2)
+        self.assertAlmostEqual(nodes[0].start_pos.x, 1)
+        self.assertAlmostEqual(nodes[0].angle, 60)
+        self.assertAlmostEqual(nodes[1].start_pos.x, -0.5)
+        self.assertAlmostEqual(nodes[1].angle, 60)
+
+        text = Text(type='reference', text='REF**', at=[0, 1])
+        self.assertEqual(keepouts.clipNodes([text]), [text])
@@ -0,0 +1,66 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import unittest
+
+from KicadModTree.util.kicad_util import *
+
+
+class KicadUtilTests(unittest.TestCase):
+
+    def testLispString(self):
+        self.assertEqual(lispString("F.Cu"), 'F.Cu')
+        self.assertEqual(lispString(""), '""')
+        self.assertEqual(lispString("a b"), '"a b"')
+        self.assertEqual(lispString("a(b)"), '"a(b)"')
+        self.assertEqual(lispString('a"b'), '"a\\"b"')
+        self.assertEqual(lispString('a\\b'), '"a\\\\b"')
+
+    def testParseLispString(self):
+        self.assertEqual(parseLispString("(module test (layer F.Cu))"), ['module', 'test', ['layer', 'F.Cu']])
+        self.assertEqual(parseLispString('(descr "a  (b)\n c")'), ['descr', 'a  (b)\n c'])
+        self.assertEqual(parseLispString('(descr "")'), ['descr', ''])
+        self.assertEqual(parseLispString('(a)(b)'), [['a'], ['b']])
+
+    def testParseLispStringRoundTrip(self):
+        for string in ["", "a b", "a(b)", 'a"b', 'a\\b', 'a\\"b" (c', '"', '\\']:
+            self.assertEqual(parseLispString("(fp_text {})".format(lispString(string))), ['fp_text', string])
+
+    def testParseLispStringErrors(self):
+        self.assertRaises(RuntimeError, parseLispString, "(a (b)")
+        self.assertRaises(RuntimeError, parseLispString, "(a))")
+        self.assertRaises(RuntimeError, parseLispString, '(a "b)')
+
+    def testParseTimestamp(self):
+        self.assertEqual(parseTimestamp(formatTimestamp(1514764800)), 1514764800)
+        self.assertEqual(parseTimestamp("0"), 0)
+
+    def testFormatNanometres(self):
+        # values with more than six decimals are rounded exactly like formatFloat rounds them
+        for value in [0, 1, -1, 0.5, -0.5, 1.27, -1.27, 0.000001, -0.000001, 12345.678901, 100, 63.2276645,
+                      -63.2276645, 0.0000005, 2.5400004999]:
+            self.assertEqual(formatNanometres(toNanometres(value)), formatFloat(value))
+
+        # values halfway between two nanometres, after the multiplication or exactly (rounded half to even)
+        for value in [63.2276645, -63.2276645, 1.0000005, 2.0000015, 0.0078125, -0.0078125, 0.0234375,
+                      1234.5678905, 99999.9999995, 2000.0000005, 5000000.0000005]:
+            self.assertEqual(toNanometres(value), int(('%f' % value).replace('.', '')))
+
+        # negative zero and float noise disappear, because the value is rounded once
+        self.assertEqual(formatNanometres(toNanometres(-0.)), '0')
+        self.assertEqual(toNanometres(0.1 + 0.2), 300000)
+        self.assertEqual(toNanometres(-0.0000004), 0)
+
+    def testSerializeFormattedNumber(self):
+        sexpr = ['at', FormattedNumber(formatNanometres(-1270000)), 2.5, 'F.Cu']
+        self.assertEqual(str(SexprSerializer(sexpr)), '(at -1.27 2.5 F.Cu)')
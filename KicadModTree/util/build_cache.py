@@ -0,0 +1,202 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import os
+import io
+import sys
+import json
+import hashlib
+import inspect
+
+from KicadModTree.FileHandler import FileHandler
+from KicadModTree.util import config_loader
+
+
+KICADMODTREE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPOSITORY_DIR = os.path.dirname(KICADMODTREE_DIR)
+
+
+def _hashFile(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _sourceFile(function):
+    try:
+        return os.path.abspath(inspect.getsourcefile(function))
+    except TypeError:
+        return ''
+
+
+def _isInDirectory(filename, directory):
+    return filename.startswith(directory + os.sep) and not any(
+        d in filename for d in ('site-packages', 'dist-packages'))
+
+
+def _hashSources(filenames):
+    sha = hashlib.sha1()
+    for filename in sorted(filenames):
+        with open(filename, 'rb') as f:
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+class BuildCache(object):
+    '''
+    Remember which files were generated from which parameters, to skip generating footprints which are up to date
+
+    The cache key of a footprint is a hash of the generator function (name and source file), the parameters passed
+    to it and the KicadModTree sources. For every key, the written files and the files the generator depends on are
+    stored together with the hash of their content. The dependencies are all modules imported from the repository
+    (like the helpers in scripts/tools) and all files loaded through ``config_loader``. When all those files are
+    still unchanged, calling the generator function can be skipped.
+
+    :Example:
+
+    >>> from KicadModTree.util.build_cache import BuildCache
+    >>> cache = BuildCache('.kicadmodtree_cache')
+    >>> cache.execute(footprint_function, {'name': 'example_footprint'})
+    '''
+
+    _kicadmodtree_hash = None
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._dependency_hashes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def execute(self, footprint_function, parameters):
+        '''
+        call footprint_function(parameters), unless all files it wrote the last time are still up to date
+
+        :return: ``True`` if footprint_function was called, ``False`` on a cache hit
+        '''
+        key = self.key(footprint_function, parameters)
+
+        if self.isUpToDate(key):
+            self.hits += 1
+            return False
+
+        self.misses += 1
+
+        previous_written_files = FileHandler.written_files
+        FileHandler.written_files = []
+        try:
+            footprint_function(parameters)
+            self.store(key, FileHandler.written_files, self._dependencies(footprint_function))
+        finally:
+            if previous_written_files is not None:
+                previous_written_files.extend(FileHandler.written_files)
+            FileHandler.written_files = previous_written_files
+
+        return True
+
+    def key(self, footprint_function, parameters):
+        '''
+        calculate the cache key of a single call of a footprint function
+        '''
+        sha = hashlib.sha1()
+        sha.update(self._kicadModTreeHash().encode('utf-8'))
+        sha.update(_sourceFile(footprint_function).encode('utf-8'))
+        sha.update(footprint_function.__name__.encode('utf-8'))
+        sha.update(json.dumps(parameters, sort_keys=True, default=repr).encode('utf-8'))
+        return sha.hexdigest()
+
+    def isUpToDate(self, key):
+        '''
+        check if all files generated for the given key still exist with the same content, and if the files the
+        generator depends on are unchanged
+        '''
+        try:
+            with io.open(self._entryPath(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return False
+
+        if 'dependencies' not in entry:
+            return False  # written by an older version
+        for filename, content_hash in entry['dependencies']:
+            if content_hash is None or self._dependencyHash(filename) != content_hash:
+                return False
+
+        for filename, content_hash in entry['files']:
+            try:
+                if _hashFile(filename) != content_hash:
+                    return False
+            except (IOError, OSError):
+                return False
+
+        return len(entry['files']) > 0
+
+    def store(self, key, filenames, dependencies=()):
+        '''
+        remember the current content of the files which were generated for the given key, and of the files the
+        generator depends on
+        '''
+        files = [[os.path.abspath(filename), _hashFile(filename)] for filename in filenames]
+        dependencies = [[filename, self._dependencyHash(filename)] for filename in sorted(set(dependencies))]
+
+        entry_path = self._entryPath(key)
+        if not os.path.isdir(os.path.dirname(entry_path)):
+            os.makedirs(os.path.dirname(entry_path))
+
+        with open(entry_path, 'w') as f:
+            json.dump({'files': files, 'dependencies': dependencies}, f)
+
+    def _entryPath(self, key):
+        return os.path.join(self.cache_dir, key[:2], '{}.json'.format(key))
+
+    def _dependencies(self, footprint_function):
+        '''
+        get the source files of all modules imported from the repository (except KicadModTree, which is part of the
+        key), and all files loaded through config_loader
+        '''
+        dependencies = config_loader.loadedFiles()
+
+        source_file = _sourceFile(footprint_function)
+        if os.path.isfile(source_file):
+            dependencies.append(source_file)
+
+        for module in list(sys.modules.values()):
+            filename = getattr(module, '__file__', None)
+            if not filename:
+                continue
+            filename = os.path.abspath(filename)
+            if filename.endswith(('.pyc', '.pyo')):
+                filename = filename[:-1]
+            if _isInDirectory(filename, REPOSITORY_DIR) and not _isInDirectory(filename, KICADMODTREE_DIR):
+                dependencies.append(filename)
+
+        return dependencies
+
+    def _dependencyHash(self, filename):
+        '''
+        hash of a file the generator depends on, those files are expected to be unchanged while the cache is used
+        '''
+        if filename not in self._dependency_hashes:
+            try:
+                self._dependency_hashes[filename] = _hashFile(filename)
+            except (IOError, OSError, TypeError):
+                self._dependency_hashes[filename] = None
+        return self._dependency_hashes[filename]
+
+    @classmethod
+    def _kicadModTreeHash(cls):
+        if cls._kicadmodtree_hash is None:
+            sources = []
+            for root, dirs, files in os.walk(KICADMODTREE_DIR):
+                dirs[:] = [d for d in dirs if d not in ('tests', 'benchmarks', 'examples')]
+                sources.extend(os.path.join(root, f) for f in files if f.endswith('.py'))
+            cls._kicadmodtree_hash = _hashSources(sources)
+        return cls._kicadmodtree_hash
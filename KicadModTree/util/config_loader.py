@@ -0,0 +1,125 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import os
+import hashlib
+import pickle
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+
+    try:
+        from yaml import CSafeLoader as YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader
+except ImportError:
+    YAML_AVAILABLE = False
+
+
+'''
+Parsed .yml files are kept as pickled data, keyed by path and modification time of the file. Every call returns a
+fresh copy, so callers are free to modify the returned data (like configuration.update(...)).
+
+When a cache directory is given (or set using the environment variable KICADMODTREE_CACHE), the pickled data is also
+stored on disk, which allows later processes to skip parsing the .yml file completely.
+'''
+
+CACHE_DIR_ENV = 'KICADMODTREE_CACHE'
+
+_parsed_files = {}
+
+
+def loadYaml(filename, cache_dir=None):
+    '''
+    return the content of a .yml file, parsed with the safe loader of pyyaml
+    '''
+    return pickle.loads(_loadPickled(filename, False, cache_dir))
+
+
+def loadYamlAll(filename, cache_dir=None):
+    '''
+    return a list of all documents in a .yml file, parsed with the safe loader of pyyaml
+    '''
+    return pickle.loads(_loadPickled(filename, True, cache_dir))
+
+
+def loadedFiles():
+    '''
+    return the paths of all files which were loaded in this process (used by BuildCache)
+    '''
+    return sorted(set(filename for filename, _ in _parsed_files))
+
+
+def _loadPickled(filename, all_documents, cache_dir):
+    if not YAML_AVAILABLE:
+        raise ImportError("pyyaml not available!")
+
+    filename = os.path.abspath(filename)
+    stat = os.stat(filename)
+    file_version = (stat.st_mtime, stat.st_size)
+    key = (filename, all_documents)
+
+    version, data = _parsed_files.get(key, (None, None))
+    if version == file_version:
+        return data
+
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV)
+
+    data = None
+    cache_file = None
+    if cache_dir:
+        cache_name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        cache_file = os.path.join(cache_dir, 'yaml', '{}.pickle'.format(cache_name))
+        data = _readCacheFile(cache_file, file_version)
+
+    if data is None:
+        with open(filename, 'r') as stream:
+            if all_documents:
+                data = list(yaml.load_all(stream, Loader=YamlLoader))
+            else:
+                data = yaml.load(stream, Loader=YamlLoader)
+        data = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+
+        if cache_file:
+            _writeCacheFile(cache_file, file_version, data)
+
+    _parsed_files[key] = (file_version, data)
+    return data
+
+
+def _readCacheFile(cache_file, file_version):
+    try:
+        with open(cache_file, 'rb') as f:
+            version, data = pickle.load(f)
+    except Exception:
+        return None  # missing or corrupt cache file
+
+    if tuple(version) != file_version:
+        return None
+    return data
+
+
+def _writeCacheFile(cache_file, file_version, data):
+    try:
+        if not os.path.isdir(os.path.dirname(cache_file)):
+            os.makedirs(os.path.dirname(cache_file))
+
+        # write into a temporary file first, so parallel processes never read half written files
+        temp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+        with open(temp_file, 'wb') as f:
+            pickle.dump((file_version, data), f, pickle.HIGHEST_PROTOCOL)
+        os.rename(temp_file, cache_file)
+    except (IOError, OSError):
+        pass  # the cache is only an optimization
@@ -0,0 +1,218 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import math
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+'''
+A transformation is stored as a flat tuple (a, b, c, d, tx, ty, rotation) which represents the 2D affine mapping
+
+    x' = a*x + b*y + tx
+    y' = c*x + d*y + ty
+
+together with the accumulated rotation (in degree) which has to be applied to rotatable nodes like Pad or Text.
+'''
+
+IDENTITY_TRANSFORMATION = (1., 0., 0., 1., 0., 0., 0)
+
+
+def translationTransformation(x, y):
+    '''
+    return transformation which moves a point by (x, y)
+    '''
+    return (1., 0., 0., 1., x, y, 0)
+
+
+def rotationTransformation(rotation):
+    '''
+    return transformation which rotates a point around the origin (angle in degree)
+    '''
+    phi = rotation*math.pi/180
+    cos_phi = math.cos(phi)
+    sin_phi = math.sin(phi)
+    return (cos_phi, sin_phi, -sin_phi, cos_phi, 0., 0., rotation)
+
+
+def composeTransformation(outer, inner):
+    '''
+    return transformation which first applies inner, and then outer
+    '''
+    oa, ob, oc, od, otx, oty, orot = outer
+    ia, ib, ic, id, itx, ity, irot = inner
+    return (oa*ia + ob*ic, oa*ib + ob*id,
+            oc*ia + od*ic, oc*ib + od*id,
+            oa*itx + ob*ity + otx, oc*itx + od*ity + oty,
+            orot + irot)
+
+
+def applyTransformation(transformation, x, y):
+    '''
+    return (x, y) tuple of the transformed point
+    '''
+    a, b, c, d, tx, ty, _ = transformation
+    return a*x + b*y + tx, c*x + d*y + ty
+
+
+def applyTransformationArray(transformation, coordinates):
+    '''
+    transform a whole list of (x, y) coordinates in one pass
+
+    When numpy is available, the coordinates are processed as (N,2) array and a numpy array is returned, otherwise
+    a list of (x, y) tuples is returned.
+    '''
+    a, b, c, d, tx, ty, _ = transformation
+
+    if NUMPY_AVAILABLE:
+        coordinates = numpy.asarray(coordinates, dtype=float).reshape(-1, 2)
+        if transformation is IDENTITY_TRANSFORMATION:
+            return coordinates.copy()
+        return coordinates.dot(numpy.array([[a, c], [b, d]])) + (tx, ty)
+
+    if transformation is IDENTITY_TRANSFORMATION:
+        return [(float(x), float(y)) for x, y in coordinates]
+    return [(a*x + b*y + tx, c*x + d*y + ty) for x, y in coordinates]
+
+
+'''
+A bounding box is stored as (min_x, min_y, max_x, max_y) tuple, an empty tuple means that there is no geometry.
+'''
+
+EMPTY_BOUNDING_BOX = ()
+
+
+def mergeBoundingBoxes(boxes):
+    '''
+    return the bounding box which encloses all given bounding boxes
+    '''
+    boxes = [box for box in boxes if box]
+    if not boxes:
+        return EMPTY_BOUNDING_BOX
+    if len(boxes) == 1:
+        return boxes[0]
+
+    return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+
+def pointsBoundingBox(points):
+    '''
+    return the bounding box of a list of (x, y) points
+    '''
+    if len(points) == 0:
+        return EMPTY_BOUNDING_BOX
+
+    xs = [float(x) for x, _ in points]
+    ys = [float(y) for _, y in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def rotatedRectExtents(width, height, rotation):
+    '''
+    return half width and half height of the bounding box of a centered rectangle which is rotated (angle in degree)
+    '''
+    phi = rotation*math.pi/180
+    cos_phi = abs(math.cos(phi))
+    sin_phi = abs(math.sin(phi))
+    return (cos_phi*width + sin_phi*height) / 2., (sin_phi*width + cos_phi*height) / 2.
+
+
+def arcBoundingBox(cx, cy, sx, sy, angle):
+    '''
+    return the bounding box of an arc given by center, start point and angle (in degree, like KiCad)
+
+    The extremes of the circle are only included when the arc passes them.
+    '''
+    radius = math.hypot(sx - cx, sy - cy)
+    if abs(angle) >= 360:
+        return cx - radius, cy - radius, cx + radius, cy + radius
+
+    start = math.degrees(math.atan2(sy - cy, sx - cx))
+    end = start + angle
+    points = [(sx, sy), (cx + radius*math.cos(math.radians(end)), cy + radius*math.sin(math.radians(end)))]
+    if end < start:
+        start, end = end, start
+
+    # quadrant points (0, 90, 180 and 270 degree) which are passed by the arc
+    quadrant = math.ceil(start / 90.)
+    while quadrant * 90 <= end:
+        direction = int(quadrant) % 4
+        points.append((cx + radius*(1, 0, -1, 0)[direction], cy + radius*(0, 1, 0, -1)[direction]))
+        quadrant += 1
+
+    return pointsBoundingBox(points)
+
+
+def rectUnionOutline(rects):
+    '''
+    return the outlines of the union of axis aligned rectangles, given as (min_x, min_y, max_x, max_y) tuples
+
+    Every outline is a list of (x, y) corner points, starting at its lowest corner. Separated rectangles result in
+    separated outlines.
+    '''
+    rects = [rect for rect in rects if rect]
+    xs = sorted(set([rect[0] for rect in rects] + [rect[2] for rect in rects]))
+    ys = sorted(set([rect[1] for rect in rects] + [rect[3] for rect in rects]))
+
+    def inside(i, j):
+        if i < 0 or j < 0 or i >= len(xs) - 1 or j >= len(ys) - 1:
+            return False
+        x = (xs[i] + xs[i + 1]) / 2.
+        y = (ys[j] + ys[j + 1]) / 2.
+        return any(rect[0] < x < rect[2] and rect[1] < y < rect[3] for rect in rects)
+
+    # directed boundary edges between grid indices, with the inside of the union on the same side of every edge
+    edges = {}
+    for i in range(len(xs) - 1):
+        for j in range(len(ys) - 1):
+            if not inside(i, j):
+                continue
+            if not inside(i, j - 1):
+                edges.setdefault((i, j), []).append((i + 1, j))
+            if not inside(i + 1, j):
+                edges.setdefault((i + 1, j), []).append((i + 1, j + 1))
+            if not inside(i, j + 1):
+                edges.setdefault((i + 1, j + 1), []).append((i, j + 1))
+            if not inside(i - 1, j):
+                edges.setdefault((i, j + 1), []).append((i, j))
+
+    outlines = []
+    while edges:
+        start = min(edges, key=lambda vertex: (vertex[1], vertex[0]))
+        loop = [start]
+        vertex = start
+        while True:
+            targets = edges[vertex]
+            next_vertex = targets.pop()
+            if not targets:
+                del edges[vertex]
+            if next_vertex == start:
+                break
+            loop.append(next_vertex)
+            vertex = next_vertex
+
+        # only keep the corners of the outline
+        corners = []
+        for k, (i, j) in enumerate(loop):
+            prev_i, prev_j = loop[k - 1]
+            next_i, next_j = loop[(k + 1) % len(loop)]
+            if prev_i == i == next_i or prev_j == j == next_j:
+                continue
+            corners.append((xs[i], ys[j]))
+        outlines.append(corners)
+
+    return outlines
@@ -0,0 +1,692 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+
+import bisect
+import math
+
+from KicadModTree.Point import Point2D
+from KicadModTree.nodes.base.Arc import Arc
+from KicadModTree.nodes.base.Circle import Circle
+from KicadModTree.nodes.base.Line import Line
+
+
+'''
+Keepout areas are built from two convex shapes: axis aligned rectangles and circles. A rounded rectangle is stored
+as union of two rectangles and four circles, which covers exactly the same area.
+
+Keepouts are closed areas: lines touching the border of a keepout are clipped at the touching point.
+
+Angles on circles and arcs are given in radians, following the parametrisation x + radius*sin(a), y + radius*cos(a).
+An Arc node with a positive angle is drawn into the direction of decreasing a.
+'''
+
+
+class _RectKeepout(object):
+    __slots__ = ('x0', 'x1', 'y0', 'y1')
+
+    def __init__(self, x0, x1, y0, y1):
+        self.x0, self.x1 = min(x0, x1), max(x0, x1)
+        self.y0, self.y1 = min(y0, y1), max(y0, y1)
+
+    def boundingBox(self):
+        return self.x0, self.x1, self.y0, self.y1
+
+    def contains(self, x, y):
+        return self.x0 <= x <= self.x1 and self.y0 <= y <= self.y1
+
+    def axisInterval(self, v, axis):
+        if axis == 0:
+            if self.y0 <= v <= self.y1:
+                return self.x0, self.x1
+        elif self.x0 <= v <= self.x1:
+            return self.y0, self.y1
+        return None
+
+    def lineInterval(self, x, y, dx, dy):
+        t0, t1 = -float('inf'), float('inf')
+        for d, low, high in ((dx, self.x0 - x, self.x1 - x), (dy, self.y0 - y, self.y1 - y)):
+            if d == 0:
+                if low > 0 or high < 0:
+                    return None
+                continue
+            low, high = low / float(d), high / float(d)
+            t0, t1 = max(t0, min(low, high)), min(t1, max(low, high))
+        return (t0, t1) if t0 <= t1 else None
+
+    def circleIntersections(self, x, y, radius):
+        angles = []
+        for ex in (self.x0, self.x1):
+            dx = ex - x
+            if abs(dx) <= radius:
+                dy = math.sqrt(radius * radius - dx * dx)
+                for py in (y - dy, y + dy):
+                    if self.y0 <= py <= self.y1:
+                        angles.append(math.atan2(dx, py - y))
+        for ey in (self.y0, self.y1):
+            dy = ey - y
+            if abs(dy) <= radius:
+                dx = math.sqrt(radius * radius - dy * dy)
+                for px in (x - dx, x + dx):
+                    if self.x0 <= px <= self.x1:
+                        angles.append(math.atan2(px - x, dy))
+        return angles
+
+
+class _CircleKeepout(object):
+    __slots__ = ('x', 'y', 'radius')
+
+    def __init__(self, x, y, radius):
+        self.x, self.y, self.radius = x, y, abs(radius)
+
+    def boundingBox(self):
+        return self.x - self.radius, self.x + self.radius, self.y - self.radius, self.y + self.radius
+
+    def contains(self, x, y):
+        return (x - self.x) ** 2 + (y - self.y) ** 2 <= self.radius ** 2
+
+    def axisInterval(self, v, axis):
+        center, distance = (self.x, v - self.y) if axis == 0 else (self.y, v - self.x)
+        if abs(distance) > self.radius:
+            return None
+        h = math.sqrt(self.radius ** 2 - distance ** 2)
+        return center - h, center + h
+
+    def lineInterval(self, x, y, dx, dy):
+        fx, fy = x - self.x, y - self.y
+        a = dx * dx + dy * dy
+        b = 2 * (dx * fx + dy * fy)
+        c = fx * fx + fy * fy - self.radius ** 2
+        discriminant = b * b - 4 * a * c
+        if a == 0 or discriminant < 0:
+            return None
+        root = math.sqrt(discriminant)
+        return (-b - root) / (2 * a), (-b + root) / (2 * a)
+
+    def circleIntersections(self, x, y, radius):
+        dx, dy = self.x - x, self.y - y
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance == 0 or distance > radius + self.radius or distance < abs(radius - self.radius):
+            return []
+
+        a = (radius ** 2 - self.radius ** 2 + distance ** 2) / (2 * distance)
+        h = math.sqrt(max(radius ** 2 - a ** 2, 0))
+        px, py = x + a * dx / distance, y + a * dy / distance
+        return [math.atan2(px + s * h * dy / distance - x, py - s * h * dx / distance - y) for s in (-1, 1)]
+
+
+# up to this number of intervals, subtracting them one after another is faster than sorting them first
+DIRECT_SUBTRACTION_LIMIT = 16
+
+
+def subtractIntervals(lines, intervals, separately=False):
+    '''
+    subtract the closed intervals [[k0, k1], ...] from the lines [[l0, l1], ...] (with l0 <= l1)
+
+    The parts come out in the order the generators always emitted them: the intervals are subtracted one after
+    another, and a line which is cut is removed and its remaining parts are appended to the end of the list. Larger
+    sets of intervals are sorted and merged once instead, and the parts of the single sweep over them are brought into
+    the same order afterwards.
+
+    :param separately: order the parts as if every line was clipped by a call of its own
+
+    :return: the remaining parts of the lines
+    '''
+    if len(intervals) > DIRECT_SUBTRACTION_LIMIT:
+        return _subtractSorted(lines, intervals, separately)
+    if separately:
+        return [part for line in lines for part in _subtractDirectly([line], intervals)]
+    return _subtractDirectly(lines, intervals)
+
+
+def _subtractDirectly(lines, intervals):
+    '''
+    subtract the intervals one after another, the original keepout algorithm
+    '''
+    lines = list(lines)
+    for k0, k1 in intervals:
+        for li in reversed(range(len(lines))):
+            l0, l1 = lines[li]
+            if l1 < k0 or l0 > k1:
+                continue
+            lines.pop(li)
+            if l0 < k0:
+                lines.append([l0, k0])
+            if l1 > k1:
+                lines.append([k1, l1])
+    return lines
+
+
+def _subtractSorted(lines, intervals, separately):
+    '''
+    subtract the intervals in a single sweep over the sorted and merged intervals, and order the parts like
+    _subtractDirectly does
+    '''
+    groups = []
+    for index in sorted(range(len(intervals)), key=intervals.__getitem__):
+        k0, k1 = intervals[index]
+        if groups and k0 <= groups[-1][1]:
+            group = groups[-1]
+            if k1 > group[1]:
+                group[1] = k1
+            group[2].append(index)
+        else:
+            groups.append([k0, k1, [index]])
+    ends = [group[1] for group in groups]
+
+    clipped = []  # (line, parts, gaps or None for lines which are not touched)
+    touched = False
+    for l0, l1 in lines:
+        g = bisect.bisect_left(ends, l0)
+        if g == len(groups) or groups[g][0] > l1:
+            clipped.append(((l0, l1), [[l0, l1]], None))
+            continue
+        if l0 == l1:
+            continue  # a single point inside of a keepout
+
+        touched = True
+        parts = []
+        gaps = []  # (number of parts left of the group, group)
+        pos = l0
+        while g < len(groups) and groups[g][0] <= l1 and pos < l1:
+            if groups[g][0] > pos:
+                parts.append([pos, groups[g][0]])
+            gaps.append((len(parts), groups[g]))
+            if groups[g][1] > pos:
+                pos = groups[g][1]
+            g += 1
+        if pos < l1:
+            parts.append([pos, l1])
+        if parts:
+            clipped.append(((l0, l1), parts, gaps))
+
+    if not touched or (len(clipped) == 1 and len(clipped[0][1]) == 1):
+        return [part for _, parts, _ in clipped for part in parts]  # already in order
+
+    if separately or len(clipped) == 1:
+        ordered = []
+        for line, parts, gaps in clipped:
+            if len(parts) == 1:
+                ordered += parts
+                continue
+            keys = _partKeys(line, parts, gaps, intervals)
+            ordered += [parts[position] for position in sorted(range(len(parts)), key=keys.__getitem__)]
+        return ordered
+
+    keys = []
+    for line_index, (line, parts, gaps) in enumerate(clipped):
+        for position, key in enumerate(_partKeys(line, parts, gaps, intervals)):
+            keys.append(key + [line_index, parts[position]])
+    keys.sort(key=lambda key: key[:3])
+    for previous, key in zip(keys, keys[1:]):
+        if previous[0] == key[0] != -1 and previous[2] != key[2]:
+            # different lines touched last by the same interval
+            return _restoreOrder(clipped, intervals)
+    return [key[3] for key in keys]
+
+
+def _partKeys(line, parts, gaps, intervals):
+    '''
+    sort keys which order the parts of a clipped line like the original keepout algorithm did
+
+    The original algorithm subtracted one interval after another from a list of lines, and appended the remaining
+    parts of every touched line to the end of the list. A part therefore ends up behind all parts which were touched
+    before it, and the last interval touching it is the one with the highest index which reaches its start (or end).
+    If this is the same interval for the two parts next to a gap, _tieOrder tells their order.
+
+    :param line: the line before clipping
+    :param parts: the remaining parts of the line
+    :param gaps: list of (number of parts left of a group of intervals, group), or None if the line was not touched
+
+    :return: list of [last interval, tie order] for every part
+    '''
+    if gaps is None:
+        return [[-1, 0]]
+
+    count = len(parts)
+    starts = [-1] * count  # last interval reaching the start of every part
+    ends = [-1] * count
+    for position, (k0, k1, indices) in gaps:
+        if position > 0:
+            ends[position - 1] = max(i for i in indices if intervals[i][0] == k0)
+        if position < count:
+            starts[position] = max(i for i in indices if intervals[i][1] == k1)
+
+    keys = [[max(starts[position], ends[position]), 0] for position in range(count)]
+    for position in range(1, count):
+        if ends[position - 1] == starts[position] == keys[position - 1][0] == keys[position][0]:
+            first = _tieOrder(line, parts, gaps, position, starts[position], intervals)
+            keys[position if first else position - 1][1] = 1
+    return keys
+
+
+def _tieOrder(line, parts, gaps, position, interval, intervals):
+    '''
+    True if the part left of the gap in front of parts[position] is emitted first, when both were touched last by the
+    same interval
+
+    Both parts were moved to the end of the list by this interval, from the end of the list first. The part which was
+    moved before by a later interval is therefore emitted first, and if this was again the same interval for both, the
+    order is the opposite of the order after that interval. The split of the gap itself leaves the left part first.
+    '''
+    offset = gaps[0][0]
+    split, lefts, rights = _gapEvents(line, len(parts), position, gaps[position - offset][1], intervals)
+    left_events = [split] + lefts
+    right_events = [split] + rights
+    if position - 1 - offset >= 0:
+        before = _gapEvents(line, len(parts), position - 1, gaps[position - 1 - offset][1], intervals)
+        left_events += [before[0]] + before[2]
+    if position + 1 - offset < len(gaps):
+        after = _gapEvents(line, len(parts), position + 1, gaps[position + 1 - offset][1], intervals)
+        right_events += [after[0]] + after[1]
+    left_events.sort()
+    right_events.sort()
+
+    bound = interval
+    reverse = False
+    while bound != split:
+        left = left_events[bisect.bisect_left(left_events, bound) - 1]
+        right = right_events[bisect.bisect_left(right_events, bound) - 1]
+        if left != right:
+            return (left > right) != reverse
+        bound = left
+        reverse = not reverse
+    return not reverse
+
+
+def _gapEvents(line, count, position, group, intervals):
+    '''
+    intervals touching the parts next to a gap: (interval splitting the line, intervals reaching the end of the left
+    part, intervals reaching the start of the right part), all in the order they are subtracted
+    '''
+    l0, l1 = line
+    if 0 < position < count:
+        members = sorted(group[2])
+        split = members.pop(0)
+        end, start = intervals[split]
+    else:
+        members = sorted(i for i in group[2] if intervals[i][1] >= l0 and intervals[i][0] <= l1)
+        split = -1
+        end, start = l1, l0
+
+    lefts, rights = [], []
+    for i in members:
+        k0, k1 = intervals[i]
+        if position > 0 and k0 <= end:
+            lefts.append(i)
+            end = k0
+        if position < count and k1 >= start:
+            rights.append(i)
+            start = k1
+    return split, lefts, rights
+
+
+class _PartRange(object):
+    __slots__ = ('parts', 'first', 'last')
+
+    def __init__(self, parts, first, last):
+        self.parts = parts
+        self.first = first
+        self.last = last
+
+
+def _restoreOrder(clipped, intervals):
+    '''
+    order the parts of clipped lines like the original keepout algorithm did
+
+    The original algorithm subtracted one interval after another from a list of lines: every line touching the
+    interval was removed, and its remaining parts were appended to the end of the list (lines at the end of the list
+    first, left part before right part). This is replayed here, but only for the lines which contain a final part.
+    Those are ranges of the final parts: a range is split by the first interval of a gap between two of its parts,
+    and touched again by a later interval of a gap at its ends which reaches the current end of the range.
+
+    :param clipped: list of (line, parts, gaps), see _subtractSorted
+    '''
+    split, left, right = 0, 1, 2
+    order = []
+    events = []
+    for line, parts, gaps in clipped:
+        count = len(parts)
+        line_range = _PartRange(parts, 0, count - 1)
+        order.append(line_range)
+        if gaps is None:
+            continue
+
+        ranges = [line_range] * count  # range of every part
+        for position, group in gaps:
+            interval, lefts, rights = _gapEvents(line, count, position, group, intervals)
+            if interval >= 0:
+                events.append((interval, split, position, ranges))
+            events += [(i, left, position, ranges) for i in lefts]
+            events += [(i, right, position, ranges) for i in rights]
+
+    events.sort(key=lambda event: event[0])
+    e = 0
+    while e < len(events):
+        i = events[e][0]
+        step = []
+        while e < len(events) and events[e][0] == i:
+            _, action, position, ranges = events[e]
+            touched = ranges[position - 1] if action == left else ranges[position]
+            step.append((order.index(touched), action, position, ranges))
+            e += 1
+        if len(step) > 1:
+            # all lines touched by the same interval are handled from the end of the list
+            step.sort(key=lambda item: item[0], reverse=True)
+
+        for index, action, position, ranges in step:
+            if action != split:
+                order.append(order.pop(index))
+                continue
+            touched = order.pop(index)
+            parts, first, last = touched.parts, touched.first, touched.last
+            left_range = _PartRange(parts, first, position - 1)
+            right_range = _PartRange(parts, position, last)
+            ranges[first:position] = [left_range] * (position - first)
+            ranges[position:last + 1] = [right_range] * (last - position + 1)
+            order.append(left_range)
+            order.append(right_range)
+
+    return [r.parts[r.first] for r in order]
+
+
+class KeepoutSet(object):
+    r"""A set of keepout areas, which is used to clip lines, arcs and circles
+
+    The keepouts are stored in a uniform grid (the cell size is the median size of the keepouts), so queries only
+    have to check the keepouts near the queried geometry.
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> from KicadModTree.util.keepout import KeepoutSet
+    >>> keepouts = KeepoutSet()
+    >>> keepouts.addRect([-1, -1], [1, 1])
+    >>> keepouts.addCircle([3, 0], 0.5)
+    >>> keepouts.clipNodes([Line(start=[-5, 0], end=[5, 0]), Circle(center=[0, 0], radius=1.2)])
+    """
+
+    # keepouts which would be added into more grid cells are checked on every query
+    MAX_CELLS_PER_KEEPOUT = 64
+
+    def __init__(self):
+        self.shapes = []
+        self._grid = None
+
+    @classmethod
+    def fromRects(cls, rects):
+        r"""create a KeepoutSet from a list of rectangles given as [[x0, x1, y0, y1], ...]
+        """
+        keepouts = cls()
+        for r in rects:
+            keepouts._addShape(_RectKeepout(r[0], r[1], r[2], r[3]))
+        return keepouts
+
+    def addRect(self, start, end):
+        r"""add a rectangular keepout, given by two opposite corners
+        """
+        start, end = Point2D(start), Point2D(end)
+        self._addShape(_RectKeepout(start.x, end.x, start.y, end.y))
+
+    def addCircle(self, center, radius):
+        r"""add a circular keepout
+        """
+        center = Point2D(center)
+        self._addShape(_CircleKeepout(center.x, center.y, radius))
+
+    def addRoundRect(self, start, end, radius):
+        r"""add a rectangular keepout with rounded corners (radius is limited to half of the smaller side)
+        """
+        start, end = Point2D(start), Point2D(end)
+        x0, x1 = min(start.x, end.x), max(start.x, end.x)
+        y0, y1 = min(start.y, end.y), max(start.y, end.y)
+        radius = min(abs(radius), (x1 - x0) / 2., (y1 - y0) / 2.)
+        if radius <= 0:
+            self._addShape(_RectKeepout(x0, x1, y0, y1))
+            return
+
+        self._addShape(_RectKeepout(x0 + radius, x1 - radius, y0, y1))
+        self._addShape(_RectKeepout(x0, x1, y0 + radius, y1 - radius))
+        for x in (x0 + radius, x1 - radius):
+            for y in (y0 + radius, y1 - radius):
+                self._addShape(_CircleKeepout(x, y, radius))
+
+    def _addShape(self, shape):
+        self.shapes.append(shape)
+        self._grid = None
+
+    def _buildIndex(self):
+        self._grid = {}
+        self._large_shapes = []
+        self._bounding_boxes = [s.boundingBox() for s in self.shapes]
+        if not self.shapes:
+            self._cell, self._origin_x, self._origin_y = 1., 0., 0.
+            return
+
+        self._origin_x = min(b[0] for b in self._bounding_boxes)
+        self._origin_y = min(b[2] for b in self._bounding_boxes)
+        sizes = sorted(max(b[1] - b[0], b[3] - b[2]) for b in self._bounding_boxes)
+        self._cell = max(sizes[len(sizes) // 2], 1e-3)
+
+        for i, b in enumerate(self._bounding_boxes):
+            ix0, ix1, iy0, iy1 = self._cellRange(*b)
+            if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > self.MAX_CELLS_PER_KEEPOUT:
+                self._large_shapes.append(i)
+                continue
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    self._grid.setdefault((ix, iy), []).append(i)
+
+    def _cellRange(self, x0, x1, y0, y1):
+        cell = self._cell
+        return (int(math.floor((x0 - self._origin_x) / cell)), int(math.floor((x1 - self._origin_x) / cell)),
+                int(math.floor((y0 - self._origin_y) / cell)), int(math.floor((y1 - self._origin_y) / cell)))
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def contains(self, x, y):
+        r"""check if the point (x, y) is inside of any keepout
+        """
+        if self._grid is None:
+            self._buildIndex()
+
+        ix, _, iy, _ = self._cellRange(x, x, y, y)
+        shapes = self.shapes
+        for i in self._grid.get((ix, iy), ()):
+            if shapes[i].contains(x, y):
+                return True
+        for i in self._large_shapes:
+            if shapes[i].contains(x, y):
+                return True
+        return False
+
+    def containsPoints(self, points):
+        r"""check a whole list of points [[x, y], ...] at once
+
+        :return: list of booleans, ``True`` for every point inside of any keepout
+        """
+        contains = self.contains
+        return [contains(x, y) for x, y in points]
+
+    def shapesOverlapping(self, x0, x1, y0, y1):
+        r"""get all keepout shapes (in the order they were added) whose bounding box overlaps the given area
+        """
+        if self._grid is None:
+            self._buildIndex()
+
+        ix0, ix1, iy0, iy1 = self._cellRange(x0, x1, y0, y1)
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(self.shapes):
+            indices = range(len(self.shapes))
+        else:
+            indices = set(self._large_shapes)
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    indices.update(self._grid.get((ix, iy), ()))
+            indices = sorted(indices)
+
+        boxes = self._bounding_boxes
+        return [self.shapes[i] for i in indices
+                if boxes[i][0] <= x1 and boxes[i][1] >= x0 and boxes[i][2] <= y1 and boxes[i][3] >= y0]
+
+    def clipAxisLines(self, lines, v, axis, separately=False):
+        r"""clip lines which are parallel to an axis
+
+        :param lines: list of [start, end] coordinates along the axis
+        :param v: coordinate of the lines on the other axis
+        :param axis: 0 for horizontal lines at y=v, 1 for vertical lines at x=v
+        :param separately: order the visible parts as if every line was clipped on its own (see subtractIntervals)
+
+        :return: the visible parts of the lines, as list of [start, end] with start <= end
+        """
+        lines = [[min(l0, l1), max(l0, l1)] for l0, l1 in lines]
+        if not lines:
+            return []
+
+        low, high = min(l[0] for l in lines), max(l[1] for l in lines)
+        area = (low, high, v, v) if axis == 0 else (v, v, low, high)
+
+        intervals = []
+        for shape in self.shapesOverlapping(*area):
+            interval = shape.axisInterval(v, axis)
+            if interval is not None:
+                intervals.append(interval)
+        return subtractIntervals(lines, intervals, separately)
+
+    def clipLine(self, start, end):
+        r"""clip an arbitrary line
+
+        :return: the visible parts of the line, as list of [start, end] tuples in the direction of the line
+        """
+        (x0, y0), (x1, y1) = start, end
+        if y0 == y1:
+            parts = sorted(self.clipAxisLines([[x0, x1]], y0, 0))
+            if x0 > x1:
+                return [((p[1], y0), (p[0], y0)) for p in reversed(parts)]
+            return [((p[0], y0), (p[1], y0)) for p in parts]
+        if x0 == x1:
+            parts = sorted(self.clipAxisLines([[y0, y1]], x0, 1))
+            if y0 > y1:
+                return [((x0, p[1]), (x0, p[0])) for p in reversed(parts)]
+            return [((x0, p[0]), (x0, p[1])) for p in parts]
+
+        dx, dy = x1 - x0, y1 - y0
+        intervals = []
+        for shape in self.shapesOverlapping(min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)):
+            interval = shape.lineInterval(x0, y0, dx, dy)
+            if interval is not None:
+                intervals.append(interval)
+
+        parts = sorted(subtractIntervals([[0., 1.]], intervals))
+        return [((x0 + t0 * dx, y0 + t0 * dy), (x0 + t1 * dx, y0 + t1 * dy)) if (t0, t1) != (0., 1.) else (start, end)
+                for t0, t1 in parts]
+
+    def visibleCircleIntervals(self, x, y, radius, amin, amax):
+        r"""get the parts of a circle which are outside of all keepouts
+
+        :return: list of visible intervals [[a0, a1], ...] between amin and amax (see module description for the
+                 parametrisation)
+        """
+        angles = [amin, amax]
+        for shape in self.shapesOverlapping(x - radius, x + radius, y - radius, y + radius):
+            for a in shape.circleIntersections(x, y, radius):
+                a = amin + (a - amin) % (2 * math.pi)
+                while a < amax:
+                    angles.append(a)
+                    a = a + 2 * math.pi
+        angles.sort()
+
+        intervals = []
+        for a0, a1 in zip(angles[:-1], angles[1:]):
+            if a1 <= a0:
+                continue
+            a = (a0 + a1) / 2
+            if self.contains(x + radius * math.sin(a), y + radius * math.cos(a)):
+                continue
+            if intervals and intervals[-1][1] == a0:
+                intervals[-1][1] = a1
+            else:
+                intervals.append([a0, a1])
+        return intervals
+
+    def clipNode(self, node):
+        r"""clip a Line, Arc or Circle node
+
+        :return: list of nodes representing the visible parts. Nodes of other types are returned unchanged.
+        """
+        if isinstance(node, Line):
+            parts = self.clipLine((node.start_pos.x, node.start_pos.y), (node.end_pos.x, node.end_pos.y))
+            if len(parts) == 1 and parts[0] == ((node.start_pos.x, node.start_pos.y),
+                                                (node.end_pos.x, node.end_pos.y)):
+                return [node]
+            return [Line(start=s, end=e, layer=node.layer, width=node.width) for s, e in parts]
+
+        if isinstance(node, Circle):
+            center = node.center_pos
+            intervals = self.visibleCircleIntervals(center.x, center.y, node.radius, 0, 2 * math.pi)
+            if intervals == [[0, 2 * math.pi]]:
+                return [node]
+
+            # join the visible parts before and after angle 0
+            if len(intervals) > 1 and intervals[0][0] == 0 and intervals[-1][1] == 2 * math.pi:
+                intervals[-1][1] = intervals.pop(0)[1] + 2 * math.pi
+            return [self._arcNode(center, node.radius, a0, a1, node) for a0, a1 in intervals]
+
+        if isinstance(node, Arc):
+            center = node.center_pos
+            radius = math.hypot(node.start_pos.x - center.x, node.start_pos.y - center.y)
+            astart = math.atan2(node.start_pos.x - center.x, node.start_pos.y - center.y)
+            aend = astart - math.radians(node.angle)
+            amin, amax = min(astart, aend), max(astart, aend)
+
+            intervals = self.visibleCircleIntervals(center.x, center.y, radius, amin, amax)
+            if intervals == [[amin, amax]]:
+                return [node]
+            if node.angle > 0:
+                return [self._arcNode(center, radius, a1, a0, node) for a0, a1 in reversed(intervals)]
+            return [self._arcNode(center, radius, a0, a1, node) for a0, a1 in intervals]
+
+        return [node]
+
+    def clipNodes(self, nodes):
+        r"""clip a list of nodes (see clipNode)
+
+        :return: list of nodes representing the visible parts
+        """
+        result = []
+        for node in nodes:
+            result.extend(self.clipNode(node))
+        return result
+
+    @staticmethod
+    def _arcNode(center, radius, a0, a1, node):
+        start = (center.x + radius * math.sin(a0), center.y + radius * math.cos(a0))
+        return Arc(center=center, start=start, angle=-math.degrees(a1 - a0), layer=node.layer, width=node.width)
+
+
+_cached_keepout_sets = {}
+
+
+def cachedKeepoutSet(rects, factory=KeepoutSet.fromRects):
+    '''
+    return factory(rects) for a list of rectangles [[x0, x1, y0, y1], ...]
+
+    The generator scripts pass the same list of keepouts to every drawing call. As long as the same, unchanged list is
+    given, the KeepoutSet (and its index) of the previous call is reused.
+    '''
+    last_rects, last_copy, last_set = _cached_keepout_sets.get(factory, (None, None, None))
+    if last_rects is rects and last_copy == rects:
+        return last_set
+
+    keepout_set = factory(rects)
+    _cached_keepout_sets[factory] = (rects, [list(r) for r in rects], keepout_set)
+    return keepout_set
@@ -17,6 +17,14 @@ import time
 import re
 
 
+_LISP_QUOTE_REQUIRED = re.compile(r'[\s()"\\]')
+
+# a token is either a quoted string, a bracket or a symbol. A single quotation mark is only matched when the string
+# is not closed.
+_LISP_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[()]|[^\s()"]+|"')
+_LISP_ESCAPE = re.compile(r'\\(.)')
+
+
 def formatFloat(val):
     '''
     return well formated float
@@ -24,90 +32,111 @@ def formatFloat(val):
     return ('%f' % val).rstrip('0').rstrip('.')
 
 
-def lispString(string):
+'''
+number of nanometres (the internal unit of KiCad) per millimetre
+'''
+NANOMETRES_PER_MILLIMETRE = 1000000
+
+
+def toNanometres(val):
     '''
-    add quotation marks to string, when it include a white space or is empty
+    convert millimetres into integer nanometres, this is the only place where coordinates are rounded
+
+    The value is rounded to six decimals exactly like formatFloat does. The product val * 1e6 is rounded itself, by
+    less than 1e-6 for values below one metre. Only when it is closer than that to halfway between two nanometres,
+    like 63.2276645 * 1e6 = 63227664.5 (while '%f' gives 63.227665), the decimal representation decides.
     '''
-    if type(string) is not str:
-        string = str(string)
+    scaled = val * NANOMETRES_PER_MILLIMETRE
+    nanometres = int(round(scaled))
+    if abs(abs(scaled - nanometres) - 0.5) > 1e-6 and -1e9 < scaled < 1e9:
+        return nanometres
+    return int(('%f' % val).replace('.', ''))
 
-    if len(string) == 0 or re.match(".*\s.*", string):
-        return '"{}"'.format(string.replace('"', '\\"'))  # escape text
 
-    return string
+def formatNanometres(val):
+    '''
+    return integer nanometres as millimetres, formatted like formatFloat but without any floating point arithmetic
+    '''
+    if val < 0:
+        digits = '%07d' % -val
+        sign = '-'
+    else:
+        digits = '%07d' % val
+        sign = ''
 
+    fraction = digits[-6:].rstrip('0')
+    if fraction:
+        return sign + digits[:-6] + '.' + fraction
+    return sign + digits[:-6]
 
-def lispTokenizer(input):
+
+class FormattedNumber(str):
     '''
-    Convert a string of characters into a list of tokens.
+    number which is already formatted, SexprSerializer writes it as it is
     '''
-    input = input.replace('(', ' ( ').replace(')', ' ) ')
+    __slots__ = ()
 
-    # split input, including whitespaces
-    base_tokens = re.split(r'(\s+)', input)
 
-    tokens = []
-    in_string = False
+def lispString(string):
+    '''
+    add quotation marks to string, when it include a white space, brackets or is empty
+    '''
+    if type(string) is not str:
+        string = str(string)
 
-    for token in base_tokens:
-        if not in_string and token.isspace():
-            continue
+    if len(string) == 0 or _LISP_QUOTE_REQUIRED.search(string):
+        return '"{}"'.format(string.replace('\\', '\\\\').replace('"', '\\"'))  # escape text
 
-        if len(token) == 0:
-            continue
+    return string
 
-        if token[0] == '"':
-            if in_string:
-                tokens[-1] += token[1:]
-                in_string = False
-            else:
-                tokens.append(token[1:])
-                in_string = True
 
-        elif token[-1] == '"':
-            if in_string:
-                tokens[-1] += token[:-1]
-                in_string = False
-            else:
-                tokens.append(token[:-1])
-                in_string = True
+def _lispUnquote(token):
+    if token == '"':
+        raise RuntimeError("missing closing quotation mark")
 
-        else:
-            if in_string:
-                tokens[-1] += token
-            else:
-                tokens.append(token)
+    token = token[1:-1]
+    if '\\' in token:
+        token = _LISP_ESCAPE.sub(r'\1', token)
+
+    return token
 
-    if in_string:
-        raise RuntimeError("missing closing quotation mark")
 
-    # TOOD: remove invalid spaces from quotation (when having brackets inside)
+def lispTokenizer(input):
+    '''
+    Convert a string of characters into a list of tokens.
 
-    return tokens
+    Quoted strings are returned without quotation marks and with resolved escape sequences.
+    '''
+    return [_lispUnquote(token) if token[0] == '"' else token for token in _LISP_TOKEN.findall(input)]
 
 
 def parseLispString(input):
+    '''
+    Parse a string in sexpr syntax into nested lists of strings
+    '''
     syntax_tree = []
     current_node = syntax_tree
-    scope = [syntax_tree]
+    scope = []
 
-    for token in lispTokenizer(input):
+    for token in _LISP_TOKEN.findall(input):
         if token == "(":
-            scope.append([])
-            current_node.append(scope[-1])
-            current_node = scope[-1]
+            new_node = []
+            current_node.append(new_node)
+            scope.append(current_node)
+            current_node = new_node
 
         elif token == ")":
-            if len(scope) <= 1:
+            if not scope:
                 raise RuntimeError("missing opening brackets")
+            current_node = scope.pop()
 
-            scope.pop()
-            current_node = scope[-1]
+        elif token[0] == '"':
+            current_node.append(_lispUnquote(token))
 
         else:
             current_node.append(token)
 
-    if len(scope) > 1:
+    if scope:
         raise RuntimeError("missing closing brackets")
 
     if len(syntax_tree) == 1:
@@ -137,6 +166,8 @@ class SexprSerializer(object):
             return formatFloat(primitive)
         elif pType is str:
             return lispString(primitive)
+        elif pType is FormattedNumber:
+            return primitive
         else:
             raise RuntimeError("unexpected type: {}".format(pType))
 
@@ -144,43 +175,65 @@ class SexprSerializer(object):
         if prefix is None:
             prefix = ""
 
-        serial_string = "("
+        buffer = []
+        self._write_sexpr(buffer.append, sexpr, "\n" + prefix)
+        return "".join(buffer)
 
-        # see: https://stackoverflow.com/questions/3190706/nonlocal-keyword-in-python-2-x
-        loop_ctrl = {'first': True, 'indentation': False}
+    def write(self, stream):
+        '''
+        Write the sexpr into a file like object, without creating the whole string in memory
 
-        def get_separator():
-            if loop_ctrl['first']:
-                loop_ctrl['first'] = False
-                return_str = ""
-            else:
-                return_str = " "
+        Every item of the top level expression is joined into one string, so the stream is not called for every
+        single token.
+
+        :param stream: object with a write method, like a opened file or ``io.StringIO``
+        '''
+        buffer = []
 
-            if loop_ctrl['indentation']:
-                return_str += " "
-                loop_ctrl['indentation'] = False
+        def flush():
+            stream.write("".join(buffer))
+            del buffer[:]
 
-            return return_str
+        self._write_sexpr(buffer.append, self.sexpr, "\n", flush)
 
-        for attr in sexpr:
-            if isinstance(attr, (tuple, list)):
-                return_string = self.sexpr_to_string(attr, prefix + " ")
+    def _write_sexpr(self, write, sexpr, new_line, flush=None):
+        '''
+        :param write: function which is called for every token
+        :param sexpr: list (or any iterable) which is written as sexpr
+        :param new_line: line break including the indentation of this nesting level
+        :param flush: function which is called after every item of this expression
+        '''
+        write("(")
+
+        first = True
+        indentation = False
 
-                if loop_ctrl['indentation']:
-                    return_string = return_string.replace('\n', '\n ')
-                serial_string += get_separator()
+        for attr in sexpr:
+            if attr is SexprSerializer.NEW_LINE:
+                write(new_line)
+                indentation = True
+                continue
+
+            # items following a line break are indented by one additional space
+            if first:
+                first = False
+                separator = " " if indentation else ""
+            else:
+                separator = "  " if indentation else " "
 
-                serial_string += return_string
-            elif attr == SexprSerializer.NEW_LINE:
-                serial_string += "\n"
-                serial_string += prefix
-                loop_ctrl['indentation'] = True
+            write(separator)
+            if isinstance(attr, (tuple, list)):
+                self._write_sexpr(write, attr, new_line + ("  " if indentation else " "))
             else:
-                serial_string += get_separator()
-                serial_string += self.primitive_to_string(attr)
+                write(self.primitive_to_string(attr))
 
-        serial_string += ")"
-        return serial_string
+            indentation = False
+            if flush is not None:
+                flush()
+
+        write(")")
+        if flush is not None:
+            flush()
 
     def __str__(self):
         '''
@@ -190,8 +243,10 @@ class SexprSerializer(object):
 
 
 def parseTimestamp(timestamp):
-    raise NotImplemented()
-    return time.time()  # TOOD
+    '''
+    return the unix timestamp which is stored as hex string, like formatTimestamp produces it
+    '''
+    return int(timestamp, 16)
 
 
 def formatTimestamp(timestamp=None):
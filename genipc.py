@@ -77,10 +77,7 @@ def gen_bga(code):
 	#kicad_mod.append(RectLine(start=[-GX/2, -GY/2], end=[GX/2, GY/2], layer='F.CrtYd'))
 
 	# create pads
-	for ypin in range(1, ball_row):
-		for xpin in range(1, ball_col):
-			pin_name = chr(ord('A')+ypin-1) + str(xpin);
-			kicad_mod.append(Pad(number=pin_name, type=Pad.TYPE_SMT, shape=Pad.SHAPE_CIRCLE, at=[xbase + xpin * pitch, ybase + ypin * pitch], size=[pad_diameter, pad_diameter], layers=Pad.LAYERS_SMT, solder_mask_margin=0.05));
+	kicad_mod.append(PadGrid(rows=ball_row, columns=ball_col, spacing=pitch, center=[0, 0], type=Pad.TYPE_SMT, shape=Pad.SHAPE_CIRCLE, size=[pad_diameter, pad_diameter], layers=Pad.LAYERS_SMT, solder_mask_margin=0.05));
 
 	# add model
 	#kicad_mod.append(Model(filename="example.3dshapes/example_footprint.wrl",
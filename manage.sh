@@ -43,6 +43,15 @@ py_test_coverage() {
     PYTHONPATH=`pwd` python -m nose2 -C --coverage "$KICADMODTREE_DIR" --coverage-report term-missing -s "$KICADMODTREE_DIR/tests"
 }
 
+benchmarks() {
+    echo ''
+    echo '[!] Running benchmarks'
+    for benchmark in "$KICADMODTREE_DIR"/benchmarks/*_benchmark.py; do
+        echo "$(basename "$benchmark")"
+        python "$benchmark"
+    done
+}
+
 tests() {
     set -e
     unit_tests
@@ -64,6 +73,7 @@ Commands
     flake8_check         - flake8 validation
     unit_tests           - Run unit tests
     py_test_coverage     - Unit test coverage
+    benchmarks           - Run performance benchmarks
     tests                - Run all tests
     update_packages      - Check & update production dependency changes
     update_dev_packages  - Check & update development and production dependency changes
@@ -34,12 +34,8 @@
 
 #
 # NOTE:
-# The code for the the Keepout class is loosely based on code from drawing_tools.py
-# Currently oval and rectangular keepout zones are respected
-# for horizontal and vertical lines, only basic support (bounding box only) for diagonal lines.
-# Arcs and circles are not yet handled. On TODO: list.
-# More testing needs to be done for edge cases, such as for lines inside
-# the bounding box but outside the keepout area proper.
+# The Keepout class uses the keepout engine of KicadModTree (KicadModTree.util.keepout),
+# oval and rectangular keepout zones are respected for lines in any direction.
 #
 
 # 2017-11-25
@@ -56,6 +52,7 @@ from KicadModTree import Point
 from KicadModTree.nodes.base import Line, Arc, Circle, Text, Pad
 from KicadModTree.nodes.specialized import RectFill
 from KicadModTree.util.kicad_util import formatFloat
+from KicadModTree.util.keepout import KeepoutSet
 
 class Layer:
 
@@ -441,186 +438,13 @@ _RectWH = namedtuple("_RectWH", [
     'width'
 ])
 
-class _Point: 
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-    def __repr__(self):
-        return "(x={x}, y={y})".format(x=formatFloat(self.x), y=formatFloat(self.y))
-        
-class _Line: 
-    def __init__(self, a, b, x1=None, y1=None, normalize=False):
-        if x1 == None and y1 == None:
-            self._add_points(a, b, normalize)
-        else:    
-            self._add_points(_Point(a, b), _Point(x1, y1), normalize)
-
-    def _add_points(self, a, b, normalize):
-        if normalize:  
-            self.x0 = round(min(a.x, b.x), 8)
-            self.x1 = round(max(a.x, b.x), 8)
-            self.y0 = round(min(a.y, b.y), 8)
-            self.y1 = round(max(a.y, b.y), 8)
-        elif a.y < b.y:
-            self.x0 = a.x
-            self.x1 = b.x
-            self.y0 = a.y
-            self.y1 = b.y           
-        else:
-            self.x0 = b.x
-            self.x1 = a.x
-            self.y0 = b.y
-            self.y1 = a.y           
-
-    def __repr__(self):
-        return "(x0={x0}, y0={y0}, x1={x1}, y1={y1})".format(x0=formatFloat(self.x0), y0=formatFloat(self.y0),
-                                                             x1=formatFloat(self.x1), y1=formatFloat(self.y1))
-
 class _Keepout:
-    def __init__(self, a, b, x1=None, y1=None, radius=0.0):
-        self.lines = []
+    def __init__(self, x0, y0, x1, y1, radius=0.0):
+        self.x0 = round(min(x0, x1), 5)
+        self.x1 = round(max(x0, x1), 5)
+        self.y0 = round(min(y0, y1), 5)
+        self.y1 = round(max(y0, y1), 5)
         self.radius = radius
-        if x1 == None and y1 == None:
-            self._add_points(a, b)
-        else:    
-            self._add_points(_Point(a, b), _Point(x1, y1))
-
-    def _add_points(self, a, b):        
-        self.x0 = round(min(a.x, b.x), 5)
-        self.x1 = round(max(a.x, b.x), 5)
-        self.y0 = round(min(a.y, b.y), 5)
-        self.y1 = round(max(a.y, b.y), 5)
-
-    def pointIsInside(self, x, y):
-        x = round(x, 5); y = round(y, 5)
-        return x >= self.x0 and x <= self.x1 and y >= self.y0 and y <= self.y1
-
-    def _feq(self, a, b):
-        return abs(a-b) < 0.0001
-    
-    def _bbox_overlap(self, bbox):
-        x0 = min(bbox.x0, bbox.x1)
-        x1 = max(bbox.x0, bbox.x1)
-        y0 = min(bbox.y0, bbox.y1)
-        y1 = max(bbox.y0, bbox.y1)
-        return not (self.x0 < x1 and self.x1 > x0 and self.y0 > y1 and self.y1 < y0)
-
-    def lineIntersects(self, l):
-        
-        # skip proccesing if line bounding box is completely outside keepout bounding box
-        if not self._bbox_overlap(l):
-            return False
-    
-        points = []
-  
-        # get lines representing keepout bounding box
-        if len(self.lines) == 0:
-            self.lines.append(_Line(self.x0, self.y0, self.x1, self.y0))
-            self.lines.append(_Line(self.x1, self.y0, self.x1, self.y1))
-            self.lines.append(_Line(self.x0, self.y1, self.x1, self.y1))
-            self.lines.append(_Line(self.x0, self.y0, self.x0, self.y1))
-        
-        # find and return intersecting points
-        a1 = l.y1 - l.y0
-        b1 = l.x0 - l.x1
-        lr = l.x1 > l.x0
-
-        i = 0
-
-        for k in self.lines:
-            a2 = k.y1 - k.y0
-            b2 = k.x0 - k.x1
-            d = a1 * b2 - a2 * b1
-                    
-            if d != 0.0:
-                c2 = a2 * k.x0 + b2 * k.y0;
-                c1 = a1 * l.x0 + b1 * l.y0
-                xp = (b2 * c1 - b1 * c2) / d
-                yp = (a1 * c2 - a2 * c1) / d
-  
-                ka = (xp >= l.x0 and xp <= l.x1) if lr else (xp <= l.x0 and xp >= l.x1)
-                kb = self._feq(xp, k.x0) if k.x0 == k.x1 else self._feq(yp, k.y0)
-
-                if ka and kb and self.pointIsInside(xp, yp):
-                    if lr and (i == 0 or i == 3):
-                        points.insert(0, [xp, yp, i])
-                    else:
-                        points.append([xp, yp, i])
-            i += 1       
-
-        return False if len(points) == 0 else points
-
-    def HlineIntersects(self, y):
-        return y > self.y0 and y < self.y1
-
-    def VlineIntersects(self, x):
-        return round(x, 8) > self.x0 and round(x, 8) < self.x1
-
-    def _HLineTrim(self, y, r):
-        h = (self.y0 + r - y if y < self.y0 + r else y - self.y1 + r)
-        return r - math.sqrt(r * r - h * h)
-        
-    def _VLineTrim(self, x, r):
-        h = (self.x0 + r - x if x < self.x0 + r else x - self.x1 + r)
-        return r - math.sqrt(r * r - h * h)
-
-    def HLineTrim(self, l):
-
-        line = _Line(l[0], l[1], l[2], l[3], normalize=True)
-
-        # check if line is outside rectangular bounding box and exit if so
-        if line.x1 < self.x0 or line.x0 > self.x1:
-            return False
-
-        # check if line completely inside rectangular bounding box and exit with no segments if so
-        if self.radius == 0.0 and line.x0 >= self.x0 and line.x1 <= self.x1:
-            return []
-
-        r = self.radius
-        segments = []
-
-        if r == 0.0 or (line.y0 >= self.y0 + r and line.y0 <= self.y1 - r):
-            if line.x0 < self.x0:
-                segments.append([line.x0, line.y0, self.x0, line.y1])
-            if line.x1 > self.x1:
-                segments.append([self.x1, line.y0, line.x1, line.y1])
-        elif line.x1 > self.x0 and line.x0 < self.x1:
-            h = self._HLineTrim(line.y0, r) 
-            if line.x0 < self.x0 + r:
-                segments.append([line.x0, line.y0, min(line.x1, self.x0 + h), line.y1])
-            if line.x1 > self.x1 - r:
-                segments.append([max(line.x0, self.x1 - h), line.y0, line.x1, line.y1])
-        return False if len(segments) == 0 else segments
-
-    def VLineTrim(self, l):
-
-        line = _Line(l[0], l[1], l[2], l[3], normalize=True)
-
-        # check if line is outside
-        if line.y1 <= self.y0 or line.y0 >= self.y1:
-            return False
-
-        # check if line completely inside rectangular bounding box and exit with no segments if so
-        if self.radius == 0.0 and line.y0 >= self.y0 and line.y1 <= self.y1:
-            return []
-
-        r = self.radius
-        segments = []
-
-        if r == 0.0 or (line.x0 >= self.x0 + r and line.x0 <= self.x1 - r):
-            if line.y0 < self.y0:
-                segments.append([line.x0, line.y0, line.x1, self.y0])
-            if line.y1 > self.y1:
-                segments.append([line.x0, self.y1, line.x1, line.y1])
-        elif line.y1 > self.y0 and line.y0 < self.y1:
-            h = self._VLineTrim(line.x0, r) 
-            if line.y0 < self.y0 + r:
-                segments.append([line.x0, line.y0, line.x1, min(line.y1, self.y0 + h)])
-            if line.y1 > self.y1 - r:
-                segments.append([line.x0, max(self.y1 - h, line.y0), line.x1, line.y1])
-
-        return False if len(segments) == 0 else segments
 
     def __repr__(self):
         return "(x0={x0}, y0={y0}, x1={x1}, y1={y1}, r={r})".format(x0=formatFloat(self.x0), y0=formatFloat(self.y0),
@@ -636,6 +460,7 @@ class Keepout():
     def __init__(self, layer):
         self.layer = layer
         self.keepouts = []
+        self.keepout_set = KeepoutSet()
         self.min_length = 0.01
         layer.keepout = self
 
@@ -656,7 +481,9 @@ class Keepout():
         return self.layer._align(value)
 
     def _add(self, x0, y0, x1, y1, radius=0.0):
-        self.keepouts.append(_Keepout(self._align(x0), self._align(y0), self._align(x1), self._align(y1), radius))
+        keepout = _Keepout(self._align(x0), self._align(y0), self._align(x1), self._align(y1), radius)
+        self.keepouts.append(keepout)
+        self.keepout_set.addRoundRect([keepout.x0, keepout.y0], [keepout.x1, keepout.y1], keepout.radius)
 
     # add keepout area for rectangle
     def addRect(self, x, y, w, h, offset=None):
@@ -680,84 +507,36 @@ class Keepout():
         return self
     
     def addPads(self):
-        nodes = self.layer.footprint.getNormalChilds()
         offset = self.offset
-        for node in nodes:
-            if isinstance(node, Pad):
-                if node.shape == Pad.SHAPE_RECT:
-                    self.addRect(node.at.x, node.at.y, node.size.x, node.size.y, offset)
-                else:
-                    self.addRound(node.at.x, node.at.y, node.size.x, node.size.y, offset)
+        for node, _ in self.layer.footprint.walk(type=Pad):
+            at = node.getRealPosition(node.at)
+            if node.shape == Pad.SHAPE_RECT:
+                self.addRect(at.x, at.y, node.size.x, node.size.y, offset)
+            else:
+                self.addRound(at.x, at.y, node.size.x, node.size.y, offset)
 
     def getPadBB(self, number):
-        # TODO: use node.calculateBoundingBox when implemented, this is a simple version that does not honor any rotation
-        nodes = self.layer.footprint.getNormalChilds()
         offset = self.offset * 2.0
         bb = None
-        for node in nodes:
-            if isinstance(node, Pad) and node.number == number:
-                bb = _RectWH(x = node.at.x, y = node.at.y, width = node.size.x + offset, height = node.size.y + offset)
+        for node, _ in self.layer.footprint.walk(type=Pad):
+            if node.number == number:
+                pad_bb = node.calculateBoundingBox()
+                bb = _RectWH(x = (pad_bb['min'].x + pad_bb['max'].x) / 2.0, y = (pad_bb['min'].y + pad_bb['max'].y) / 2.0,
+                             width = pad_bb['max'].x - pad_bb['min'].x + offset, height = pad_bb['max'].y - pad_bb['min'].y + offset)
         return bb
 
-    # internal method for keepout-processing
-    def _processHVLine(self, line):
-        
-        def add_segment(x0, y0, x1, y1):
-            length = x1 - x0 + y1 - y0 
-            if length >= self.min_length:
-                segments.append([x0, y0, x1, y1])
-
-        vertical = line.x0 == line.x1
-        segments = [[line.x0, line.y0, line.x1, line.y1]]
-
-        if self.DEBUG & 2:
-            print "S", line
+    # split an arbitrary line so it does not interfere with the keepout areas
+    def processLine(self, x0, y0, x1, y1):
 
-        changes = len(self.keepouts) > 0
-        while changes != False:
-            changes = False
-            for keepout in self.keepouts:
-                if keepout.VlineIntersects(line.x0) if vertical else keepout.HlineIntersects(line.y0):
-                    for i in reversed(range(0, len(segments))):
-                        segment = segments[i]
-                        changes = keepout.VLineTrim(segment) if vertical else keepout.HLineTrim(segment)
-                        if changes != False:
-                            segments.pop(i)
-                            for segment in changes:
-                                add_segment(segment[0], segment[1], segment[2], segment[3])
-                            
-                        if self.DEBUG & 2:
-                            print "CHOP - line:", segment[0], segment[1], segment[2], segment[3], "keepout:", keepout
-
-            if changes != False:
-                break
+        segments = []
+        for start, end in self.keepout_set.clipLine((x0, y0), (x1, y1)):
+            if abs(end[0] - start[0]) + abs(end[1] - start[1]) >= self.min_length:
+                segments.append([start[0], start[1], end[0], end[1]])
 
         if self.DEBUG & 2:
-            print "LI", segments    
+            print("LI {}".format(segments))
 
         return segments
-    
-    # split an arbitrary line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
-    def processLine(self, x0, y0, x1, y1):
-
-        line = _Line(x0, y0, x1, y1, normalize=True)
-
-        if line.x0 == line.x1 or line.y0 == line.y1: # use simpler and faster algorithm for horizontal and vertical lines
-            return self._processHVLine(line)
-    
-        # TODO: update to handle keepout area proper, now only respects the bounding box.
-        
-        segments=[[line.x0, line.y0, line.x1, line.y1]]
-        for keepout in self.keepouts:
-            for i in reversed(range(0, len(segments))):
-                segment = segments[i]
-                changes = keepout.lineIntersects(_Line(segment[0], segment[1], segment[2], segment[3]))
-                if changes != False:
-                    segments.pop(i)
-                    segments.append([segment[0], segment[1], changes[0][0], changes[0][1]])
-                    if len(changes) == 2:
-                        segments.append([changes[1][0], changes[1][1], segment[2], segment[3]])
-        return segments       
 
     # draws the keepouts
     def debug_draw(self):
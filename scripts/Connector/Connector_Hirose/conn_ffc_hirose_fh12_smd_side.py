@@ -11,6 +11,7 @@ import argparse
 import yaml
 from helpers import *
 from KicadModTree import *
+from KicadModTree.util.config_loader import loadYaml
 
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
@@ -234,16 +235,14 @@ if __name__ == "__main__":
     parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../conn_config_KLCv3.yaml')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    try:
+        configuration = loadYaml(args.global_config)
+    except yaml.YAMLError as exc:
+        print(exc)
+
+    try:
+        configuration.update(loadYaml(args.series_config))
+    except yaml.YAMLError as exc:
+        print(exc)
     for pins_per_row in pins_per_row_range:
         generate_one_footprint(pins_per_row, configuration)
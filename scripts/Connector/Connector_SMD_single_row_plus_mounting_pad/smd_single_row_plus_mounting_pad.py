@@ -11,6 +11,7 @@ import argparse
 import yaml
 from helpers import *
 from KicadModTree import *
+from KicadModTree.util.config_loader import loadYaml
 from math import sqrt
 
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
@@ -393,23 +394,20 @@ if __name__ == "__main__":
     parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../conn_config_KLCv3.yaml')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
+    try:
+        configuration = loadYaml(args.global_config)
+    except yaml.YAMLError as exc:
+        print(exc)
 
-    with open(args.series_config, 'r') as config_stream:
+    try:
+        configuration.update(loadYaml(args.series_config))
+    except yaml.YAMLError as exc:
+        print(exc)
+    for filepath in args.files:
         try:
-            configuration.update(yaml.load(config_stream))
+            yaml_file = loadYaml(filepath)
         except yaml.YAMLError as exc:
             print(exc)
-    for filepath in args.files:
-        with open(filepath, 'r') as stream:
-            try:
-                yaml_file = yaml.load(stream)
-            except yaml.YAMLError as exc:
-                print(exc)
         series_definitions = yaml_file['device_definition']
         for series_definition_id in series_definitions:
             generate_series(configuration,
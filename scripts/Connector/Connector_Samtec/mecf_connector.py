@@ -17,6 +17,7 @@ sys.path.append(os.path.join(sys.path[0], "..", "..", "..")) # load kicad_mod pa
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools")) # load kicad_mod path
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.config_loader import loadYaml
 # from drawing_tools import *
 # from footprint_scripts_potentiometers import *
 from footprint_text_fields import addTextFields
@@ -300,17 +301,15 @@ if __name__ == "__main__":
     parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../conn_config_KLCv3.yaml')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    try:
+        configuration = loadYaml(args.global_config)
+    except yaml.YAMLError as exc:
+        print(exc)
+
+    try:
+        configuration.update(loadYaml(args.series_config))
+    except yaml.YAMLError as exc:
+        print(exc)
 
     for pol in [True, False]:
         for pincount in pinrange:
@@ -9,6 +9,7 @@ import math
 sys.path.append(os.path.join(sys.path[0], "..", ".."))  # load parent path of KicadModTree
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.config_loader import loadYaml
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
 sys.path.append(os.path.join(sys.path[0], "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
@@ -20,17 +21,15 @@ def roundToBase(value, base):
 class TwoTerminalSMDchip():
     def __init__(self, command_file, configuration):
         self.configuration = configuration
-        with open(command_file, 'r') as command_stream:
-            try:
-                self.footprint_group_definitions = yaml.load(command_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+        try:
+            self.footprint_group_definitions = loadYaml(command_file)
+        except yaml.YAMLError as exc:
+            print(exc)
         ipc_doc = configuration['ipc_definition']
-        with open(ipc_doc, 'r') as ipc_stream:
-            try:
-                self.ipc_defintions = yaml.load(ipc_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+        try:
+            self.ipc_defintions = loadYaml(ipc_doc)
+        except yaml.YAMLError as exc:
+            print(exc)
 
 
 
@@ -102,11 +101,10 @@ class TwoTerminalSMDchip():
             device_size_docs = footprint_group_data['size_definitions']
             package_size_defintions={}
             for device_size_doc in device_size_docs:
-                with open(size_definition_path+device_size_doc, 'r') as size_stream:
-                    try:
-                        package_size_defintions.update(yaml.load(size_stream))
-                    except yaml.YAMLError as exc:
-                        print(exc)
+                try:
+                    package_size_defintions.update(loadYaml(size_definition_path+device_size_doc))
+                except yaml.YAMLError as exc:
+                    print(exc)
 
             for size_name in package_size_defintions:
                 device_size_data = package_size_defintions[size_name]
@@ -295,17 +293,15 @@ if __name__ == "__main__":
     parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='config_KLCv3.0.yaml')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
+    try:
+        configuration = loadYaml(args.global_config)
+    except yaml.YAMLError as exc:
+        print(exc)
 
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    try:
+        configuration.update(loadYaml(args.series_config))
+    except yaml.YAMLError as exc:
+        print(exc)
     args = parser.parse_args()
 
     for filepath in args.files:
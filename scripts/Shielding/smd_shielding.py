@@ -8,6 +8,7 @@ import yaml
 sys.path.append(os.path.join(sys.path[0], "..", ".."))  # load parent path of KicadModTree
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.config_loader import loadYaml
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
 
 
@@ -144,14 +145,13 @@ def create_smd_shielding(name, **kwargs):
 
 
 def parse_and_execute_yml_file(filepath):
-    with open(filepath, 'r') as stream:
-        try:
-            yaml_parsed = yaml.load(stream)
-            for footprint in yaml_parsed:
-                print("generate {name}.kicad_mod".format(name=footprint))
-                create_smd_shielding(footprint, **yaml_parsed.get(footprint))
-        except yaml.YAMLError as exc:
-            print(exc)
+    try:
+        yaml_parsed = loadYaml(filepath)
+        for footprint in yaml_parsed:
+            print("generate {name}.kicad_mod".format(name=footprint))
+            create_smd_shielding(footprint, **yaml_parsed.get(footprint))
+    except yaml.YAMLError as exc:
+        print(exc)
 
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@ import pprint
 sys.path.append(os.path.join(sys.path[0], "../.."))  # enable package import from parent directory
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.config_loader import loadYamlAll
 
 
 class Dimensions(object):
@@ -77,7 +78,7 @@ class DPAK(object):
 
     def load_config(self, config_file):
         try:
-            devices = yaml.load_all(open(config_file))
+            devices = loadYamlAll(config_file)
         except FileNotFoundError as fnfe:
             print(fnfe)
             return
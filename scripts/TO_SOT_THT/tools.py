@@ -12,6 +12,7 @@ sys.path.append(os.path.join(sys.path[0],"..","..","kicad_mod")) # load kicad_mo
 sys.path.append(os.path.join(sys.path[0],"..","..")) # load kicad_mod path
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.keepout import cachedKeepoutSet
 
 
 # round for grid g
@@ -64,45 +65,11 @@ def addKeepoutRound(x,y, w,h):
 
 
 
+# gives the parts of the lines [[l0,l1], ...] on the line y (along the axis xi, perpendicular to the axis yi) which
+# are outside of all keepouts
 def applyKeepouts(lines_in, y, xi, yi, keepouts):
-    #print("  applyKeepouts(\n  lines_in=", lines_in, "  \n  y=", y, "   \n  xi=", xi, "   yi=", yi, "   \n  keepouts=", keepouts, ")")
-    lines=lines_in
-    changes = True
-    while (changes):
-        changes = False
-        for ko in keepouts:
-            ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-            if (ko[yi+0] <= y) and (y <= ko[yi+1]):
-                #print("    INY: koy=", [ko[yi + 0], ko[yi + 1]], "  y=", y, "):             kox=", [ko[xi + 0], ko[xi + 1]])
-                for li in reversed(range(0, len(lines))):
-                    l = lines[li]
-                    if (l[0] >= ko[xi+0]) and (l[0] <= ko[xi+1]) and (l[1] >= ko[xi+0]) and (l[1] <= ko[xi+1]):  # Line completely inside -> remove
-                        lines.pop(li)
-                        #print("      H1: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, ")")
-                        changes = True
-                    elif (l[0] >= ko[xi+0]) and (l[0] <= ko[xi+1]) and (l[1] > ko[xi+1]):  # Line starts inside, but ends outside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([ko[xi+1], l[1]])
-                        #print("      H2: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [ko[xi+1], l[1]])
-                        changes = True
-                    elif (l[0] < ko[xi+0]) and (l[1] <= ko[xi+1]) and (l[1] >= ko[xi+0]):  # Line starts outside, but ends inside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi+0]])
-                        #print("      H3: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]])
-                        changes = True
-                    elif (l[0] < ko[xi+0]) and (l[1] > ko[xi+1]):  # Line starts outside, and ends outside -> remove and add 2 shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi+0]])
-                        lines.append([ko[xi+1], l[1]])
-                        #print("      H4: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]], [ko[xi+1], l[1]])
-                        changes = True
-                    #else:
-                        #print("      USE: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ")
-        if changes:
-            break
-
-    return lines
-    
+    return cachedKeepoutSet(keepouts).clipAxisLines(lines_in, y, xi // 2)
+
 
 
 #split a vertical line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+'''
+kicad-footprint-generator is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+kicad-footprint-generator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+'''
+
+'''
+Build the whole footprint library by running every generator script in parallel. This script needs Python 3, the
+generators are run with the same interpreter.
+
+A generator is every script below scripts/ which has a "if __name__ == '__main__'" block. Scripts which accept
+data files (ModArgparser or a positional "files" argument) get the .yml/.yaml/.csv files of their directory:
+
+* files starting with the name of the script, if there are any
+* otherwise all data files which are not referenced by name from another file in the same directory (those are
+  configuration files, like config_KLCv3.0.yaml)
+
+Every generator runs in its own python interpreter inside its own directory, because the scripts rely on relative
+paths and some of them import modules with the same name (helpers.py). Inside the interpreter,
+FileHandler.writeFile is instrumented to record the time spent on every footprint, and to redirect the output into
+the library tree given by --output-dir.
+
+Usage:
+    python3 build_library.py --output-dir ../library --jobs 8 --report build_report.json
+'''
+
+import argparse
+import fnmatch
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPTS_DIR)
+
+EXCLUDED_DIRS = ['tools']
+EXCLUDED_SCRIPTS = ['build_library.py', 'example_kicadmodtree_script.py', 'helpers.py']
+DATA_FILE_PATTERNS = ['*.yml', '*.yaml', '*.csv']
+
+MAIN_RE = re.compile(r'''^if\s+__name__\s*==\s*['"]__main__['"]\s*:''', re.MULTILINE)
+FILES_ARGUMENT_RE = re.compile(r'''ModArgparser\(|add_argument\(\s*['"]files['"]''')
+
+CACHE_ENV = 'KICADMODTREE_CACHE'
+REPORT_ENV = 'KICAD_BUILD_LIBRARY_REPORT'
+OUTPUT_ENV = 'KICAD_BUILD_LIBRARY_OUTPUT'
+
+
+def find_data_files(directory, script_name):
+    data_files = sorted(f for f in os.listdir(directory) if any(fnmatch.fnmatch(f, p) for p in DATA_FILE_PATTERNS))
+
+    stem = os.path.splitext(script_name)[0]
+    matching_files = [f for f in data_files if f.startswith(stem)]
+    if matching_files:
+        return matching_files
+
+    # remove all files which are referenced by name, those are configuration files used by the scripts
+    references = set()
+    for f in os.listdir(directory):
+        if f.endswith('.py') or f in data_files:
+            with io.open(os.path.join(directory, f), 'r', encoding='utf-8', errors='replace') as stream:
+                content = stream.read()
+            references.update(d for d in data_files if d != f and d in content)
+
+    return [f for f in data_files if f not in references]
+
+
+def discover_generators(root=SCRIPTS_DIR):
+    '''
+    return list of (script path, arguments) tuples of all generators below root
+    '''
+    generators = []
+
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS and not d.endswith('.pretty'))
+
+        for filename in sorted(fnmatch.filter(filenames, '*.py')):
+            if filename in EXCLUDED_SCRIPTS:
+                continue
+
+            path = os.path.join(directory, filename)
+            with io.open(path, 'r', encoding='utf-8', errors='replace') as stream:
+                source = stream.read()
+
+            if not MAIN_RE.search(source):
+                continue
+
+            arguments = []
+            if FILES_ARGUMENT_RE.search(source):
+                arguments = find_data_files(directory, filename)
+                if not arguments:
+                    continue  # nothing to generate
+
+            generators.append((path, arguments))
+
+    return generators
+
+
+def run_generator(path, arguments, output_dir=None, timeout=None, cache_dir=None):
+    '''
+    run a single generator in a new interpreter and return a dict describing the result
+    '''
+    # the report is written outside of the source tree, so a killed or failed run does not leave files behind
+    report_dir = tempfile.mkdtemp(prefix='build_library_')
+    report_path = os.path.join(report_dir, 'report.json')
+    env = dict(os.environ)
+    env[REPORT_ENV] = report_path
+    if output_dir:
+        env[OUTPUT_ENV] = output_dir
+    if cache_dir:
+        env[CACHE_ENV] = cache_dir
+
+    start_time = time.time()
+    try:
+        process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--run', path] + arguments,
+                                   cwd=os.path.dirname(path), env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            _, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            _, stderr = process.communicate()
+        returncode = process.returncode
+    except OSError as e:
+        returncode, stderr = -1, str(e).encode()
+
+    result = {'script': os.path.relpath(path, SCRIPTS_DIR),
+              'arguments': arguments,
+              'returncode': returncode,
+              'duration': time.time() - start_time,
+              'stderr': stderr.decode('utf-8', 'replace'),
+              'footprints': []}
+
+    if os.path.exists(report_path):
+        with open(report_path, 'r') as stream:
+            result['footprints'] = json.load(stream)
+    shutil.rmtree(report_dir, ignore_errors=True)
+
+    return result
+
+
+def _execute_instrumented(path, arguments):
+    '''
+    called inside of the generator interpreter: run the script, and record every written footprint
+    '''
+    sys.path.insert(0, BASE_DIR)
+    from KicadModTree.FileHandler import FileHandler
+
+    report_path = os.environ[REPORT_ENV]
+    output_dir = os.environ.get(OUTPUT_ENV)
+    footprints = []
+    last_time = [time.time()]
+    write_file = FileHandler.writeFile
+
+    def instrumented_write_file(self, filename, **kwargs):
+        if output_dir:
+            library = os.path.basename(os.path.dirname(os.path.abspath(filename)))
+            filename = os.path.join(output_dir, library, os.path.basename(filename))
+            if not os.path.isdir(os.path.dirname(filename)):
+                try:
+                    os.makedirs(os.path.dirname(filename))
+                except OSError:
+                    pass  # created by another generator in the meantime
+
+        write_file(self, filename, **kwargs)
+
+        now = time.time()
+        footprints.append({'filename': os.path.abspath(filename), 'duration': now - last_time[0]})
+        last_time[0] = now
+
+    FileHandler.writeFile = instrumented_write_file
+
+    sys.argv = [path] + arguments
+    sys.path[0] = os.path.dirname(path)
+    try:
+        import runpy
+        runpy.run_path(path, run_name='__main__')
+    finally:
+        with open(report_path, 'w') as stream:
+            json.dump(footprints, stream)
+
+
+def build_library(generators, jobs=None, output_dir=None, timeout=None, cache_dir=None, verbose=False):
+    results = []
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        futures = [executor.submit(run_generator, path, arguments, output_dir, timeout, cache_dir)
+                   for path, arguments in generators]
+
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+
+            if verbose or result['returncode'] != 0:
+                status = 'ok' if result['returncode'] == 0 else 'FAILED ({})'.format(result['returncode'])
+                print("{script}: {count} footprints in {duration:.2f}s, {status}".format(
+                    count=len(result['footprints']), status=status, **result))
+
+    return sorted(results, key=lambda r: r['script'])
+
+
+def print_summary(results, duration, slowest=10):
+    footprints = [f for r in results for f in r['footprints']]
+    failed = [r for r in results if r['returncode'] != 0]
+
+    print("")
+    print("built {} footprints with {} generators in {:.2f}s".format(len(footprints), len(results), duration))
+
+    print("")
+    print("slowest generators:")
+    for result in sorted(results, key=lambda r: -r['duration'])[:slowest]:
+        print("  {duration:8.2f}s  {script}".format(**result))
+
+    print("")
+    print("slowest footprints:")
+    for footprint in sorted(footprints, key=lambda f: -f['duration'])[:slowest]:
+        print("  {duration:8.3f}s  {filename}".format(**footprint))
+
+    if failed:
+        print("")
+        print("{} generators failed:".format(len(failed)))
+        for result in failed:
+            print("  {script} {arguments}".format(**result))
+            for line in result['stderr'].strip().splitlines()[-3:]:
+                print("      {}".format(line))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == '--run':
+        _execute_instrumented(sys.argv[2], sys.argv[3:])
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description='Run all footprint generators in parallel.')
+    parser.add_argument('-j', '--jobs', type=int, help='number of generators running at the same time')
+    parser.add_argument('-o', '--output-dir', help='write all footprints into this library tree')
+    parser.add_argument('--filter', default='*', help='only run generators whose path matches this pattern')
+    parser.add_argument('--cache-dir', help='build cache used by ModArgparser based generators to skip unchanged '
+                                            'footprints')
+    parser.add_argument('--timeout', type=float, help='maximum time in seconds a single generator may take')
+    parser.add_argument('--report', help='write timing and failures of every generator as .json file')
+    parser.add_argument('--list', action='store_true', help='only list the discovered generators')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print the result of every generator')
+    args = parser.parse_args()
+
+    generators = [(path, arguments) for path, arguments in discover_generators()
+                  if fnmatch.fnmatch(os.path.relpath(path, SCRIPTS_DIR), args.filter)]
+
+    if args.list:
+        for path, arguments in generators:
+            print(' '.join([os.path.relpath(path, SCRIPTS_DIR)] + arguments))
+        sys.exit(0)
+
+    output_dir = os.path.abspath(args.output_dir) if args.output_dir else None
+    cache_dir = os.path.abspath(args.cache_dir) if args.cache_dir else None
+
+    start_time = time.time()
+    results = build_library(generators, jobs=args.jobs, output_dir=output_dir,
+                            timeout=args.timeout, cache_dir=cache_dir, verbose=args.verbose)
+    print_summary(results, time.time() - start_time)
+
+    if args.report:
+        with open(args.report, 'w') as stream:
+            json.dump(results, stream, indent=2)
+
+    sys.exit(1 if any(r['returncode'] != 0 for r in results) else 0)
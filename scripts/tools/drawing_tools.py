@@ -12,6 +12,7 @@ sys.path.append(os.path.join(sys.path[0], "..", "..", "kicad_mod"))  # load kica
 sys.path.append(os.path.join(sys.path[0], "..", ".."))  # load kicad_mod path
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util import keepout
 from footprint_global_properties import *
 
 # tool function for generating 3D-scripts
@@ -75,62 +76,40 @@ def addKeepoutRound(x, y, w, h):
             yysum = yysum + yy
         return res
 
-# internal method for keepout-processing
-def applyKeepouts(lines_in, y, xi, yi, keepouts):
-    # print("  applyKeepouts(\n  lines_in=", lines_in, "  \n  y=", y, "   \n  xi=", xi, "   yi=", yi, "   \n  keepouts=", keepouts, ")")
-    lines = lines_in
-    changes = True
-    while (changes):
-        changes = False
+
+# a list of keepout areas [[x0,x1,y0,y1], ...], which uses the spatial index of KicadModTree.util.keepout for all
+# queries
+class KeepoutSet(keepout.KeepoutSet):
+    def __init__(self, keepouts=[]):
+        keepout.KeepoutSet.__init__(self)
+        self.keepouts = [list(ko) for ko in keepouts]
         for ko in keepouts:
-            ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-            if (ko[yi + 0] <= y) and (y <= ko[yi + 1]):
-                # print("    INY: koy=", [ko[yi + 0], ko[yi + 1]], "  y=", y, "):             kox=", [ko[xi + 0], ko[xi + 1]])
-                for li in reversed(range(0, len(lines))):
-                    l = lines[li]
-                    if (l[0] >= ko[xi + 0]) and (l[0] <= ko[xi + 1]) and (l[1] >= ko[xi + 0]) and (
-                                l[1] <= ko[xi + 1]):  # Line completely inside -> remove
-                        lines.pop(li)
-                        # print("      H1: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, ")")
-                        changes = True
-                    elif (l[0] >= ko[xi + 0]) and (l[0] <= ko[xi + 1]) and (
-                                l[1] > ko[
-                                    xi + 1]):  # Line starts inside, but ends outside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([ko[xi + 1], l[1]])
-                        # print("      H2: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [ko[xi+1], l[1]])
-                        changes = True
-                    elif (l[0] < ko[xi + 0]) and (l[1] <= ko[xi + 1]) and (
-                                l[1] >= ko[
-                                    xi + 0]):  # Line starts outside, but ends inside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi + 0]])
-                        # print("      H3: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]])
-                        changes = True
-                    elif (l[0] < ko[xi + 0]) and (
-                                l[1] > ko[
-                                    xi + 1]):  # Line starts outside, and ends outside -> remove and add 2 shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi + 0]])
-                        lines.append([ko[xi + 1], l[1]])
-                        # print("      H4: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]], [ko[xi+1], l[1]])
-                        changes = True
-                        # else:
-                        # print("      USE: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ")
-        if changes:
-            break
-
-    return lines
+            self.addRect([ko[0], ko[2]], [ko[1], ko[3]])
+
+    def __iter__(self):
+        return iter(self.keepouts)
+
+    def __len__(self):
+        return len(self.keepouts)
+
+    def __add__(self, other):
+        return KeepoutSet(self.keepouts + list(other))
+
+
+# returns a KeepoutSet of the given keepouts. When called again with the same, unchanged list, the set is reused
+def asKeepoutSet(keepouts):
+    if isinstance(keepouts, keepout.KeepoutSet):
+        return keepouts
+    return keepout.cachedKeepoutSet(keepouts, KeepoutSet)
+
+# internal method for keepout-processing: gives the parts of the lines [[l0,l1], ...] on the line y (along the axis
+# xi, perpendicular to the axis yi) which are outside of all keepouts
+def applyKeepouts(lines_in, y, xi, yi, keepouts):
+    return asKeepoutSet(keepouts).clipAxisLines(lines_in, y, xi // 2)
 
 # gives True if the given point (x,y) is contained in any keepout
 def containedInAnyKeepout(x,y, keepouts):
-    for ko in keepouts:
-        ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-        if x>=ko[0] and x<=ko[1] and y>=ko[2] and y<=ko[3]:
-            #print("HIT!")
-            return True
-    #print("NO HIT ",x,y)
-    return False
+    return asKeepoutSet(keepouts).contains(x, y)
 
 # draws the keepouts
 def debug_draw_keepouts(kicad_modg, keepouts):
@@ -150,34 +129,34 @@ def addHLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts=[], roun=0.
             kicad_mod.append(
                 Line(start=[roundG(l[0], roun), roundG(y, roun)], end=[roundG(l[1], roun), roundG(y, roun)], layer=layer,width=width))
 
+# gives the angular intervals [[a0,a1], ...] between amin and amax (in radians, amin < amax) of the circle
+# x + radius*sin(a), y + radius*cos(a) which are outside of all keepouts
+def visibleCircleIntervals(x, y, radius, amin, amax, keepouts):
+    return asKeepoutSet(keepouts).visibleCircleIntervals(x, y, radius, amin, amax)
+
+# draw the part a0..a1 (in radians) of the circle x + radius*sin(a), y + radius*cos(a), going in the direction of
+# increasing a, or decreasing a if reverse is set
+def addArcByRadians(kicad_mod, x, y, radius, a0, a1, layer, width, reverse=False, roun=0.001):
+    if reverse:
+        a0, a1 = a1, a0
+    startx = x + radius * math.sin(a0)
+    starty = y + radius * math.cos(a0)
+    kicad_mod.append(Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)],
+                         angle=-(a1 - a0) / math.pi * 180, layer=layer, width=width))
+
 # draw a circle minding the keepouts
 def addCircleWithKeepout(kicad_mod, x, y, radius, layer, width, keepouts=[], roun=0.001):
-    dalpha = 2 * 3.1415 / (360)
-    a = 0
-    start=0
-    startx=x + radius * math.sin(0)
-    starty=y + radius * math.cos(0)
-    hasToDraw=False
-    noneUsed=True
-    while a < 2 * 3.1415:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-        
-        if containedInAnyKeepout(x1,y1, keepouts):
-            if hasToDraw and math.fabs(a-start)>0:
-                kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
-            hasToDraw = False
-            startx=x1; starty=y1; start=a
-            noneUsed = False
-        else:
-            hasToDraw = True
-        
-        a = a + dalpha
-    if noneUsed:
+    intervals = visibleCircleIntervals(x, y, radius, 0, 2 * math.pi, keepouts)
+    if intervals == [[0, 2 * math.pi]]:
         kicad_mod.append(
             Circle(center=[roundG(x, roun), roundG(y, roun)], radius=radius, layer=layer, width=width))
-    elif hasToDraw and math.fabs(a - start) > 0:
-        kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
+        return
+
+    # join the visible parts before and after angle 0
+    if len(intervals) > 1 and intervals[0][0] == 0 and intervals[-1][1] == 2 * math.pi:
+        intervals[-1][1] = intervals.pop(0)[1] + 2 * math.pi
+    for a0, a1 in intervals:
+        addArcByRadians(kicad_mod, x, y, radius, a0, a1, layer, width, roun=roun)
 
 # draw an arc
 def addArcByAngles(kicad_mod, x, y, radius, angle_start, angle_end, layer, width, roun=0.001):
@@ -193,39 +172,22 @@ def addArcByAnglesWithKeepout(kicad_mod, x, y, radius, angle_start, angle_end, l
 
 # draw an arc minding the keepouts
 def addArcWithKeepout(kicad_mod, x, y, startx, starty, angle, layer, width, keepouts=[], roun=0.001):
-    dalpha = angle/180*3.1415 / (360)
-    radius=math.sqrt(sqr(x-startx)+sqr(y-starty));
-    a = math.asin((startx-x)/radius)
-    if starty<0:
-        a=a+3.1415/2
-    astart=a;
-    aend=astart+angle/180*3.1415
-    start=astart
-    #print(radius, astart/3.1415*180, aend/3.1415*180)    
-    istartx=x + radius * math.sin(a)
-    istarty=y + radius * math.cos(a)
-    hasToDraw=False
-    noneUsed=True
-    while a < aend:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-        
-        if containedInAnyKeepout(x1,y1, keepouts):
-            if hasToDraw and math.fabs(a-start)>0:
-                #print('DRAW ',x1,y1)
-                kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(istartx, roun), roundG(istarty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
-            hasToDraw = False
-            istartx=x1; istarty=y1; start=a
-            noneUsed = False
-        else:
-            hasToDraw = True
-        #print(a, dalpha, hasToDraw, noneUsed)
-        a = a + dalpha
-    if noneUsed:
+    radius = math.sqrt(sqr(x - startx) + sqr(y - starty))
+    astart = math.atan2(startx - x, starty - y)
+    # positive angles turn into the direction of decreasing a
+    aend = astart - angle / 180 * math.pi
+    amin, amax = min(astart, aend), max(astart, aend)
+
+    intervals = visibleCircleIntervals(x, y, radius, amin, amax, keepouts)
+    if intervals == [[amin, amax]]:
         kicad_mod.append(
             Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=angle, layer=layer, width=width))
-    elif hasToDraw and math.fabs(a - start) > 0:
-        kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(istartx, roun), roundG(istarty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
+        return
+
+    if angle > 0:
+        intervals.reverse()
+    for a0, a1 in intervals:
+        addArcByRadians(kicad_mod, x, y, radius, a0, a1, layer, width, reverse=angle > 0, roun=roun)
 
 # draw an ellipse with one axis along x-axis and one axis along y-axis and given width/height
 def addEllipse(kicad_mod, x, y, w, h, layer, width, roun=0.001):
@@ -246,44 +208,21 @@ def addEllipseWithKeepout(kicad_mod, x, y, w, h, layer, width, keepouts=[], roun
 # split a circle so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addDCircleWithKeepout(kicad_mod, x, y, radius, layer, width, keepouts=[], roun=0.001):
     dalpha = 2 * 3.1415 / (2 * 3.1415 * radius / (6 * width))
+    intervals = visibleCircleIntervals(x, y, radius, 0, 2 * math.pi + dalpha, keepouts)
     a = 0
     while a < 2 * 3.1415:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-        x2 = x + radius * math.sin(a + dalpha / 2)
-        y2 = y + radius * math.cos(a + dalpha / 2)
-        ok=True
-        aa=a
-        while aa<a+dalpha and ok:
-            xx = x + radius * math.sin(aa)
-            yy = y + radius * math.cos(aa)
-            if containedInAnyKeepout(xx, yy, keepouts):
-                ok=False
-            aa=aa+dalpha/20
-        if ok: kicad_mod.append(Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(x1, roun), roundG(y1, roun)],
-                             angle=-1*dalpha / 2 / 3.1415 * 180, layer=layer, width=width))
+        # only draw dashes which are followed by a visible gap
+        if any(a0 <= a and a + dalpha <= a1 for a0, a1 in intervals):
+            x1 = x + radius * math.sin(a)
+            y1 = y + radius * math.cos(a)
+            kicad_mod.append(Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(x1, roun), roundG(y1, roun)],
+                                 angle=-1*dalpha / 2 / 3.1415 * 180, layer=layer, width=width))
         a = a + dalpha
 
 # split an arbitrary line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addLineWithKeepout(kicad_mod, x1, y1, x2,y2, layer, width, keepouts=[], roun=0.001):
-    dx=(x2-x1)/200
-    dy=(y2-y1)/200
-    x=x1; y=y1
-    xs=x1; ys=y1;
-    hasToDraw=not containedInAnyKeepout(x, y, keepouts)
-    didDrawAny=False
-    for n in range(0,200):
-        if containedInAnyKeepout(x+dx, y+dy, keepouts):
-            if hasToDraw: 
-                didDrawAny=True
-                kicad_mod.append(Line(start=[roundG(xs, roun), roundG(ys, roun)], end=[roundG(x, roun), roundG(y, roun)], layer=layer, width=width))
-            xs=x+2*dx; ys=y+2*dy; hasToDraw=False
-        else:
-            hasToDraw = True
-        
-        x=x+dx; y=y+dy
-    if hasToDraw and ((xs!=x2 and ys!=y2) or (not didDrawAny)): 
-        kicad_mod.append(Line(start=[roundG(xs, roun), roundG(ys, roun)], end=[roundG(x2, roun), roundG(y2, roun)], layer=layer, width=width))
+    for start, end in asKeepoutSet(keepouts).clipLine((x1, y1), (x2, y2)):
+        kicad_mod.append(Line(start=[roundG(start[0], roun), roundG(start[1], roun)], end=[roundG(end[0], roun), roundG(end[1], roun)], layer=layer, width=width))
 
 
 # split an arbitrary line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
@@ -405,17 +344,27 @@ def addVLineWithKeepout(kicad_mod, x, y0, y1, layer, width, keepouts=[], roun=0.
 def addHDLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts=[], roun=0.001):
     dx=3*width
     x=min(x0,x1)
+    lines=[]
     while x<max(x0,x1):
-        addHLineWithKeepout(kicad_mod, x,min(x+dx,x1), y, layer, width, keepouts, roun)
+        lines.append([min(x, x1, x+dx), max(x, min(x+dx, x1))])
         x=x+dx*2
+    # all dashes are clipped at once, but emitted in the same order as if every dash was clipped on its own
+    for l in asKeepoutSet(keepouts).clipAxisLines(lines, y, 0, separately=True):
+        kicad_mod.append(
+            Line(start=[roundG(l[0], roun), roundG(y, roun)], end=[roundG(l[1], roun), roundG(y, roun)], layer=layer,width=width))
 
 # split a dashed vertical line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addVDLineWithKeepout(kicad_mod, x, y0, y1, layer, width, keepouts=[], roun=0.001):
     dy = 3 * width
     y = min(y0, y1)
+    lines = []
     while y < max(y0, y1):
-        addVLineWithKeepout(kicad_mod, x, y, min(y1,y+dy), layer, width, keepouts, roun)
+        lines.append([min(y, y1, y+dy), max(y, min(y1, y+dy))])
         y = y + dy * 2
+    for l in asKeepoutSet(keepouts).clipAxisLines(lines, x, 1, separately=True):
+        kicad_mod.append(
+            Line(start=[roundG(x, roun), roundG(l[0], roun)], end=[roundG(x, roun), roundG(l[1], roun)], layer=layer,
+                 width=width))
 
 
 